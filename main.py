@@ -63,6 +63,12 @@ async def lifespan(app: FastAPI):
         await app.state.ws_manager.disconnect_all()
         logger.info("All WebSocket connections closed")
     
+    # Release the connection pools shared by every API agent
+    from src.agents.api_interaction_agent import close_aio_session, close_http_pool
+    await close_aio_session()
+    close_http_pool()
+    logger.info("API agent HTTP pools closed")
+    
     logger.info("AgentWeaver shutdown complete")
 
 
@@ -155,6 +161,22 @@ async def api_info():
         "status": "ready"
     }
 
+@app.post("/api/test/broadcast", tags=["Testing"])
+async def test_broadcast(message: Dict[str, Any]):
+    """Broadcast a single message to all connected dashboard clients"""
+    await app.state.ws_manager.broadcast(message)
+    return {"status": "sent", "count": 1}
+
+@app.post("/api/test/broadcast_batch", tags=["Testing"])
+async def test_broadcast_batch(payload: Dict[str, Any]):
+    """Broadcast a batch of messages in order with a single request"""
+    messages = payload.get("batch", [])
+    if not isinstance(messages, list) or not all(isinstance(message, dict) for message in messages):
+        raise HTTPException(status_code=400, detail="'batch' must be a list of message objects")
+    
+    await app.state.ws_manager.broadcast_many(messages)
+    return {"status": "sent", "count": len(messages)}
+
 @app.post("/api/test/demo-workflow", tags=["Testing"])
 async def trigger_demo_workflow():
     """Trigger a demo workflow that sends real-time updates to the dashboard"""
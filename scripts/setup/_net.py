@@ -0,0 +1,50 @@
+"""
+Shared HTTP client, event loop setup and pacing for the demo scripts
+"""
+
+import asyncio
+import os
+
+import aiohttp
+
+_session = None
+
+# Scales every demo pause; set DEMO_PACE=0 for CI and profiling runs
+PACE = float(os.environ.get("DEMO_PACE", "1.0"))
+
+async def pace(seconds=1.0):
+    """Pause for the given (scaled) number of seconds so the demo output can be followed live"""
+    if PACE:
+        await asyncio.sleep(seconds * PACE)
+
+def use_uvloop():
+    """Use uvloop's faster event loop when it is installed; call before asyncio.run"""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+def get_session():
+    """Return the shared aiohttp session, creating it on first use.
+    
+    Must be called from inside the running event loop.
+    """
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=64,
+            limit_per_host=16,
+            keepalive_timeout=60,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True
+        )
+        _session = aiohttp.ClientSession(connector=connector)
+    return _session
+
+async def close_session():
+    """Close the shared session; call before the event loop shuts down"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
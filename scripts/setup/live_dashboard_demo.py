@@ -5,188 +5,218 @@ AgentWeaver demo that sends real-time updates to the dashboard via WebSocket
 
 import sys
 import os
-import json
 import asyncio
-import aiohttp
-from datetime import datetime
+import orjson
+from datetime import datetime, timezone
 import time
 
 # Add current directory to path
 sys.path.append('.')
 
-async def send_websocket_update(message):
+from _net import get_session, close_session, pace, use_uvloop
+
+BROADCAST_URL = "http://localhost:8000/api/test/broadcast"
+BROADCAST_BATCH_URL = "http://localhost:8000/api/test/broadcast_batch"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+async def send_websocket_update(session, message):
     """Send an update to the WebSocket manager running on the main server"""
     try:
-        # Send via HTTP to the main server which will broadcast via WebSocket
-        async with aiohttp.ClientSession() as session:
-            # Use a direct broadcast endpoint if available, or simulate agent updates
-            url = "http://localhost:8000/api/test/broadcast"  # We'll need to create this endpoint
-            async with session.post(url, json=message) as response:
-                if response.status == 200:
-                    print(f"📡 Sent update: {message['type']}")
-                else:
-                    print(f"⚠️  Failed to send update: {response.status}")
+        # Send via HTTP to the main server which will broadcast via WebSocket;
+        # orjson serializes the datetime values in the payload natively
+        async with session.post(BROADCAST_URL, data=orjson.dumps(message), headers=JSON_HEADERS) as response:
+            if response.status == 200:
+                print(f"📡 Sent update: {message['type']}")
+            else:
+                print(f"⚠️  Failed to send update: {response.status}")
     except Exception as e:
         print(f"⚠️  Could not send WebSocket update: {e}")
 
+async def send_websocket_batch(session, messages):
+    """Send several updates in one request; the server broadcasts them in order"""
+    try:
+        async with session.post(BROADCAST_BATCH_URL, data=orjson.dumps({"batch": messages}), headers=JSON_HEADERS) as response:
+            if response.status == 200:
+                print(f"📡 Sent {len(messages)} updates: {', '.join(m['type'] for m in messages)}")
+            else:
+                print(f"⚠️  Failed to send update batch: {response.status}")
+    except Exception as e:
+        print(f"⚠️  Could not send WebSocket update batch: {e}")
+
 async def run_demo_with_live_updates():
-    print("🚀 AgentWeaver Live Dashboard Demo")
-    print("=" * 50)
-    print("This demo will send real-time updates to your dashboard!")
-    print()
-    
-    # Simulate agent startup
-    agents = [
-        {"id": "text_analyzer", "name": "Text Analysis Agent", "status": "idle"},
-        {"id": "data_processor", "name": "Data Processing Agent", "status": "idle"}, 
-        {"id": "api_client", "name": "API Interaction Agent", "status": "idle"}
-    ]
-    
-    print("📋 Starting agents...")
-    for agent in agents:
-        await send_websocket_update({
-            "type": "agent_update",
-            "event": "status_changed",
-            "agent_id": agent["id"],
-            "status": "running",
-            "previous_status": "idle",
-            "details": {
-                "name": agent["name"],
-                "current_task": "Initializing...",
-                "started_at": datetime.now().isoformat()
-            }
-        })
-        await asyncio.sleep(0.5)  # Stagger the startup
-    
-    # Simulate workflow execution
-    workflow_id = f"demo_workflow_{int(time.time())}"
-    
-    print("🔄 Starting workflow execution...")
-    await send_websocket_update({
-        "type": "workflow_update", 
-        "event": "workflow_started",
-        "workflow_id": workflow_id,
-        "status": "running",
-        "current_step": "step_1_text_analysis",
-        "progress": 0.0,
-        "details": {
-            "name": "Customer Review Analysis Pipeline",
-            "started_at": datetime.now().isoformat(),
-            "total_steps": 3,
-            "steps_completed": 0
-        }
-    })
+    # One keep-alive session for every update instead of a new connection per message
+    session = get_session()
+    try:
+        print("🚀 AgentWeaver Live Dashboard Demo")
+        print("=" * 50)
+        print("This demo will send real-time updates to your dashboard!")
+        print()
     
-    # Step 1: Text Analysis
-    print("   Step 1: Text Analysis...")
-    await send_websocket_update({
-        "type": "agent_update",
-        "event": "status_changed", 
-        "agent_id": "text_analyzer",
-        "status": "busy",
-        "previous_status": "running",
-        "details": {
-            "current_task": "Analyzing customer sentiment",
-            "progress": 0.3
-        }
-    })
+        # Simulate agent startup
+        agents = [
+            {"id": "text_analyzer", "name": "Text Analysis Agent", "status": "idle"},
+            {"id": "data_processor", "name": "Data Processing Agent", "status": "idle"}, 
+            {"id": "api_client", "name": "API Interaction Agent", "status": "idle"}
+        ]
     
-    await asyncio.sleep(2)  # Simulate processing time
+        print("📋 Starting agents...")
+        started_at = datetime.now(tz=timezone.utc)
+        
+        async def start_agent(index, agent):
+            # Stagger the startup on screen while the updates still run concurrently
+            await pace(0.5 * index)
+            await send_websocket_update(session, {
+                "type": "agent_update",
+                "event": "status_changed",
+                "agent_id": agent["id"],
+                "status": "running",
+                "previous_status": "idle",
+                "details": {
+                    "name": agent["name"],
+                    "current_task": "Initializing...",
+                    "started_at": started_at
+                }
+            })
+        
+        await asyncio.gather(*(start_agent(i, agent) for i, agent in enumerate(agents)))
     
-    await send_websocket_update({
-        "type": "workflow_update",
-        "event": "step_completed", 
-        "workflow_id": workflow_id,
-        "status": "running",
-        "current_step": "step_2_data_enrichment",
-        "progress": 0.33,
-        "details": {
-            "name": "Customer Review Analysis Pipeline",
-            "steps_completed": 1,
-            "current_step_name": "Data Enrichment"
-        }
-    })
+        # Simulate workflow execution
+        workflow_id = f"demo_workflow_{int(time.time())}"
+        workflow_started = time.monotonic()
     
-    # Step 2: Data Processing
-    print("   Step 2: Data Enrichment...")
-    await send_websocket_update({
-        "type": "agent_update",
-        "event": "status_changed",
-        "agent_id": "data_processor", 
-        "status": "busy",
-        "previous_status": "running",
-        "details": {
-            "current_task": "Enriching customer data",
-            "progress": 0.6
-        }
-    })
+        # Each step's updates go out together in a single batch request
+        print("🔄 Starting workflow execution...")
+        print("   Step 1: Text Analysis...")
+        await send_websocket_batch(session, [
+            {
+                "type": "workflow_update", 
+                "event": "workflow_started",
+                "workflow_id": workflow_id,
+                "status": "running",
+                "current_step": "step_1_text_analysis",
+                "progress": 0.0,
+                "details": {
+                    "name": "Customer Review Analysis Pipeline",
+                    "started_at": datetime.now(tz=timezone.utc),
+                    "total_steps": 3,
+                    "steps_completed": 0
+                }
+            },
+            {
+                "type": "agent_update",
+                "event": "status_changed", 
+                "agent_id": "text_analyzer",
+                "status": "busy",
+                "previous_status": "running",
+                "details": {
+                    "current_task": "Analyzing customer sentiment",
+                    "progress": 0.3
+                }
+            }
+        ])
     
-    await asyncio.sleep(2)
+        await pace(2)  # Simulate processing time
     
-    await send_websocket_update({
-        "type": "workflow_update",
-        "event": "step_completed",
-        "workflow_id": workflow_id, 
-        "status": "running",
-        "current_step": "step_3_api_integration",
-        "progress": 0.66,
-        "details": {
-            "steps_completed": 2,
-            "current_step_name": "API Integration"
-        }
-    })
+        # Step 2: Data Processing
+        print("   Step 2: Data Enrichment...")
+        await send_websocket_batch(session, [
+            {
+                "type": "workflow_update",
+                "event": "step_completed", 
+                "workflow_id": workflow_id,
+                "status": "running",
+                "current_step": "step_2_data_enrichment",
+                "progress": 0.33,
+                "details": {
+                    "name": "Customer Review Analysis Pipeline",
+                    "steps_completed": 1,
+                    "current_step_name": "Data Enrichment"
+                }
+            },
+            {
+                "type": "agent_update",
+                "event": "status_changed",
+                "agent_id": "data_processor", 
+                "status": "busy",
+                "previous_status": "running",
+                "details": {
+                    "current_task": "Enriching customer data",
+                    "progress": 0.6
+                }
+            }
+        ])
     
-    # Step 3: API Integration
-    print("   Step 3: API Integration...")
-    await send_websocket_update({
-        "type": "agent_update",
-        "event": "status_changed",
-        "agent_id": "api_client",
-        "status": "busy", 
-        "previous_status": "running",
-        "details": {
-            "current_task": "Fetching external data",
-            "progress": 0.9
-        }
-    })
+        await pace(2)
     
-    await asyncio.sleep(2)
+        # Step 3: API Integration
+        print("   Step 3: API Integration...")
+        await send_websocket_batch(session, [
+            {
+                "type": "workflow_update",
+                "event": "step_completed",
+                "workflow_id": workflow_id, 
+                "status": "running",
+                "current_step": "step_3_api_integration",
+                "progress": 0.66,
+                "details": {
+                    "steps_completed": 2,
+                    "current_step_name": "API Integration"
+                }
+            },
+            {
+                "type": "agent_update",
+                "event": "status_changed",
+                "agent_id": "api_client",
+                "status": "busy", 
+                "previous_status": "running",
+                "details": {
+                    "current_task": "Fetching external data",
+                    "progress": 0.9
+                }
+            }
+        ])
     
-    # Workflow completion
-    print("✅ Workflow completed!")
-    await send_websocket_update({
-        "type": "workflow_update",
-        "event": "workflow_completed",
-        "workflow_id": workflow_id,
-        "status": "completed", 
-        "current_step": "completed",
-        "progress": 1.0,
-        "details": {
-            "name": "Customer Review Analysis Pipeline", 
-            "completed_at": datetime.now().isoformat(),
-            "execution_time": 6.0,
-            "steps_completed": 3,
-            "total_steps": 3
-        }
-    })
+        await pace(2)
     
-    # Reset agents to idle
-    for agent in agents:
-        await send_websocket_update({
-            "type": "agent_update",
-            "event": "status_changed",
-            "agent_id": agent["id"],
-            "status": "idle",
-            "previous_status": "busy",
+        # Workflow completion, then reset agents to idle
+        print("✅ Workflow completed!")
+        completed_at = datetime.now(tz=timezone.utc)
+        completion_updates = [{
+            "type": "workflow_update",
+            "event": "workflow_completed",
+            "workflow_id": workflow_id,
+            "status": "completed", 
+            "current_step": "completed",
+            "progress": 1.0,
             "details": {
-                "current_task": None,
-                "last_completed": datetime.now().isoformat()
+                "name": "Customer Review Analysis Pipeline", 
+                "completed_at": completed_at,
+                "execution_time": round(time.monotonic() - workflow_started, 1),
+                "steps_completed": 3,
+                "total_steps": 3
             }
-        })
+        }]
+        for agent in agents:
+            completion_updates.append({
+                "type": "agent_update",
+                "event": "status_changed",
+                "agent_id": agent["id"],
+                "status": "idle",
+                "previous_status": "busy",
+                "details": {
+                    "current_task": None,
+                    "last_completed": completed_at
+                }
+            })
+        await send_websocket_batch(session, completion_updates)
     
-    print()
-    print("🎯 Demo completed! Check your dashboard for real-time updates!")
-    print("   The agents and workflow should now show live data instead of mock data.")
+        print()
+        print("🎯 Demo completed! Check your dashboard for real-time updates!")
+        print("   The agents and workflow should now show live data instead of mock data.")
+    finally:
+        await close_session()
 
 if __name__ == "__main__":
+    use_uvloop()
+    
     asyncio.run(run_demo_with_live_updates())
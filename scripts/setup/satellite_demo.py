@@ -13,17 +13,29 @@ import asyncio
 import json
 import sys
 import os
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+import numpy as np
+
+from _net import pace, use_uvloop
 from src.services.satellite_service import (
     create_satellite_pipeline,
-    LocationData
+    LocationData,
+    SatelliteSeries
 )
 
+# NDVI trend bars for every possible length, built once
+_BARS = tuple("█" * i + "░" * (20 - i) for i in range(21))
+
+# Set DEMO_PROFILE=1 to print per-stage wall times (and yappi stats if installed)
+PROFILE = os.environ.get("DEMO_PROFILE", "0") == "1"
+
 class SatelliteDemo:
     """Interactive satellite system demonstration"""
     
@@ -35,6 +47,26 @@ class SatelliteDemo:
             LocationData(13.0827, 80.2707, "Chennai", "Tamil Nadu", 6),
             LocationData(21.1458, 79.0882, "Nagpur", "Maharashtra", 310)
         ]
+        self.stage_timings: Dict[str, float] = {}
+    
+    @contextmanager
+    def timed_stage(self, name: str):
+        """Record the wall time of a demo stage when profiling is enabled"""
+        if not PROFILE:
+            yield
+            return
+        
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_timings[name] = time.perf_counter() - start
+    
+    def print_stage_timings(self):
+        """Print the recorded stage timings, slowest first"""
+        self.print_header("STAGE TIMINGS")
+        for name, seconds in sorted(self.stage_timings.items(), key=lambda item: item[1], reverse=True):
+            print(f"   {name:28s} {seconds * 1000:9.1f} ms")
     
     def print_header(self, title: str):
         """Print formatted section header"""
@@ -60,19 +92,19 @@ class SatelliteDemo:
         
         print("\n🚀 Acquiring current satellite data for major agricultural regions...")
         
-        for i, location in enumerate(self.demo_locations, 1):
+        # Locations are independent, so acquire them all concurrently
+        results = await asyncio.gather(
+            *(self.pipeline.acquire_data_for_location(location) for location in self.demo_locations),
+            return_exceptions=True
+        )
+        
+        for i, (location, result) in enumerate(zip(self.demo_locations, results), 1):
             print(f"\n[{i}/{len(self.demo_locations)}] Processing {location.location_name}...")
             
-            try:
-                # Acquire current data
-                data_point = await self.pipeline.acquire_data_for_location(location)
-                self.print_data_point(data_point, location.location_name)
-                
-                # Small delay for visual effect
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                print(f"❌ Error acquiring data for {location.location_name}: {e}")
+            if isinstance(result, Exception):
+                print(f"❌ Error acquiring data for {location.location_name}: {result}")
+            else:
+                self.print_data_point(result, location.location_name)
         
         print("\n✅ Real-time acquisition complete!")
     
@@ -84,37 +116,31 @@ class SatelliteDemo:
         
         # Use Delhi as example
         demo_location = self.demo_locations[0]
-        historical_data = []
+        now = datetime.now()
+        dates = [now - timedelta(days=i) for i in range(30)]
         
-        for i in range(30):
-            date = datetime.now() - timedelta(days=i)
-            
-            # Simulate different crop types throughout the season
-            if i < 10:
-                crop_type = "wheat"
-            elif i < 20:
-                crop_type = "rice"
-            else:
-                crop_type = "mixed"
-            
-            data_point = await self.pipeline.acquire_data_for_location(
-                demo_location, date, crop_type
-            )
-            historical_data.append(data_point)
-            
-            if i % 5 == 0:  # Show progress every 5 days
-                print(f"   📅 Generated data for {date.strftime('%Y-%m-%d')} (NDVI: {data_point.metrics.ndvi:.3f})")
+        # Simulate different crop types throughout the season
+        crop_types = ["wheat"] * 10 + ["rice"] * 10 + ["mixed"] * 10
+        
+        # Produce the whole 30-day series with one bulk pipeline call
+        historical_data = await self.pipeline.bulk_acquire_for_location(
+            demo_location, dates=dates, crop_types=crop_types
+        )
+        
+        series = SatelliteSeries.from_data_points(historical_data)
         
-        print(f"\n✅ Generated {len(historical_data)} historical data points!")
+        for i in range(0, len(series), 5):  # Show progress every 5 days
+            print(f"   📅 Generated data for {dates[i].strftime('%Y-%m-%d')} (NDVI: {series.ndvi[i]:.3f})")
         
-        # Show trends
+        print(f"\n✅ Generated {len(series)} historical data points!")
+        
+        # Show trends, oldest day first
         print("\n📊 NDVI Trend Analysis:")
-        ndvi_values = [d.metrics.ndvi for d in reversed(historical_data[-10:])]
-        for i, ndvi in enumerate(ndvi_values):
-            date = (datetime.now() - timedelta(days=9-i)).strftime('%m-%d')
-            bar_length = int(ndvi * 20)  # Scale for visualization
-            bar = "█" * bar_length + "░" * (20 - bar_length)
-            print(f"   {date}: {bar} {ndvi:.3f}")
+        window = SatelliteSeries.from_data_points(historical_data[-10:][::-1])
+        bar_lengths = np.clip((window.ndvi * 20).astype(np.int8), 0, 20)  # Scale for visualization
+        for timestamp, bar_length, ndvi in zip(window.timestamps, bar_lengths, window.ndvi):
+            print(f"   {timestamp.strftime('%m-%d')}: {_BARS[bar_length]} {ndvi:.3f}")
+        print(f"   📈 Slope: {window.ndvi_slope():+.4f} NDVI/day")
     
     def demo_location_analysis(self):
         """Demonstrate comprehensive location analysis"""
@@ -240,22 +266,28 @@ class SatelliteDemo:
         
         try:
             # Run demonstration modules
-            await self.demo_real_time_acquisition()
-            await asyncio.sleep(1)
+            with self.timed_stage("real_time_acquisition"):
+                await self.demo_real_time_acquisition()
+            await pace()
             
-            await self.demo_historical_simulation()
-            await asyncio.sleep(1)
+            with self.timed_stage("historical_simulation"):
+                await self.demo_historical_simulation()
+            await pace()
             
-            self.demo_location_analysis()
-            await asyncio.sleep(1)
+            with self.timed_stage("location_analysis"):
+                self.demo_location_analysis()
+            await pace()
             
-            self.demo_monitoring_locations()
-            await asyncio.sleep(1)
+            with self.timed_stage("monitoring_locations"):
+                self.demo_monitoring_locations()
+            await pace()
             
-            await self.demo_bulk_acquisition()
-            await asyncio.sleep(1)
+            with self.timed_stage("bulk_acquisition"):
+                await self.demo_bulk_acquisition()
+            await pace()
             
-            self.demo_data_quality_assessment()
+            with self.timed_stage("data_quality_assessment"):
+                self.demo_data_quality_assessment()
             
             # Final summary
             self.print_header("DEMONSTRATION COMPLETE")
@@ -289,14 +321,34 @@ async def main():
     print("Starting Satellite Data Acquisition System Demo...")
     print("Press Ctrl+C to stop at any time.\n")
     
+    yappi = None
+    if PROFILE:
+        try:
+            import yappi
+            # Wall clock so time spent awaiting I/O is attributed to each coroutine
+            yappi.set_clock_type("wall")
+            yappi.start()
+        except ImportError:
+            print("ℹ️  yappi not installed; reporting stage timings only\n")
+    
     try:
         demo = SatelliteDemo()
         await demo.run_complete_demo()
         
+        if PROFILE:
+            demo.print_stage_timings()
+            if yappi:
+                yappi.stop()
+                yappi.get_func_stats(
+                    filter_callback=lambda stat: stat.module == __file__
+                ).sort("ttot").print_all()
+        
     except KeyboardInterrupt:
         print("\n🛑 Demo stopped by user.")
     except Exception as e:
         print(f"\n❌ Demo failed: {e}")
 
 if __name__ == "__main__":
+    use_uvloop()
+    
     asyncio.run(main())
@@ -3,12 +3,16 @@
 Simple test for irrigation agent satellite integration
 """
 import asyncio
+import logging
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.core.agriculture_models import AgricultureQuery, Location
 from src.agents.irrigation_agent import IrrigationAgent
+from _net import use_uvloop
+
+log = logging.getLogger("agentweaver.demo")
 
 async def simple_irrigation_test():
     """Simple test for irrigation agent"""
@@ -25,12 +29,14 @@ async def simple_irrigation_test():
         
         return True
         
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        log.exception("❌ Irrigation agent test failed")
         return False
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
+    
+    use_uvloop()
+    
     success = asyncio.run(simple_irrigation_test())
     print(f"\n{'✅ Success!' if success else '❌ Failed!'}")
@@ -4,14 +4,20 @@ Simple demo trigger using requests (no async needed)
 """
 
 import requests
-import time
+from requests.adapters import HTTPAdapter
+
+DEMO_WORKFLOW_URL = "http://localhost:8000/api/test/demo-workflow"
+
+# Reuse one pooled session so repeated triggers keep the connection alive
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
 
 def trigger_demo_workflow():
     """Trigger a demo workflow via HTTP request"""
     try:
         print("🚀 Triggering demo workflow...")
         
-        response = requests.post("http://localhost:8000/api/test/demo-workflow")
+        response = _SESSION.post(DEMO_WORKFLOW_URL, timeout=5)
         
         if response.status_code == 200:
             result = response.json()
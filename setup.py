@@ -1,49 +0,0 @@
-
-from setuptools import setup, find_packages
-
-with open("README.md", "r", encoding="utf-8") as fh:
-    long_description = fh.read()
-
-with open("requirements.txt", "r", encoding="utf-8") as fh:
-    requirements = [line.strip() for line in fh if line.strip() and not line.startswith("#")]
-
-setup(
-    name="agentweaver",
-    version="0.1.0",
-    author="Arun Kumar",
-    author_email="akv2011@example.com",
-    description="My multi-agent orchestration system built with LangGraph",
-    long_description=long_description,
-    long_description_content_type="text/markdown",
-    url="https://github.com/akv2011/AgentWeaver",
-    packages=find_packages(where="src"),
-    package_dir={"": "src"},
-    classifiers=[
-        "Development Status :: 3 - Alpha",
-        "Intended Audience :: Developers",
-        "License :: OSI Approved :: MIT License",
-        "Operating System :: OS Independent",
-        "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.9",
-        "Programming Language :: Python :: 3.10",
-        "Programming Language :: Python :: 3.11",
-        "Topic :: Software Development :: Libraries :: Python Modules",
-        "Topic :: Scientific/Engineering :: Artificial Intelligence",
-    ],
-    python_requires=">=3.9",
-    install_requires=requirements,
-    extras_require={
-        "dev": [
-            "pytest>=8.0.0",
-            "pytest-asyncio>=0.23.0",
-            "black>=24.0.0",
-            "flake8>=7.0.0",
-            "mypy>=1.8.0",
-        ],
-    },
-    entry_points={
-        "console_scripts": [
-            "agentweaver=src.cli:main",
-        ],
-    },
-)
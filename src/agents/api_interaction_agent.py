@@ -1,10 +1,24 @@
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+import asyncio
 import logging
-import json
-from datetime import datetime
+import re
+import time
+import weakref
+from functools import lru_cache
+from datetime import datetime, timezone
+import aiohttp
+import orjson
 import requests
-from urllib.parse import urljoin, urlparse
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+from urllib.parse import urljoin
+
+try:
+    import ijson
+except ImportError:  # Optional: large JSON bodies are then buffered before parsing
+    ijson = None
 
 from .base_agent import BaseWorkerAgent
 from ..core.models import AgentCapability, Task, TaskStatus
@@ -12,8 +26,120 @@ from ..core.models import AgentCapability, Task, TaskStatus
 
 logger = logging.getLogger(__name__)
 
+# An http(s) scheme followed by a host; the agent only speaks HTTP
+_URL_RE = re.compile(r'^https?://[^/?#\s]+', re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def _url_origin(url: str) -> Optional[str]:
+    # scheme://host[:port] of a valid URL, or None if the URL is not valid
+    match = _URL_RE.match(url)
+    return match.group(0) if match else None
+
+
+# JSON bodies at least this large (or of unknown size) are parsed incrementally from the
+# socket when ijson is installed
+STREAM_PARSE_THRESHOLD = 64 * 1024
+
+@lru_cache(maxsize=256)
+def _is_json_type(content_type: str) -> bool:
+    # application/json and structured +json types such as application/problem+json or hal+json
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    return media_type == 'application/json' or media_type.endswith('+json')
+
+
+class _RecordingReader:
+    """File-like wrapper that keeps every chunk read from the underlying stream"""
+    __slots__ = ('_raw', 'chunks')
+    
+    def __init__(self, raw: Any):
+        self._raw = raw
+        self.chunks: List[bytes] = []
+    
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._raw.read(size)
+        self.chunks.append(chunk)
+        return chunk
+
+
+# Connection pools shared by every agent instance, one per retry budget; each agent mounts
+# one on its own session, so cookies and auth state stay per agent
+_shared_adapters: Dict[int, HTTPAdapter] = {}
+
+# Only used to resolve environment settings; requests are never sent through it
+_ENV_SESSION = requests.Session()
+
+
+def _shared_adapter(attempts: int) -> HTTPAdapter:
+    adapter = _shared_adapters.get(attempts)
+    if adapter is None:
+        # Sync retries happen inside urllib3, with backoff, only for network errors and
+        # 5xx responses, returning the last response if all attempts fail
+        retry = Retry(
+            total=max(attempts - 1, 0),
+            status_forcelist=(500, 502, 503, 504),
+            backoff_factor=0.2,
+            allowed_methods=None,
+            raise_on_status=False
+        )
+        adapter = _shared_adapters.setdefault(
+            attempts, HTTPAdapter(pool_connections=64, pool_maxsize=256, max_retries=retry)
+        )
+    return adapter
+
+
+def _mount_shared_adapter(session: requests.Session, attempts: int) -> None:
+    adapter = _shared_adapter(attempts)
+    for prefix in ('https://', 'http://'):
+        session.mount(prefix, adapter)
+
+
+def _new_session(attempts: int) -> requests.Session:
+    session = requests.Session()
+    # Every agent sends a complete header set, so requests' own defaults would only be merged in and overwritten
+    session.headers.clear()
+    _mount_shared_adapter(session, attempts)
+    return session
+
+
+def close_http_pool() -> None:
+    # Releases the pooled connections shared by every API agent; call once on shutdown
+    for adapter in list(_shared_adapters.values()):
+        adapter.close()
+
+
+@lru_cache(maxsize=256)
+def _send_settings_for(origin: str) -> Dict[str, Any]:
+    # Proxy and CA bundle settings from the environment only depend on the origin,
+    # so resolve them once per host instead of on every Session.request call
+    return _ENV_SESSION.merge_environment_settings(origin, {}, True, None, None)
+
+
+# One pooled aiohttp session per event loop, shared by every agent instance
+_aio_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+
+
+def _get_aio_session() -> aiohttp.ClientSession:
+    loop = asyncio.get_running_loop()
+    session = _aio_sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=100, limit_per_host=20, keepalive_timeout=75)
+        session = aiohttp.ClientSession(connector=connector)
+        _aio_sessions[loop] = session
+    return session
+
+
+async def close_aio_session() -> None:
+    # Closes the current loop's pooled aiohttp session; call from that loop on shutdown
+    session = _aio_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
 
 class APIInteractionAgent(BaseWorkerAgent):
+    __slots__ = ('timeout', '_max_retries', 'session', '_default_headers', '_auth_cache')
+    
+    _API_TASK_TYPES = frozenset(('api_request', 'fetch_data', 'http_request'))
     
     def __init__(self, name: str = "APIFetcher"):
         capabilities = [AgentCapability.COMMUNICATION, AgentCapability.DATA_PROCESSING]
@@ -21,128 +147,251 @@ class APIInteractionAgent(BaseWorkerAgent):
         
         # Agent-specific configuration
         self.timeout = 30  # Default timeout in seconds
-        self.max_retries = 3
-        self.session = requests.Session()
+        self._max_retries = 3  # Attempts per request, for both the sync and async paths
+        self.session = _new_session(self._max_retries)
         
-        # Set default headers
-        self.session.headers.update({
-            'User-Agent': f'AgentWeaver-APIAgent/{self.agent_id}',
-            'Accept': 'application/json, text/plain, */*'
-        })
+        # Default headers, merged into every request
+        self._default_headers = self._initial_headers()
         
-        self.logger.info(f"API Interaction Agent '{name}' initialized")
+        # Last auth config seen, with the headers / basic-auth pair it compiles to
+        self._auth_cache: Optional[Tuple[Dict[str, Any], Dict[str, str], Optional[Tuple[str, str]]]] = None
+        
+        self.logger.info("API Interaction Agent '%s' initialized", name)
+    
+    @property
+    def max_retries(self) -> int:
+        return self._max_retries
+    
+    @max_retries.setter
+    def max_retries(self, attempts: int) -> None:
+        # Sync retries are done by the adapter, so switch to the one built for this budget
+        self._max_retries = attempts
+        _mount_shared_adapter(self.session, attempts)
+    
+    @staticmethod
+    def result_bytes(result: Dict[str, Any]) -> bytes:
+        # Serialize an execute() result for callers that forward it as JSON
+        return orjson.dumps(result, default=str, option=orjson.OPT_NON_STR_KEYS)
+    
+    def _initial_headers(self) -> Dict[str, str]:
+        return {
+            'User-Agent': f'AgentWeaver-APIAgent/{self._agent_id}',
+            'Accept': 'application/json, text/plain, */*',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive'
+        }
     
     def execute(self, task: Task, context: Dict[str, Any]) -> Dict[str, Any]:
-        start_time = datetime.utcnow()
+        start_time = time.monotonic()
         
         try:
-            # Extract parameters from task
-            url = task.parameters.get('url', '')
-            method = task.parameters.get('method', 'GET').upper()
-            headers = task.parameters.get('headers', {})
-            data = task.parameters.get('data')
-            params = task.parameters.get('params', {})
-            auth = task.parameters.get('auth')
-            
-            # Get URL from context if not in task parameters
-            if not url:
-                url = context.get('url', '')
-            
-            if not url:
-                raise ValueError("No URL provided for API request")
-            
-            # Validate URL
-            if not self._is_valid_url(url):
-                raise ValueError(f"Invalid URL format: {url}")
-            
-            self.logger.info(f"Making {method} request to {url}")
+            method, url, request_kwargs = self._prepare_request(task, context)
             
-            # Prepare request parameters
-            request_kwargs = {
-                'timeout': task.parameters.get('timeout', self.timeout),
-                'headers': headers,
-                'params': params
-            }
+            self.logger.info("Making %s request to %s", method, url)
             
-            # Add authentication if provided
-            if auth:
-                if auth.get('type') == 'bearer':
-                    request_kwargs['headers']['Authorization'] = f"Bearer {auth.get('token')}"
-                elif auth.get('type') == 'basic':
-                    request_kwargs['auth'] = (auth.get('username'), auth.get('password'))
-                elif auth.get('type') == 'api_key':
-                    key_name = auth.get('key_name', 'X-API-Key')
-                    request_kwargs['headers'][key_name] = auth.get('api_key')
-            
-            # Add data for POST/PUT/PATCH requests
-            if method in ['POST', 'PUT', 'PATCH'] and data is not None:
-                if isinstance(data, dict):
-                    request_kwargs['json'] = data
-                else:
-                    request_kwargs['data'] = data
-            
-            # Make the request with retry logic
-            response = self._make_request_with_retry(method, url, **request_kwargs)
+            # Retries are handled by the session's adapter; the body is read by _process_response
+            timeout = request_kwargs.pop('timeout')
+            prepared = self.session.prepare_request(requests.Request(method, url, **request_kwargs))
+            response = self.session.send(prepared, timeout=timeout, **_send_settings_for(_url_origin(url)))
             
             # Process the response
             result = self._process_response(response)
             
-            # Calculate execution time
-            execution_time = (datetime.utcnow() - start_time).total_seconds()
+            return self._build_result(url, method, response.status_code, result, start_time)
             
-            # Prepare the final result
-            final_result = {
-                'url': url,
-                'method': method,
-                'status_code': response.status_code,
-                'success': response.status_code < 400,
-                'response': result,
-                'execution_time': execution_time,
-                'agent_id': self.agent_id,
-                'timestamp': datetime.utcnow().isoformat()
-            }
+        except Exception as e:
+            return self._build_error_result(e, start_time)
+    
+    async def execute_async(self, task: Task, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Non-blocking variant of execute for callers already running an event loop.
+        
+        A task with a 'urls' list fetches all of them concurrently and returns
+        the individual results under 'results'.
+        """
+        urls = task.parameters.get('urls')
+        if not urls:
+            return await self._fetch_async(task, context)
+        
+        start_time = time.monotonic()
+        results = await asyncio.gather(*(self._fetch_async(task, context, url) for url in urls))
+        
+        return {
+            'results': results,
+            'success': all(result['success'] for result in results),
+            'execution_time': time.monotonic() - start_time,
+            'agent_id': self._agent_id,
+            'timestamp': datetime.now(timezone.utc).isoformat()
+        }
+    
+    async def _fetch_async(self, task: Task, context: Dict[str, Any], url: Optional[str] = None) -> Dict[str, Any]:
+        start_time = time.monotonic()
+        
+        try:
+            method, url, request_kwargs = self._prepare_request(task, context, url)
             
-            self.logger.info(f"API request completed in {execution_time:.2f}s with status {response.status_code}")
-            return final_result
+            self.logger.info("Making async %s request to %s", method, url)
             
-        except Exception as e:
-            execution_time = (datetime.utcnow() - start_time).total_seconds()
-            error_msg = f"API request failed: {str(e)}"
-            self.logger.error(error_msg)
+            status_code, result = await self._make_async_request_with_retry(
+                method, url, **self._to_aiohttp_kwargs(request_kwargs)
+            )
+            
+            return self._build_result(url, method, status_code, result, start_time)
             
-            return {
-                'error': error_msg,
-                'execution_time': execution_time,
-                'agent_id': self.agent_id,
-                'timestamp': datetime.utcnow().isoformat(),
-                'success': False
-            }
-    
-    def _make_request_with_retry(self, method: str, url: str, **kwargs) -> requests.Response:
+        except Exception as e:
+            return self._build_error_result(e, start_time)
+    
+    def _prepare_request(self, task: Task, context: Dict[str, Any], url: Optional[str] = None) -> Tuple[str, str, Dict[str, Any]]:
+        # Extract parameters from task
+        url = url or task.parameters.get('url', '')
+        method = task.parameters.get('method', 'GET').upper()
+        headers = task.parameters.get('headers') or {}
+        data = task.parameters.get('data')
+        params = task.parameters.get('params', {})
+        auth = task.parameters.get('auth')
+        
+        # Get URL from context if not in task parameters
+        if not url:
+            url = context.get('url', '')
+        
+        if not url:
+            raise ValueError("No URL provided for API request")
+        
+        # Validate URL
+        if not self._is_valid_url(url):
+            raise ValueError(f"Invalid URL format: {url}")
+        
+        # Add authentication if provided
+        auth_headers, basic_auth = self._resolve_auth(auth) if auth else ({}, None)
+        
+        # Prepare request parameters
+        request_kwargs = {
+            'timeout': task.parameters.get('timeout', self.timeout),
+            'headers': self._merge_headers(headers, auth_headers),
+            'params': params
+        }
+        if basic_auth:
+            request_kwargs['auth'] = basic_auth
+        
+        # Add data for POST/PUT/PATCH requests
+        if method in ['POST', 'PUT', 'PATCH'] and data is not None:
+            if isinstance(data, dict):
+                request_kwargs['json'] = data
+            else:
+                request_kwargs['data'] = data
+        
+        return method, url, request_kwargs
+    
+    def _merge_headers(self, headers: Dict[str, str], auth_headers: Dict[str, str]) -> CaseInsensitiveDict:
+        # Header names are case-insensitive, so a task's 'accept' replaces the default 'Accept'
+        # instead of being sent next to it
+        merged = CaseInsensitiveDict(self._default_headers)
+        merged.update(headers)
+        merged.update(auth_headers)
+        return merged
+    
+    def _resolve_auth(self, auth: Dict[str, Any]) -> Tuple[Dict[str, str], Optional[Tuple[str, str]]]:
+        # Agents usually see the same auth config on every task, so compile it once and reuse it
+        cached = self._auth_cache
+        if cached is not None and cached[0] == auth:
+            return cached[1], cached[2]
+        
+        auth_headers, basic_auth = {}, None
+        if auth.get('type') == 'bearer':
+            auth_headers = {'Authorization': f"Bearer {auth.get('token')}"}
+        elif auth.get('type') == 'basic':
+            basic_auth = (auth.get('username'), auth.get('password'))
+        elif auth.get('type') == 'api_key':
+            auth_headers = {auth.get('key_name', 'X-API-Key'): auth.get('api_key')}
+        
+        self._auth_cache = (dict(auth), auth_headers, basic_auth)
+        return auth_headers, basic_auth
+    
+    def _to_aiohttp_kwargs(self, request_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        aiohttp_kwargs = dict(request_kwargs)
+        aiohttp_kwargs['timeout'] = aiohttp.ClientTimeout(total=request_kwargs['timeout'])
+        
+        if 'auth' in request_kwargs:
+            username, password = request_kwargs['auth']
+            aiohttp_kwargs['auth'] = aiohttp.BasicAuth(username, password or '')
+        
+        return aiohttp_kwargs
+    
+    def _build_result(self, url: str, method: str, status_code: int, result: Dict[str, Any], start_time: float) -> Dict[str, Any]:
+        # Calculate execution time
+        execution_time = time.monotonic() - start_time
+        
+        # Prepare the final result
+        final_result = {
+            'url': url,
+            'method': method,
+            'status_code': status_code,
+            'success': status_code < 400,
+            'response': result,
+            'execution_time': execution_time,
+            'agent_id': self._agent_id,
+            'timestamp': datetime.now(timezone.utc).isoformat()
+        }
+        
+        self.logger.info("API request completed in %.2fs with status %d", execution_time, status_code)
+        return final_result
+    
+    def _build_error_result(self, error: Exception, start_time: float) -> Dict[str, Any]:
+        execution_time = time.monotonic() - start_time
+        error_msg = f"API request failed: {str(error)}"
+        self.logger.error(error_msg)
+        
+        return {
+            'error': error_msg,
+            'execution_time': execution_time,
+            'agent_id': self._agent_id,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'success': False
+        }
+    
+    async def _make_async_request_with_retry(self, method: str, url: str, **kwargs) -> Tuple[int, Dict[str, Any]]:
+        session = _get_aio_session()
         last_exception = None
         
         for attempt in range(self.max_retries):
             try:
-                response = self.session.request(method, url, **kwargs)
-                
-                # Don't retry on client errors (4xx), only on server errors (5xx) and network issues
-                if response.status_code < 500:
-                    return response
+                async with session.request(method, url, **kwargs) as response:
+                    # Don't retry on client errors (4xx), only on server errors (5xx) and network issues
+                    if response.status >= 500 and attempt < self.max_retries - 1:
+                        self.logger.warning("Server error %d, retrying... (attempt %d/%d)", response.status, attempt + 1, self.max_retries)
+                        continue
+                    
+                    return response.status, await self._process_async_response(response)
                 
-                if attempt < self.max_retries - 1:
-                    self.logger.warning(f"Server error {response.status_code}, retrying... (attempt {attempt + 1}/{self.max_retries})")
-                    continue
-                
-                return response
-                
-            except requests.RequestException as e:
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 last_exception = e
                 if attempt < self.max_retries - 1:
-                    self.logger.warning(f"Request failed, retrying... (attempt {attempt + 1}/{self.max_retries}): {str(e)}")
+                    self.logger.warning("Request failed, retrying... (attempt %d/%d): %s", attempt + 1, self.max_retries, e)
                     continue
         
         # If we get here, all retries failed
-        raise last_exception or requests.RequestException("All retry attempts failed")
+        raise last_exception or aiohttp.ClientError("All retry attempts failed")
+    
+    async def _process_async_response(self, response: aiohttp.ClientResponse) -> Dict[str, Any]:
+        # Read the body once and decode it straight from bytes
+        body = await response.read()
+        result = {
+            'headers': dict(response.headers),
+            'encoding': response.get_encoding(),
+            'url': str(response.url)
+        }
+        
+        if _is_json_type(response.content_type):
+            try:
+                result['data'] = orjson.loads(body)
+                result['format'] = 'json'
+                return result
+            except orjson.JSONDecodeError as e:
+                result['parse_error'] = str(e)
+        
+        # get_encoding() already falls back to charset detection when the header has none
+        result['data'] = body.decode(result['encoding'], 'replace')
+        result['format'] = 'text'
+        return result
     
     def _process_response(self, response: requests.Response) -> Dict[str, Any]:
         result = {
@@ -152,41 +401,59 @@ class APIInteractionAgent(BaseWorkerAgent):
         }
         
         try:
-            # Try to parse as JSON first
-            if response.headers.get('content-type', '').startswith('application/json'):
-                result['data'] = response.json()
-                result['format'] = 'json'
-            else:
-                # Fall back to text
+            content_type = response.headers.get('content-type', '')
+            content_length = response.headers.get('content-length')
+            
+            # Chunked bodies of unknown size may be arbitrarily large, so they are streamed too
+            large_body = content_length is None or int(content_length) >= STREAM_PARSE_THRESHOLD
+            
+            if not _is_json_type(content_type):
+                # response.text falls back to the detected charset when the header has none
                 result['data'] = response.text
                 result['format'] = 'text'
-                
-                # Try to parse as JSON anyway if it looks like JSON
-                if response.text.strip().startswith(('{', '[')):
-                    try:
-                        result['data'] = response.json()
-                        result['format'] = 'json'
-                    except json.JSONDecodeError:
-                        pass  # Keep as text
+            elif ijson is not None and large_body:
+                self._stream_json(response, result)
+            else:
+                try:
+                    result['data'] = orjson.loads(response.content)
+                    result['format'] = 'json'
+                except orjson.JSONDecodeError as e:
+                    result['data'] = response.text
+                    result['format'] = 'text'
+                    result['parse_error'] = str(e)
         
         except Exception as e:
-            self.logger.warning(f"Failed to process response content: {str(e)}")
-            result['data'] = response.text
+            self.logger.warning("Failed to process response content: %s", e)
+            result['data'] = None
             result['format'] = 'text'
             result['parse_error'] = str(e)
         
+        finally:
+            response.close()
+        
         return result
     
-    def _is_valid_url(self, url: str) -> bool:
+    def _stream_json(self, response: requests.Response, result: Dict[str, Any]) -> None:
+        # Parse large bodies straight off the socket, keeping the bytes read so far so a
+        # malformed or empty body can still be returned as text like the buffered path does
+        response.raw.decode_content = True
+        reader = _RecordingReader(response.raw)
         try:
-            result = urlparse(url)
-            return all([result.scheme, result.netloc])
-        except Exception:
-            return False
+            result['data'] = next(ijson.items(reader, '', use_float=True))
+            result['format'] = 'json'
+        except (ijson.JSONError, StopIteration) as e:
+            body = b''.join(reader.chunks) + response.raw.read()
+            # JSON has no charset parameter of its own and defaults to UTF-8
+            result['data'] = body.decode(response.encoding or 'utf-8', 'replace')
+            result['format'] = 'text'
+            result['parse_error'] = str(e) or 'empty body'
+    
+    def _is_valid_url(self, url: str) -> bool:
+        return _url_origin(url) is not None
     
     def can_handle_task(self, task: Task) -> bool:
         # Check if it's an API task
-        if task.task_type in ['api_request', 'fetch_data', 'http_request']:
+        if task.task_type in self._API_TASK_TYPES:
             return True
         
         # Check if the task has URL parameter
@@ -207,17 +474,17 @@ class APIInteractionAgent(BaseWorkerAgent):
             test_url = "https://httpbin.org/status/200"
             
             try:
-                response = self.session.get(test_url, timeout=5)
+                response = self.session.get(test_url, headers=self._default_headers, timeout=5)
                 if response.status_code != 200:
                     self.set_error(f"HTTP capability test failed with status {response.status_code}")
                     return False
             except requests.RequestException as e:
-                self.logger.warning(f"HTTP health check failed (network may be unavailable): {str(e)}")
+                self.logger.warning("HTTP health check failed (network may be unavailable): %s", e)
                 # Don't mark as error for network issues during health check
                 # The agent might still work when network is available
                 pass
             
-            self.logger.debug(f"API Interaction Agent {self.name} health check passed")
+            self.logger.debug("API Interaction Agent %s health check passed", self.name)
             return True
             
         except Exception as e:
@@ -225,24 +492,21 @@ class APIInteractionAgent(BaseWorkerAgent):
             return False
     
     def set_custom_headers(self, headers: Dict[str, str]) -> None:
-        self.session.headers.update(headers)
-        self.logger.info(f"Updated session headers: {list(headers.keys())}")
+        self._default_headers.update(headers)
+        self.logger.info("Updated default headers: %s", list(headers))
     
     def set_timeout(self, timeout: int) -> None:
         self.timeout = timeout
-        self.logger.info(f"Updated default timeout to {timeout}s")
+        self.logger.info("Updated default timeout to %ss", timeout)
     
     def clear_session(self) -> None:
-        self.session.close()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': f'AgentWeaver-APIAgent/{self.agent_id}',
-            'Accept': 'application/json, text/plain, */*'
-        })
+        # A fresh session drops this agent's cookies; the pooled connections are kept
+        self.session = _new_session(self._max_retries)
+        self._default_headers = self._initial_headers()
         self.logger.info("Session cleared and reset")
     
-    def __del__(self):
-        try:
-            self.session.close()
-        except Exception:
-            pass
+    def close(self) -> None:
+        # Session.close() would also close the shared adapter, so only this agent's state is dropped;
+        # the shared pools are released once on shutdown by close_http_pool() and close_aio_session()
+        self.session.cookies.clear()
+        self.logger.info("HTTP session closed")
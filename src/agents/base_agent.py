@@ -1,8 +1,14 @@
 
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+import asyncio
 import logging
+import os
+import threading
+import time
 
 from ..core.models import AgentState, AgentCapability, AgentStatus, Task, TaskStatus
 
@@ -10,7 +16,30 @@ from ..core.models import AgentState, AgentCapability, AgentStatus, Task, TaskSt
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=256)
+def _agent_logger(name: str) -> logging.Logger:
+    # getLogger takes the logging module lock; agents are often created per task with reused names
+    return logging.getLogger(f"{__name__}.{name}")
+
+
+# Shared pool for running sync execute() calls from execute_async
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("AGENT_MAX_WORKERS", "32")),
+    thread_name_prefix="agent-worker"
+)
+
+# Separate pool for process_tasks_threaded, so a fan-out started from an execute_async call
+# (or the other way round) never waits on workers of the pool it is running in
+_FANOUT_THREAD_PREFIX = "agent-fanout"
+_FANOUT_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("AGENT_MAX_WORKERS", "32")),
+    thread_name_prefix=_FANOUT_THREAD_PREFIX
+)
+
+
 class BaseWorkerAgent(ABC):
+    # Subclasses that don't declare their own __slots__ still get a __dict__
+    __slots__ = ('agent_state', 'logger', '_agent_id', '_caps_set', '__weakref__')
     
     def __init__(self, name: str, capabilities: List[AgentCapability], agent_type: str = "worker"):
         self.agent_state = AgentState(
@@ -19,11 +48,15 @@ class BaseWorkerAgent(ABC):
             capabilities=capabilities,
             status=AgentStatus.AVAILABLE
         )
-        self.logger = logging.getLogger(f"{__name__}.{name}")
+        self.logger = _agent_logger(name)
+        
+        # The id never changes, so skip the trip through agent_state on every read
+        self._agent_id = self.agent_state.agent_id
+        self._caps_set = frozenset(self.agent_state.capabilities)
     
     @property
     def agent_id(self) -> str:
-        return self.agent_state.agent_id
+        return self._agent_id
     
     @property
     def name(self) -> str:
@@ -41,20 +74,33 @@ class BaseWorkerAgent(ABC):
     def execute(self, task: Task, context: Dict[str, Any]) -> Dict[str, Any]:
         pass
     
+    async def execute_async(self, task: Task, context: Dict[str, Any]) -> Dict[str, Any]:
+        # Async hosts (e.g. FastAPI handlers) should await this rather than call execute,
+        # which would block the event loop. The default runs execute on the shared worker
+        # pool; agents with native async I/O override it.
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_EXECUTOR, self.execute, task, context)
+    
     def can_handle_task(self, task: Task) -> bool:
         # Check if any of the task's required capabilities match this agent's capabilities
         if not task.required_capabilities:
             return True  # If no specific capabilities required, any agent can handle it
         
-        return any(cap in self.capabilities for cap in task.required_capabilities)
+        return not self._caps_set.isdisjoint(task.required_capabilities)
     
-    def start_task(self, task: Task) -> None:
+    def _touch(self, now: Optional[datetime] = None) -> datetime:
+        # One clock read per state transition, shared by every field it updates; naive UTC like
+        # the AgentState defaults and the supervisor, so the timestamps stay comparable
+        now = now or datetime.utcnow()
+        self.agent_state.last_updated = now
+        return now
+    
+    def start_task(self, task: Task, now: Optional[datetime] = None) -> None:
         self.agent_state.status = AgentStatus.BUSY
         self.agent_state.current_task_id = task.task_id
-        self.agent_state.last_activity = datetime.utcnow()
-        self.agent_state.last_updated = datetime.utcnow()
+        self.agent_state.last_activity = self._touch(now)
         
-        self.logger.info(f"Agent {self.name} starting task {task.task_id}: {task.title}")
+        self.logger.info("Agent %s starting task %s: %s", self.name, task.task_id, task.title)
     
     def complete_task(self, task: Task, execution_time: float = 0.0, success: bool = True) -> None:
         self.agent_state.status = AgentStatus.AVAILABLE
@@ -62,23 +108,23 @@ class BaseWorkerAgent(ABC):
         # Note: update_performance method would need to be added to AgentState model
         
         status_msg = "completed successfully" if success else "failed"
-        self.logger.info(f"Agent {self.name} {status_msg} task {task.task_id} in {execution_time:.2f}s")
+        self.logger.info("Agent %s %s task %s in %.2fs", self.name, status_msg, task.task_id, execution_time)
     
-    def set_error(self, error_message: str) -> None:
+    def set_error(self, error_message: str, now: Optional[datetime] = None) -> None:
         self.agent_state.status = AgentStatus.ERROR
         self.agent_state.error_message = error_message
         self.agent_state.health_check_passed = False
-        self.agent_state.last_updated = datetime.utcnow()
+        self._touch(now)
         
-        self.logger.error(f"Agent {self.name} error: {error_message}")
+        self.logger.error("Agent %s error: %s", self.name, error_message)
     
-    def reset_error(self) -> None:
+    def reset_error(self, now: Optional[datetime] = None) -> None:
         self.agent_state.status = AgentStatus.AVAILABLE
         self.agent_state.error_message = None
         self.agent_state.health_check_passed = True
-        self.agent_state.last_updated = datetime.utcnow()
+        self._touch(now)
         
-        self.logger.info(f"Agent {self.name} error status reset")
+        self.logger.info("Agent %s error status reset", self.name)
     
     def process_task(self, task: Task, context: Dict[str, Any] = None) -> Dict[str, Any]:
         if context is None:
@@ -86,13 +132,13 @@ class BaseWorkerAgent(ABC):
         
         try:
             self.start_task(task)
-            start_time = datetime.utcnow()
+            start_time = time.monotonic()
             
             # Execute the task
             result = self.execute(task, context)
             
             # Calculate execution time
-            execution_time = (datetime.utcnow() - start_time).total_seconds()
+            execution_time = time.monotonic() - start_time
             
             # Mark task as complete
             self.complete_task(task, execution_time, success=True)
@@ -100,40 +146,89 @@ class BaseWorkerAgent(ABC):
             return result
             
         except Exception as e:
-            execution_time = (datetime.utcnow() - start_time).total_seconds() if 'start_time' in locals() else 0.0
+            execution_time = time.monotonic() - start_time if 'start_time' in locals() else 0.0
             self.complete_task(task, execution_time, success=False)
             self.set_error(str(e))
             raise
     
+    async def process_tasks(self, tasks: List[Task], context: Dict[str, Any] = None,
+                            max_concurrent: int = 32) -> List[Any]:
+        # Run many tasks concurrently; results (or raised exceptions) come back in task order
+        if context is None:
+            context = {}
+        
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        async def run_one(task: Task) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.execute_async(task, context)
+        
+        return await asyncio.gather(*(run_one(task) for task in tasks), return_exceptions=True)
+    
+    def process_tasks_threaded(self, tasks: List[Task], context: Dict[str, Any] = None) -> List[Any]:
+        # Parallel fan-out for sync callers: I/O-bound agents release the GIL while waiting on
+        # the network. CPU-bound agents gain nothing from threads and should use a ProcessPoolExecutor.
+        # Like process_tasks, results (or raised exceptions) come back in task order.
+        if context is None:
+            context = {}
+        
+        # The tasks share this agent, so its state is updated once for the whole batch
+        self.agent_state.status = AgentStatus.BUSY
+        self.agent_state.current_task_id = None
+        self.agent_state.last_activity = self._touch()
+        self.logger.info("Agent %s starting %d tasks in parallel", self.name, len(tasks))
+        start_time = time.monotonic()
+        
+        if threading.current_thread().name.startswith(_FANOUT_THREAD_PREFIX):
+            # Already on a fan-out worker: waiting on the same pool could deadlock, so run inline
+            results = [self._result_or_exception(self.execute, task, context) for task in tasks]
+        else:
+            futures = [_FANOUT_EXECUTOR.submit(self.execute, task, context) for task in tasks]
+            results = [self._result_or_exception(future.result) for future in futures]
+        
+        failed = sum(isinstance(result, Exception) for result in results)
+        self.agent_state.status = AgentStatus.AVAILABLE
+        self._touch()
+        self.logger.info("Agent %s finished %d tasks (%d failed) in %.2fs",
+                         self.name, len(tasks), failed, time.monotonic() - start_time)
+        
+        return results
+    
+    @staticmethod
+    def _result_or_exception(call, *args) -> Any:
+        try:
+            return call(*args)
+        except Exception as e:
+            return e
+    
     def send_message(self, recipient_id: str, message_content: Dict[str, Any], 
                     subject: str = "Agent Communication") -> bool:
         try:
             # This would integrate with the communication system
             # For now, we'll log the message
-            self.logger.info(f"Agent {self.name} sending message to {recipient_id}: {subject}")
-            self.logger.debug(f"Message content: {message_content}")
+            self.logger.info("Agent %s sending message to %s: %s", self.name, recipient_id, subject)
+            self.logger.debug("Message content: %s", message_content)
             
             # Update last activity
-            self.agent_state.last_activity = datetime.utcnow()
-            self.agent_state.last_updated = datetime.utcnow()
+            self.agent_state.last_activity = self._touch()
             
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to send message: {str(e)}")
+            self.logger.error("Failed to send message: %s", e)
             return False
     
     def update_status(self, status: AgentStatus, message: str = None) -> None:
         old_status = self.agent_state.status
         self.agent_state.status = status
-        self.agent_state.last_updated = datetime.utcnow()
+        self._touch()
         
         if message:
             self.agent_state.context['status_message'] = message
         
-        self.logger.info(f"Agent {self.name} status changed from {old_status} to {status}")
+        self.logger.info("Agent %s status changed from %s to %s", self.name, old_status, status)
         if message:
-            self.logger.info(f"Status message: {message}")
+            self.logger.info("Status message: %s", message)
     
     def health_check(self) -> bool:
         try:
@@ -144,21 +239,27 @@ class BaseWorkerAgent(ABC):
             )
             
             self.agent_state.health_check_passed = is_healthy
-            self.agent_state.last_updated = datetime.utcnow()
+            self._touch()
             
             return is_healthy
             
         except Exception as e:
-            self.logger.error(f"Health check failed for agent {self.name}: {str(e)}")
+            self.logger.error("Health check failed for agent %s: %s", self.name, e)
             self.set_error(f"Health check failed: {str(e)}")
             return False
     
     def get_state(self) -> AgentState:
-        return self.agent_state.copy(deep=True)
+        # Shallow snapshot: the mutable containers are copied one level deep, so changes to
+        # the returned state don't leak back, but objects stored inside context are shared
+        state = self.agent_state
+        return state.model_copy(update={
+            'capabilities': list(state.capabilities),
+            'context': dict(state.context)
+        })
     
     def update_context(self, context: Dict[str, Any]) -> None:
         self.agent_state.context.update(context)
-        self.agent_state.last_updated = datetime.utcnow()
+        self._touch()
     
     def __str__(self) -> str:
         return f"{self.__class__.__name__}(name='{self.name}', id='{self.agent_id}', status='{self.status}')"
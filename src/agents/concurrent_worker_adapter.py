@@ -1,74 +1,224 @@
 
-from typing import Dict, Any, List, Optional, Callable, Union
-from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional, Callable, Tuple, Union
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import copy
+import functools
+import json
 import logging
+import queue
 import threading
-import copy
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 import uuid
 
 from .base_agent import BaseWorkerAgent
-from .text_analysis_agent import TextAnalysisAgent
-from .data_processing_agent import DataProcessingAgent
-from .api_interaction_agent import APIInteractionAgent
 from ..core.models import AgentCapability, Task, TaskStatus, AgentStatus
 
 
 logger = logging.getLogger(__name__)
 
+# Prototype agents shared by adapters with the same class and config; only read, never mutated
+_prototype_cache: Dict[Tuple[type, frozenset], BaseWorkerAgent] = {}
+
+
+class SubtaskResult(Mapping):
+    # Slotted result record; reads like a read-only dict so existing `.get("status")` callers keep working,
+    # and dict(result) / to_dict() give a plain dict where one is needed for serialization
+    
+    __slots__ = ('subtask_id', 'status', 'result', 'agent_id', 'agent_name', 'agent_class',
+                 'execution_time', 'completed_at', 'completed_ts', 'thread_id', 'capabilities_used')
+    _FIELDS = frozenset(__slots__)
+    
+    def __init__(self, subtask_id: str, status: str, result: Dict[str, Any], agent_id: str, agent_name: str,
+                 agent_class: str, execution_time: float, completed_at: str, completed_ts: float,
+                 thread_id: int, capabilities_used: Tuple[str, ...]):
+        self.subtask_id = subtask_id
+        self.status = status
+        self.result = result
+        self.agent_id = agent_id
+        self.agent_name = agent_name
+        self.agent_class = agent_class
+        self.execution_time = execution_time
+        self.completed_at = completed_at
+        self.completed_ts = completed_ts
+        self.thread_id = thread_id
+        self.capabilities_used = capabilities_used
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def __iter__(self):
+        return iter(self.__slots__)
+    
+    def __len__(self) -> int:
+        return len(self.__slots__)
+    
+    def __repr__(self) -> str:
+        return f"SubtaskResult(subtask_id={self.subtask_id!r}, status={self.status!r})"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass
+class SubtaskBatch:
+    # Structure-of-arrays form of a subtask list: one column per field, aligned by index
+    task_ids: List[str] = field(default_factory=list)
+    titles: List[Optional[str]] = field(default_factory=list)
+    parameters: List[Dict[str, Any]] = field(default_factory=list)
+    capabilities: List[List[str]] = field(default_factory=list)
+    priorities: List[str] = field(default_factory=list)
+    cacheable: List[bool] = field(default_factory=list)
+    
+    @classmethod
+    def from_subtasks(cls, subtasks: List[Dict[str, Any]]) -> "SubtaskBatch":
+        return cls(
+            task_ids=[subtask.get("task_id", "unknown") for subtask in subtasks],
+            titles=[subtask.get("title") for subtask in subtasks],
+            parameters=[subtask.get("parameters", {}) for subtask in subtasks],
+            capabilities=[subtask.get("required_capabilities", []) for subtask in subtasks],
+            priorities=[subtask.get("priority", "medium") for subtask in subtasks],
+            cacheable=[subtask.get("cacheable", False) for subtask in subtasks]
+        )
+    
+    def __len__(self) -> int:
+        return len(self.task_ids)
+    
+    def append(self, task_id: str, parameters: Dict[str, Any] = None, required_capabilities: List[str] = None,
+               title: Optional[str] = None, priority: str = "medium", cacheable: bool = False):
+        self.task_ids.append(task_id)
+        self.titles.append(title)
+        self.parameters.append(parameters or {})
+        self.capabilities.append(required_capabilities or [])
+        self.priorities.append(priority)
+        self.cacheable.append(cacheable)
+    
+    def subtask(self, index: int) -> Dict[str, Any]:
+        subtask = {
+            "task_id": self.task_ids[index],
+            "parameters": self.parameters[index],
+            "required_capabilities": self.capabilities[index],
+            "priority": self.priorities[index]
+        }
+        if self.titles[index] is not None:
+            subtask["title"] = self.titles[index]
+        if self.cacheable[index]:
+            subtask["cacheable"] = True
+        return subtask
+    
+    def subtasks(self, indices: Iterable[int]) -> List[Dict[str, Any]]:
+        return [self.subtask(index) for index in indices]
+
+
+def _get_prototype(worker_agent_class: type, agent_config: Dict[str, Any]) -> BaseWorkerAgent:
+    try:
+        key = (worker_agent_class, frozenset(agent_config.items()))
+    except TypeError:
+        # Unhashable config values: build a private prototype
+        return worker_agent_class(**agent_config)
+    
+    prototype = _prototype_cache.get(key)
+    if prototype is None:
+        prototype = _prototype_cache.setdefault(key, worker_agent_class(**agent_config))
+    return prototype
+
+
+def _completion_stamp() -> Dict[str, Any]:
+    # One clock read for both forms: the naive-UTC ISO string consumers expect, and the epoch float
+    completed_ts = time.time()
+    completed_at = datetime.fromtimestamp(completed_ts, timezone.utc).replace(tzinfo=None).isoformat()
+    return {"completed_at": completed_at, "completed_ts": completed_ts}
+
 
 class ConcurrentWorkerAdapter:
     
     def __init__(self, worker_agent_class: type, agent_config: Dict[str, Any] = None):
         self.worker_agent_class = worker_agent_class
         self.agent_config = agent_config or {}
+        # Per-thread agents; threading.local drops a thread's agent when the thread exits
         self.thread_local = threading.local()
-        self.execution_lock = threading.Lock()
+        self._base_name = self.agent_config.get('name', worker_agent_class.__name__)
+        
+        # With set_pool_size in effect, threads borrow agents from a bounded pool instead;
+        # idle pooled agents wait in _idle_agents until a thread checks one out
+        self._pool: List[BaseWorkerAgent] = []
+        self._pool_size: Optional[int] = None
+        self._pool_lock = threading.Lock()
+        self._idle_agents: "queue.SimpleQueue[BaseWorkerAgent]" = queue.SimpleQueue()
         
-        # Create a prototype agent to get capabilities and other metadata
-        self.prototype_agent = worker_agent_class(**self.agent_config)
+        # Prototype agent for capabilities and other metadata, shared with identically configured adapters
+        self.prototype_agent = _get_prototype(worker_agent_class, self.agent_config)
+        
+        # Capabilities are fixed per adapter, so derive the values and info dict once
+        self.capability_values = tuple(cap.value for cap in self.prototype_agent.capabilities)
+        self._agent_info = {
+            "agent_class": worker_agent_class.__name__,
+            "capabilities": list(self.capability_values),
+            "agent_type": self.prototype_agent.agent_state.agent_type,
+            "config": self.agent_config
+        }
         
-        logger.info(f"Concurrent adapter initialized for {worker_agent_class.__name__}")
+        logger.info("Concurrent adapter initialized for %s", worker_agent_class.__name__)
     
     def get_capabilities(self) -> List[AgentCapability]:
         return self.prototype_agent.capabilities
     
     def get_agent_info(self) -> Dict[str, Any]:
-        return {
-            "agent_class": self.worker_agent_class.__name__,
-            "capabilities": [cap.value for cap in self.prototype_agent.capabilities],
-            "agent_type": self.prototype_agent.agent_state.agent_type,
-            "config": self.agent_config
-        }
+        # Shared between calls; callers must treat it as read-only
+        return self._agent_info
     
     def execute_subtask(self, subtask_data: Dict[str, Any], context: Dict[str, Any] = None) -> Dict[str, Any]:
+        # Run on an agent no other thread is using, to avoid state conflicts
+        return self.execute_subtask_batch([subtask_data], context)[0]
+    
+    def execute_subtask_batch(self, subtasks: List[Dict[str, Any]], 
+                              context: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        # Run a whole group in one thread entry, resolving the agent once
+        agent_instance = None
+        pooled = self._pool_size is not None
+        
+        def get_agent() -> BaseWorkerAgent:
+            nonlocal agent_instance
+            if agent_instance is None:
+                agent_instance = self._checkout_agent() if pooled else self._get_thread_local_agent()
+            return agent_instance
+        
+        try:
+            return [self._execute_with_agent(get_agent, subtask, context) for subtask in subtasks]
+        finally:
+            if pooled and agent_instance is not None:
+                self._idle_agents.put(agent_instance)
+    
+    def _execute_with_agent(self, get_agent: Callable[[], BaseWorkerAgent], subtask_data: Dict[str, Any], 
+                            context: Dict[str, Any] = None) -> Dict[str, Any]:
         try:
-            # Create a thread-local agent instance to avoid state conflicts
-            agent_instance = self._get_thread_local_agent()
+            agent_instance = get_agent()
             
             # Convert subtask data to Task object
             task = self._create_task_from_subtask(subtask_data)
             
-            # Prepare context
-            execution_context = context or {}
-            execution_context.update(subtask_data.get("context", {}))
+            # Prepare context; a fresh dict, since the caller's context is shared by every subtask and cache key
+            execution_context = {**(context or {}), **subtask_data.get("context", {})}
             
-            # Mark agent as busy for this execution
-            with self.execution_lock:
-                agent_instance.start_task(task)
+            # Mark agent as busy for this execution; no other thread holds this agent, so no lock is needed
+            agent_instance.start_task(task)
             
-            start_time = datetime.utcnow()
+            start_ns = time.perf_counter_ns()
             
             try:
                 # Execute the task
                 result = agent_instance.execute(task, execution_context)
                 
                 # Calculate execution time
-                execution_time = (datetime.utcnow() - start_time).total_seconds()
+                execution_time = (time.perf_counter_ns() - start_ns) / 1e9
                 
                 # Mark task as completed
-                with self.execution_lock:
-                    agent_instance.complete_task(task, execution_time, success=True)
+                agent_instance.complete_task(task, execution_time, success=True)
                 
                 # Format result for concurrent execution
                 return self._format_concurrent_result(
@@ -81,14 +231,13 @@ class ConcurrentWorkerAdapter:
                 
             except Exception as task_error:
                 # Calculate execution time even for failures
-                execution_time = (datetime.utcnow() - start_time).total_seconds()
+                execution_time = (time.perf_counter_ns() - start_ns) / 1e9
                 
                 # Mark task as failed
-                with self.execution_lock:
-                    agent_instance.complete_task(task, execution_time, success=False)
-                    agent_instance.set_error(f"Task execution failed: {str(task_error)}")
+                agent_instance.complete_task(task, execution_time, success=False)
+                agent_instance.set_error(f"Task execution failed: {str(task_error)}")
                 
-                logger.error(f"Task execution failed for {task.task_id}: {str(task_error)}")
+                logger.error("Task execution failed for %s: %s", task.task_id, task_error)
                 
                 # Return error result
                 return self._format_concurrent_result(
@@ -100,31 +249,53 @@ class ConcurrentWorkerAdapter:
                 )
         
         except Exception as e:
-            logger.error(f"Concurrent worker adapter failed: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Concurrent worker adapter failed: %s", e)
             return {
                 "subtask_id": subtask_data.get("task_id", "unknown"),
                 "status": "failed",
                 "error": f"Adapter error: {str(e)}",
                 "agent_class": self.worker_agent_class.__name__,
                 "execution_time": 0.0,
-                "completed_at": datetime.utcnow().isoformat()
+                **_completion_stamp()
             }
     
+    def set_pool_size(self, max_agents: Optional[int]):
+        # Cap how many agents this adapter creates; threads beyond the cap wait for a pooled agent to be returned
+        if max_agents is not None and max_agents < 1:
+            raise ValueError("Pool size must be at least 1")
+        self._pool_size = max_agents
+    
     def _get_thread_local_agent(self) -> BaseWorkerAgent:
-        if not hasattr(self.thread_local, 'agent'):
-            # Create a new agent instance for this thread
-            agent_config = self.agent_config.copy()
-            # Add thread identifier to agent name to avoid conflicts
-            thread_id = threading.get_ident()
-            original_name = agent_config.get('name', self.worker_agent_class.__name__)
-            agent_config['name'] = f"{original_name}_thread_{thread_id}"
-            
-            self.thread_local.agent = self.worker_agent_class(**agent_config)
-            logger.debug(f"Created thread-local agent: {self.thread_local.agent.name}")
+        try:
+            return self.thread_local.agent
+        except AttributeError:
+            pass
+        
+        # Create a new agent instance for this thread, named after it to avoid conflicts
+        agent = self._new_agent(f"thread_{threading.get_ident()}")
+        self.thread_local.agent = agent
+        logger.debug("Created thread-local agent: %s", agent.name)
+        return agent
+    
+    def _checkout_agent(self) -> BaseWorkerAgent:
+        # Borrow an idle pooled agent, create one while under the cap, or wait until one is returned
+        try:
+            return self._idle_agents.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._pool_lock:
+            pool_size = self._pool_size
+            if pool_size is None or len(self._pool) < pool_size:
+                agent = self._new_agent(f"pooled_{len(self._pool)}")
+                self._pool.append(agent)
+                logger.debug("Created pooled agent: %s", agent.name)
+                return agent
         
-        return self.thread_local.agent
+        return self._idle_agents.get()
+    
+    def _new_agent(self, suffix: str) -> BaseWorkerAgent:
+        return self.worker_agent_class(**{**self.agent_config, 'name': f"{self._base_name}_{suffix}"})
     
     def _create_task_from_subtask(self, subtask_data: Dict[str, Any]) -> Task:
         return Task(
@@ -139,31 +310,45 @@ class ConcurrentWorkerAdapter:
     
     def _format_concurrent_result(self, result: Dict[str, Any], subtask_data: Dict[str, Any], 
                                  agent_instance: BaseWorkerAgent, execution_time: float, 
-                                 success: bool) -> Dict[str, Any]:
-        return {
-            "subtask_id": subtask_data.get("task_id", "unknown"),
-            "status": "completed" if success else "failed",
-            "result": result,
-            "agent_id": agent_instance.agent_id,
-            "agent_name": agent_instance.name,
-            "agent_class": self.worker_agent_class.__name__,
-            "execution_time": execution_time,
-            "completed_at": datetime.utcnow().isoformat(),
-            "thread_id": threading.get_ident(),
-            "capabilities_used": [cap.value for cap in agent_instance.capabilities]
-        }
+                                 success: bool) -> SubtaskResult:
+        stamp = _completion_stamp()
+        return SubtaskResult(
+            subtask_data.get("task_id", "unknown"),
+            "completed" if success else "failed",
+            result,
+            agent_instance.agent_id,
+            agent_instance.name,
+            self.worker_agent_class.__name__,
+            execution_time,
+            stamp["completed_at"],
+            stamp["completed_ts"],
+            threading.get_ident(),
+            self.capability_values
+        )
 
 
 class ConcurrentWorkerRegistry:
     
-    def __init__(self):
+    def __init__(self, result_cache_size: int = 512):
         self.adapters: Dict[str, ConcurrentWorkerAdapter] = {}
         self.capability_map: Dict[str, List[str]] = {}
+        # First adapter registered for each capability, so lookups stop at the first match
+        self._first_adapter_for_capability: Dict[str, str] = {}
+        
+        # LRU of results for subtasks that opt in with "cacheable": True
+        self.result_cache_size = result_cache_size
+        self._result_cache: OrderedDict = OrderedDict()
+        self._result_cache_lock = threading.Lock()
         
         # Register default worker adapters
         self._register_default_adapters()
     
     def _register_default_adapters(self):
+        # Imported here so only registries that actually use the defaults pay for these modules
+        from .text_analysis_agent import TextAnalysisAgent
+        from .data_processing_agent import DataProcessingAgent
+        from .api_interaction_agent import APIInteractionAgent
+        
         # Text Analysis Agent
         self.register_adapter(
             "text_analyzer",
@@ -193,33 +378,35 @@ class ConcurrentWorkerRegistry:
             self.adapters[adapter_id] = adapter
             
             # Update capability mapping
-            capabilities = [cap.value for cap in adapter.get_capabilities()]
-            for capability in capabilities:
+            for capability in adapter.capability_values:
                 if capability not in self.capability_map:
                     self.capability_map[capability] = []
                 self.capability_map[capability].append(adapter_id)
+                self._first_adapter_for_capability.setdefault(capability, adapter_id)
             
-            logger.info(f"Registered concurrent adapter '{adapter_id}' for {worker_class.__name__}")
+            logger.info("Registered concurrent adapter '%s' for %s", adapter_id, worker_class.__name__)
             
         except Exception as e:
-            logger.error(f"Failed to register adapter '{adapter_id}': {str(e)}")
+            logger.error("Failed to register adapter '%s': %s", adapter_id, e)
             raise
     
-    def find_suitable_adapter(self, required_capabilities: List[str]) -> Optional[ConcurrentWorkerAdapter]:
+    def find_suitable_adapter_id(self, required_capabilities: List[str]) -> Optional[str]:
         if not required_capabilities:
             # Return first available adapter if no specific requirements
-            return next(iter(self.adapters.values()), None)
+            return next(iter(self.adapters), None)
         
-        # Find adapters that have at least one matching capability
-        suitable_adapters = []
+        # Return the first adapter that has at least one matching capability
+        first_adapter = self._first_adapter_for_capability
         for capability in required_capabilities:
-            if capability in self.capability_map:
-                for adapter_id in self.capability_map[capability]:
-                    if adapter_id in self.adapters:
-                        suitable_adapters.append(self.adapters[adapter_id])
+            adapter_id = first_adapter.get(capability)
+            if adapter_id is not None:
+                return adapter_id
         
-        # Return the first suitable adapter
-        return suitable_adapters[0] if suitable_adapters else None
+        return None
+    
+    def find_suitable_adapter(self, required_capabilities: List[str]) -> Optional[ConcurrentWorkerAdapter]:
+        adapter_id = self.find_suitable_adapter_id(required_capabilities)
+        return self.adapters[adapter_id] if adapter_id is not None else None
     
     def get_adapter(self, adapter_id: str) -> Optional[ConcurrentWorkerAdapter]:
         return self.adapters.get(adapter_id)
@@ -230,79 +417,315 @@ class ConcurrentWorkerRegistry:
             for adapter_id, adapter in self.adapters.items()
         }
     
+    def no_adapter_result(self, subtask_data: Dict[str, Any]) -> Dict[str, Any]:
+        required_capabilities = subtask_data.get("required_capabilities", [])
+        logger.warning("No suitable adapter found for capabilities: %s", required_capabilities)
+        return {
+            "subtask_id": subtask_data.get("task_id", "unknown"),
+            "status": "failed",
+            "error": f"No suitable adapter for capabilities: {required_capabilities}",
+            "execution_time": 0.0,
+            **_completion_stamp()
+        }
+    
     def execute_subtask_with_best_adapter(self, subtask_data: Dict[str, Any], 
                                         context: Dict[str, Any] = None) -> Dict[str, Any]:
         required_capabilities = subtask_data.get("required_capabilities", [])
         
         # Find suitable adapter
-        adapter = self.find_suitable_adapter(required_capabilities)
+        adapter_id = self.find_suitable_adapter_id(required_capabilities)
         
-        if not adapter:
-            logger.warning(f"No suitable adapter found for capabilities: {required_capabilities}")
-            return {
-                "subtask_id": subtask_data.get("task_id", "unknown"),
-                "status": "failed",
-                "error": f"No suitable adapter for capabilities: {required_capabilities}",
-                "execution_time": 0.0,
-                "completed_at": datetime.utcnow().isoformat()
-            }
+        if adapter_id is None:
+            return self.no_adapter_result(subtask_data)
+        
+        return self.execute_subtask_batch(adapter_id, [subtask_data], context)[0]
+    
+    def execute_subtask_batch(self, adapter_id: str, subtasks: List[Dict[str, Any]],
+                              context: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        # Run a group on one adapter; subtasks without side effects opt in to result reuse with "cacheable"
+        adapter = self.adapters[adapter_id]
+        if not any(subtask.get("cacheable", False) for subtask in subtasks):
+            return adapter.execute_subtask_batch(subtasks, context)
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(subtasks)
+        misses: List[Tuple[int, Optional[tuple]]] = []
+        for index, subtask_data in enumerate(subtasks):
+            if not subtask_data.get("cacheable", False):
+                misses.append((index, None))
+                continue
+            
+            cache_key = self._cache_key(adapter_id, subtask_data, context)
+            cached = self._cached_result(cache_key, subtask_data)
+            if cached is None:
+                misses.append((index, cache_key))
+            else:
+                results[index] = cached
+        
+        executed = adapter.execute_subtask_batch([subtasks[index] for index, _ in misses], context)
+        for (index, cache_key), result in zip(misses, executed):
+            results[index] = result
+            if cache_key is not None and result.get("status") == "completed":
+                self._store_result(cache_key, result)
+        
+        return results
+    
+    @staticmethod
+    def _cache_key(adapter_id: str, subtask_data: Dict[str, Any], context: Optional[Dict[str, Any]]) -> tuple:
+        # The agent sees the parameters and both contexts, so all of them decide the result
+        return (
+            adapter_id,
+            json.dumps(
+                [subtask_data.get("parameters", {}), context or {}, subtask_data.get("context", {})],
+                sort_keys=True,
+                default=str
+            )
+        )
+    
+    def _cached_result(self, cache_key: tuple, subtask_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._result_cache_lock:
+            cached = self._result_cache.get(cache_key)
+            if cached is None:
+                return None
+            self._result_cache.move_to_end(cache_key)
         
-        # Execute the subtask
-        return adapter.execute_subtask(subtask_data, context)
+        # Every hit gets its own copy, so callers can't change what later hits see
+        return {
+            **copy.deepcopy(cached),
+            "subtask_id": subtask_data.get("task_id", "unknown"),
+            "execution_time": 0.0,
+            **_completion_stamp(),
+            "cached": True
+        }
+    
+    def _store_result(self, cache_key: tuple, result: Dict[str, Any]):
+        # Stored as a private copy; the caller keeps the original and may modify it
+        entry = copy.deepcopy(dict(result))
+        with self._result_cache_lock:
+            self._result_cache[cache_key] = entry
+            self._result_cache.move_to_end(cache_key)
+            if len(self._result_cache) > self.result_cache_size:
+                self._result_cache.popitem(last=False)
 
 
 class ConcurrentExecutionPool:
     
+    # Pools handed out by get_shared, keyed by max_workers
+    _shared_instances: Dict[int, "ConcurrentExecutionPool"] = {}
+    _shared_lock = threading.Lock()
+    
     def __init__(self, max_workers: int = 4, worker_registry: ConcurrentWorkerRegistry = None):
         self.max_workers = max_workers
         self.worker_registry = worker_registry or ConcurrentWorkerRegistry()
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
         
-        logger.info(f"Concurrent execution pool initialized with {max_workers} workers")
+        # One executor per adapter so subtasks for different agents never contend on a shared work queue;
+        # each shard gets the full worker budget, so one busy adapter runs as wide as a single shared
+        # executor would, and each shard is only started on first use
+        self.workers_per_adapter = max(1, max_workers)
+        self.executors: Dict[str, ThreadPoolExecutor] = {}
+        self._executors_lock = threading.Lock()
+        
+        logger.info("Concurrent execution pool initialized with up to %d workers per adapter", self.workers_per_adapter)
+    
+    @classmethod
+    def get_shared(cls, max_workers: int = 4) -> "ConcurrentExecutionPool":
+        # Reuse one pool per size over the global registry instead of spawning threads for ad-hoc pools
+        with cls._shared_lock:
+            pool = cls._shared_instances.get(max_workers)
+            if pool is None:
+                pool = cls(max_workers=max_workers, worker_registry=get_global_worker_registry())
+                cls._shared_instances[max_workers] = pool
+            return pool
+    
+    def _executor_for(self, adapter_id: str) -> ThreadPoolExecutor:
+        executor = self.executors.get(adapter_id)
+        if executor is None:
+            with self._executors_lock:
+                executor = self.executors.get(adapter_id)
+                if executor is None:
+                    executor = ThreadPoolExecutor(
+                        max_workers=self.workers_per_adapter,
+                        thread_name_prefix=f"pool-{adapter_id}"
+                    )
+                    self.executors[adapter_id] = executor
+        return executor
     
     def execute_subtasks_concurrently(self, subtasks: List[Dict[str, Any]], 
                                     context: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         if not subtasks:
             return []
         
-        logger.info(f"Starting concurrent execution of {len(subtasks)} subtasks")
+        return self._dispatch(
+            (subtask.get("required_capabilities", []) for subtask in subtasks),
+            len(subtasks),
+            lambda index: subtasks[index].get("task_id", "unknown"),
+            lambda indices: [subtasks[i] for i in indices],
+            context
+        )
+    
+    def execute_batch(self, batch: "SubtaskBatch", context: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        # Scheduling only walks the capabilities column; subtask dicts are built inside the worker threads
+        if not len(batch):
+            return []
+        
+        return self._dispatch(batch.capabilities, len(batch), batch.task_ids.__getitem__, batch.subtasks, context)
+    
+    @staticmethod
+    def _run_batch(run_batch: Callable, materialize: Callable, indices: List[int],
+                   context: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        return run_batch(materialize(indices), context)
+    
+    def _dispatch(self, capabilities: Iterable[List[str]], count: int, task_id_of: Callable[[int], str],
+                  materialize: Callable[[List[int]], List[Dict[str, Any]]],
+                  context: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        logger.info("Starting concurrent execution of %d subtasks", count)
         
-        # Submit all subtasks for concurrent execution
-        future_to_subtask = {}
-        for subtask in subtasks:
-            future = self.executor.submit(
-                self.worker_registry.execute_subtask_with_best_adapter,
-                subtask,
-                context
-            )
-            future_to_subtask[future] = subtask
+        results: List[Optional[Dict[str, Any]]] = [None] * count
+        
+        # Resolve adapters here, so worker threads only execute; subtasks nobody can run fail without being submitted
+        groups: Dict[str, List[int]] = {}
+        find_adapter_id = self.worker_registry.find_suitable_adapter_id
+        for index, required_capabilities in enumerate(capabilities):
+            adapter_id = find_adapter_id(required_capabilities)
+            if adapter_id is None:
+                results[index] = self.worker_registry.no_adapter_result(materialize([index])[0])
+            else:
+                groups.setdefault(adapter_id, []).append(index)
+        
+        # Submit one batch per shard worker rather than one future per subtask; batches go through
+        # the registry so cacheable subtasks can reuse earlier results
+        batches = []
+        for adapter_id, indices in groups.items():
+            executor = self._executor_for(adapter_id)
+            run_batch = functools.partial(self.worker_registry.execute_subtask_batch, adapter_id)
+            
+            batch_size = -(-len(indices) // self.workers_per_adapter)
+            for start in range(0, len(indices), batch_size):
+                batch_indices = indices[start:start + batch_size]
+                future = executor.submit(self._run_batch, run_batch, materialize, batch_indices, context)
+                batches.append((future, batch_indices))
+        
+        # Every result lands at its input position, so batches can simply be awaited in submission order
+        for future, batch_indices in batches:
+            try:
+                for index, result in zip(batch_indices, future.result()):
+                    results[index] = result
+            except Exception as e:
+                for index in batch_indices:
+                    task_id = task_id_of(index)
+                    logger.error("Subtask %s failed: %s", task_id, e)
+                    # Create error result
+                    results[index] = {
+                        "subtask_id": task_id,
+                        "status": "failed",
+                        "error": f"Execution error: {str(e)}",
+                        "execution_time": 0.0,
+                        **_completion_stamp()
+                    }
+        
+        logger.info("Concurrent execution completed: %d results", len(results))
+        logger.debug("Completed %d subtasks in %d batches across %d adapters", len(results), len(batches), len(groups))
+        return results
+    
+    def shutdown(self, wait: bool = True):
+        with self._shared_lock:
+            if self._shared_instances.get(self.max_workers) is self:
+                del self._shared_instances[self.max_workers]
+        
+        with self._executors_lock:
+            executors = list(self.executors.values())
+            self.executors.clear()
+        for executor in executors:
+            executor.shutdown(wait=wait)
+        logger.info("Concurrent execution pool shutdown")
+
+
+class FastConcurrentPool:
+    # Same API as ConcurrentExecutionPool for floods of very short subtasks: jobs sit in a deque
+    # (append/popleft are atomic) and a semaphore released once per job wakes exactly one parked worker
+    
+    def __init__(self, max_workers: int = 4, worker_registry: ConcurrentWorkerRegistry = None):
+        self.max_workers = max_workers
+        self.worker_registry = worker_registry or ConcurrentWorkerRegistry()
+        
+        self._jobs: deque = deque()
+        self._ready = threading.Semaphore(0)
+        self._shutdown = False
+        self._workers = [
+            threading.Thread(target=self._worker_loop, name=f"fast-pool-{i}", daemon=True)
+            for i in range(max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+        
+        logger.info("Fast concurrent pool initialized with %d workers", max_workers)
+    
+    def _worker_loop(self):
+        while True:
+            self._ready.acquire()
+            try:
+                job = self._jobs.popleft()
+            except IndexError:
+                continue
+            
+            if job is None:
+                # Shutdown sentinel, one per worker
+                return
+            
+            future, fn, args = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+    
+    def submit(self, fn: Callable, *args) -> Future:
+        if self._shutdown:
+            raise RuntimeError("Cannot submit to a pool that has been shut down")
+        
+        future = Future()
+        self._jobs.append((future, fn, args))
+        self._ready.release()
+        return future
+    
+    def execute_subtasks_concurrently(self, subtasks: List[Dict[str, Any]], 
+                                    context: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        if not subtasks:
+            return []
+        
+        futures = [
+            self.submit(self.worker_registry.execute_subtask_with_best_adapter, subtask, context)
+            for subtask in subtasks
+        ]
         
-        # Collect results as they complete
         results = []
-        for future in as_completed(future_to_subtask):
-            subtask = future_to_subtask[future]
+        for subtask, future in zip(subtasks, futures):
             try:
-                result = future.result()
-                results.append(result)
-                logger.debug(f"Subtask {subtask.get('task_id', 'unknown')} completed")
+                results.append(future.result())
             except Exception as e:
-                logger.error(f"Subtask {subtask.get('task_id', 'unknown')} failed: {str(e)}")
-                # Create error result
-                error_result = {
+                logger.error("Subtask %s failed: %s", subtask.get('task_id', 'unknown'), e)
+                results.append({
                     "subtask_id": subtask.get("task_id", "unknown"),
                     "status": "failed",
                     "error": f"Execution error: {str(e)}",
                     "execution_time": 0.0,
-                    "completed_at": datetime.utcnow().isoformat()
-                }
-                results.append(error_result)
+                    **_completion_stamp()
+                })
         
-        logger.info(f"Concurrent execution completed: {len(results)} results")
+        logger.debug("Completed %d subtasks", len(results))
         return results
     
     def shutdown(self, wait: bool = True):
-        self.executor.shutdown(wait=wait)
-        logger.info("Concurrent execution pool shutdown")
+        if not self._shutdown:
+            self._shutdown = True
+            for _ in self._workers:
+                self._jobs.append(None)
+                self._ready.release()
+        
+        if wait:
+            for worker in self._workers:
+                worker.join()
+        logger.info("Fast concurrent pool shutdown")
 
 
 # Global instances for easy access
@@ -320,8 +743,5 @@ def get_global_worker_registry() -> ConcurrentWorkerRegistry:
 def get_global_execution_pool(max_workers: int = 4) -> ConcurrentExecutionPool:
     global _global_execution_pool
     if _global_execution_pool is None:
-        _global_execution_pool = ConcurrentExecutionPool(
-            max_workers=max_workers,
-            worker_registry=get_global_worker_registry()
-        )
+        _global_execution_pool = ConcurrentExecutionPool.get_shared(max_workers)
     return _global_execution_pool
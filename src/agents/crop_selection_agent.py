@@ -5,11 +5,27 @@ Provides yield predictions and cultivation advice with satellite data integratio
 """
 
 import asyncio
+import bisect
+import heapq
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from operator import attrgetter
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
-import json
+from types import MappingProxyType
+
+import numpy as np
+import orjson
+
+try:
+    from numba import njit
+except ImportError:  # Optional: scoring then runs as NumPy mask operations
+    njit = None
 
 from .base_agent import BaseWorkerAgent
 from .satellite_integration import get_satellite_data_for_location, format_satellite_summary
@@ -20,10 +36,263 @@ from ..core.agriculture_models import (
 
 logger = logging.getLogger(__name__)
 
+# Market demand contribution to the suitability score
+_MARKET_SCORES = {"very_high": 0.08, "high": 0.06, "medium": 0.04, "low": 0.02}
+# Regions where high-demand varieties get an extra market-access bonus
+_HIGH_DEMAND_REGIONS = ("Punjab", "Maharashtra")
 
-@dataclass
+# Query keywords for context extraction; earlier entries win within a category
+_SEASON_KEYWORDS = {
+    SeasonType.RABI: ("rabi", "winter", "december", "january", "february"),
+    SeasonType.KHARIF: ("kharif", "monsoon", "june", "july", "august"),
+    SeasonType.ZAID: ("zaid", "summer", "march", "april", "may"),
+}
+_HINDI_CROP_NAMES = {
+    CropType.WHEAT: ("gehu", "gehun"),
+    CropType.RICE: ("chawal", "dhan"),
+    CropType.COTTON: ("kapas",),
+    CropType.SUGARCANE: ("ganna",),
+    CropType.MAIZE: ("makka",),
+}
+_SOIL_KEYWORDS = {
+    "sandy": SoilType.SANDY,
+    "clay": SoilType.CLAY,
+    "loamy": SoilType.LOAMY,
+    "black": SoilType.CLAY,
+    "red": SoilType.SANDY,
+}
+
+# Satellite thresholds the scoring and advice compare against; readings between the same
+# thresholds give identical recommendations, so they share a recommendation cache entry
+_NDVI_THRESHOLDS = (0.3, 0.5, 0.6, 0.7)
+_MOISTURE_THRESHOLDS = (0.2, 0.3, 0.5, 0.7, 0.8)
+RECOMMENDATION_CACHE_SIZE = 2048
+_suitability_score = attrgetter("suitability_score")
+
+# Process-wide event loop that sync callers submit queries to, so connections survive between calls
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_LOCK = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    global _LOOP
+    if _LOOP is None:
+        with _LOOP_LOCK:
+            if _LOOP is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="crop-selection-loop", daemon=True).start()
+                _LOOP = loop
+    return _LOOP
+
+
+# Satellite tiles are ~100 m, so readings for the same rounded coordinates are reused for a while
+SATELLITE_CACHE_TTL = 1800.0  # seconds
+SATELLITE_CACHE_SIZE = 4096
+_satellite_cache: "OrderedDict[Tuple[float, float], Tuple[float, Dict]]" = OrderedDict()
+_satellite_cache_lock = threading.Lock()
+# Fetches in flight per event loop, so concurrent queries for one spot share a single request
+_satellite_inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict]" = weakref.WeakKeyDictionary()
+
+
+def _satellite_cache_get(key: Tuple[float, float]) -> Optional[Dict]:
+    with _satellite_cache_lock:
+        entry = _satellite_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _satellite_cache[key]
+            return None
+        _satellite_cache.move_to_end(key)
+        return entry[1]
+
+
+async def _fetch_and_cache_satellite_data(key: Tuple[float, float], latitude: float, longitude: float,
+                                          location_name: Optional[str]) -> Optional[Dict]:
+    satellite_data = await get_satellite_data_for_location(latitude, longitude, location_name)
+    if satellite_data:
+        with _satellite_cache_lock:
+            _satellite_cache[key] = (time.monotonic() + SATELLITE_CACHE_TTL, satellite_data)
+            _satellite_cache.move_to_end(key)
+            if len(_satellite_cache) > SATELLITE_CACHE_SIZE:
+                _satellite_cache.popitem(last=False)
+    return satellite_data
+
+
+async def _cached_satellite_data(latitude: float, longitude: float, location_name: Optional[str] = None) -> Optional[Dict]:
+    """Satellite data for a location, served from the TTL cache when a nearby reading is fresh"""
+    key = (round(latitude, 3), round(longitude, 3))
+    satellite_data = _satellite_cache_get(key)
+    if satellite_data is not None:
+        return satellite_data
+    
+    loop = asyncio.get_running_loop()
+    inflight = _satellite_inflight.setdefault(loop, {})
+    fetch = inflight.get(key)
+    if fetch is None:
+        fetch = loop.create_task(_fetch_and_cache_satellite_data(key, latitude, longitude, location_name))
+        inflight[key] = fetch
+        fetch.add_done_callback(lambda _: inflight.pop(key, None))
+    
+    # Shielded so one cancelled caller doesn't cancel the fetch for the others
+    return await asyncio.shield(fetch)
+
+
+_NO_ROWS = np.empty(0, dtype=np.intp)
+
+# Risk and tip messages by flag bit; bits 0-3 come from the variety, the rest from satellite readings
+_RISK_MESSAGES = (
+    "High water requirement - drought risk",
+    "Limited market demand",
+    "High initial investment required",
+    "Long cultivation period - weather risk",
+    "[SATELLITE] Poor vegetation health detected",
+    "[SATELLITE] Very low soil moisture - drought risk",
+)
+_TIP_MESSAGES = (
+    "Implement drip irrigation for water efficiency",
+    "Regular monitoring for disease prevention",
+    "[SATELLITE] High soil moisture - ensure good drainage",
+    "[SATELLITE] Low soil moisture - increase irrigation frequency",
+    "[SATELLITE] Good field conditions for optimal planting",
+)
+# Satellite advice by flag bit: low NDVI, low soil moisture, high NDVI
+_SATELLITE_ADVICE_MESSAGES = (
+    "[SATELLITE] Satellite data shows low vegetation health - consider soil improvement",
+    "[SATELLITE] Low soil moisture detected - irrigation planning recommended",
+    "[SATELLITE] Excellent vegetation conditions detected - optimal for planting",
+)
+
+
+def _message_table(messages: Tuple[str, ...]) -> Tuple[Tuple[str, ...], ...]:
+    # Every flag combination mapped to its messages, in bit order
+    return tuple(
+        tuple(message for bit, message in enumerate(messages) if flags >> bit & 1)
+        for flags in range(1 << len(messages))
+    )
+
+
+_RISK_TABLE = _message_table(_RISK_MESSAGES)
+_TIP_TABLE = _message_table(_TIP_MESSAGES)
+_SATELLITE_ADVICE_TABLE = _message_table(_SATELLITE_ADVICE_MESSAGES)
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+def _dumps(obj: Any) -> bytes:
+    # Enums, dataclasses, datetimes and NumPy values in satellite readings serialize natively
+    return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _band(value: float, thresholds) -> Tuple[int, int]:
+    # Left and right insertion points pin down every <, <=, > and >= comparison against the thresholds
+    return bisect.bisect_left(thresholds, value), bisect.bisect_right(thresholds, value)
+
+
+def _score_rows(rows, water, tmin, tmax, market_score, market_high, resist_drought, resist_disease, soil_mask,
+               soil_column, region, climate_match, irrigation,
+               has_satellite, ndvi_score, high_water_score, low_water_score, temperature, humidity_score):
+    """Suitability score per variety row; plain arrays and scalars only, so Numba can compile it"""
+    scores = np.empty(len(rows))
+    for i in range(len(rows)):
+        row = rows[i]
+        score = 0.5  # Base score
+        
+        # Soil suitability (20% weight - reduced to make room for satellite data); partial match otherwise
+        if soil_column >= 0:
+            if soil_column < soil_mask.shape[1] and soil_mask[row, soil_column]:
+                score += 0.20
+            else:
+                score += 0.08
+        
+        # Satellite data enhancement (20% weight, capped)
+        if has_satellite:
+            satellite = ndvi_score + (high_water_score if water[row] > 800 else low_water_score)
+            if tmin[row] <= temperature <= tmax[row]:  # Always False for a NaN temperature
+                satellite += 0.02
+            satellite += humidity_score
+            score += min(satellite, 0.20)
+        
+        # Regional (15% weight) and climate (15% weight) suitability
+        if region:
+            if region == 2 and market_high[row]:
+                score += 0.12
+            score += 0.03  # Base regional bonus
+            if climate_match[row]:
+                score += 0.12
+        
+        # Water availability (15% weight); low requirement counts as drought tolerant
+        if irrigation:
+            if water[row] > 800:
+                score += 0.12
+            elif water[row] <= 500:
+                score += 0.08
+        
+        # Market demand (8% weight) and resistance/tolerance (7% weight)
+        score += market_score[row]
+        if resist_drought[row]:
+            score += 0.035
+        if resist_disease[row]:
+            score += 0.035
+        
+        scores[i] = min(score, 1.0)  # Cap at 1.0
+    return scores
+
+
+def _score_kernel_numpy(rows, water, tmin, tmax, market_score, market_high, resist_drought, resist_disease, soil_mask,
+                        soil_column, region, climate_match, irrigation,
+                        has_satellite, ndvi_score, high_water_score, low_water_score, temperature, humidity_score):
+    """Same scores as _score_rows, one boolean-mask pass per term instead of a loop over the rows"""
+    water = water[rows]
+    scores = np.full(len(rows), 0.5)
+    
+    if soil_column >= 0:
+        if soil_column < soil_mask.shape[1]:
+            scores += np.where(soil_mask[rows, soil_column], 0.20, 0.08)
+        else:
+            scores += 0.08
+    
+    if has_satellite:
+        satellite = ndvi_score + np.where(water > 800, high_water_score, low_water_score)
+        satellite += np.where((tmin[rows] <= temperature) & (temperature <= tmax[rows]), 0.02, 0.0)
+        satellite += humidity_score
+        scores += np.minimum(satellite, 0.20)
+    
+    if region:
+        if region == 2:
+            scores += np.where(market_high[rows], 0.12, 0.0)
+        scores += 0.03
+        scores += np.where(climate_match[rows], 0.12, 0.0)
+    
+    if irrigation:
+        scores += np.where(water > 800, 0.12, np.where(water <= 500, 0.08, 0.0))
+    
+    scores += market_score[rows]
+    scores += np.where(resist_drought[rows], 0.035, 0.0)
+    scores += np.where(resist_disease[rows], 0.035, 0.0)
+    return np.minimum(scores, 1.0)
+
+
+if njit is not None:
+    # cache=True keeps the compiled kernel on disk, so only the first process pays the compile
+    _score_kernel = njit(cache=True)(_score_rows)
+else:
+    # Interpreted, the row loop costs a few microseconds per variety; masks keep it flat as the catalog grows
+    _score_kernel = _score_kernel_numpy
+
+
+@dataclass(frozen=True)
 class CropRecommendation:
-    """Individual crop recommendation with details"""
+    """Individual crop recommendation with details; frozen because cached rankings share instances"""
+    # Written out rather than dataclass(slots=True), which needs Python 3.10
+    __slots__ = (
+        "crop_type", "variety", "suitability_score", "expected_yield", "cultivation_period", "water_requirement",
+        "investment_cost", "market_demand", "risk_factors", "cultivation_tips", "reason",
+    )
+    
     crop_type: CropType
     variety: str
     suitability_score: float  # 0.0 to 1.0
@@ -35,11 +304,45 @@ class CropRecommendation:
     risk_factors: List[str]
     cultivation_tips: List[str]
     reason: str  # Why this crop is recommended
+    
+    def to_dict(self) -> Dict[str, Any]:
+        # Shallow except for the list fields, so a response can't reach into a cached recommendation
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["risk_factors"] = list(self.risk_factors)
+        data["cultivation_tips"] = list(self.cultivation_tips)
+        return data
+    
+    def __reduce__(self):
+        # Frozen slotted instances can't be unpickled attribute by attribute
+        return type(self), tuple(getattr(self, name) for name in self.__slots__)
+
+
+class SatelliteView(NamedTuple):
+    """The satellite readings the crop helpers use, read out of the raw dict once per query"""
+    ndvi: float
+    soil_moisture: float
+    weather: Dict[str, Any]
+    temperature: Optional[float]  # None without a weather reading
+    humidity: Optional[float]
+
+
+def _satellite_view(satellite_data: Optional[Dict]) -> Optional[SatelliteView]:
+    if not satellite_data:
+        return None
+    weather = satellite_data.get("weather", {})
+    temperature = humidity = None
+    if weather:
+        temperature, humidity = weather.get("temperature", 25), weather.get("humidity", 50)
+    return SatelliteView(
+        satellite_data.get("ndvi", 0.0), satellite_data.get("soil_moisture", 0.0), weather, temperature, humidity
+    )
 
 
 @dataclass
 class SeasonalCropData:
     """Seasonal crop cultivation data"""
+    __slots__ = ("season", "suitable_crops", "planting_window", "harvest_window", "weather_requirements")
+    
     season: SeasonType
     suitable_crops: List[CropType]
     planting_window: Tuple[int, int]  # month numbers (1-12)
@@ -47,6 +350,251 @@ class SeasonalCropData:
     weather_requirements: Dict[str, Any]
 
 
+# Knowledge base shared read-only by every agent instance; resistance traits are
+# frozensets because they are only ever tested for membership
+_CROP_DATABASE = MappingProxyType({
+    CropType.WHEAT: {
+        "varieties": {
+            "HD-2967": {
+                "yield_potential": 4500,  # kg/hectare
+                "duration": 145,  # days
+                "soil_preference": [SoilType.LOAMY, SoilType.LOAMY],
+                "water_requirement": 450,  # mm
+                "temperature_range": (15, 25),  # celsius
+                "rainfall_range": (300, 600),  # mm
+                "resistance": frozenset(["rust", "drought_tolerant"]),
+                "market_demand": "high",
+                "investment_cost": 25000
+            },
+            "PBW-343": {
+                "yield_potential": 4200,
+                "duration": 140,
+                "soil_preference": [SoilType.LOAMY, SoilType.SANDY],
+                "water_requirement": 420,
+                "temperature_range": (12, 22),
+                "rainfall_range": (250, 500),
+                "resistance": frozenset(["yellow_rust"]),
+                "market_demand": "high",
+                "investment_cost": 23000
+            },
+            "DBW-88": {
+                "yield_potential": 4800,
+                "duration": 150,
+                "soil_preference": [SoilType.LOAMY, SoilType.CLAY],
+                "water_requirement": 480,
+                "temperature_range": (14, 24),
+                "rainfall_range": (350, 650),
+                "resistance": frozenset(["brown_rust", "high_fertility_responsive"]),
+                "market_demand": "high",
+                "investment_cost": 27000
+            }
+        },
+        "seasons": [SeasonType.RABI],
+        "planting_months": [10, 11, 12],
+        "harvest_months": [3, 4, 5]
+    },
+    
+    CropType.RICE: {
+        "varieties": {
+            "Basmati-370": {
+                "yield_potential": 3500,
+                "duration": 140,
+                "soil_preference": [SoilType.LOAMY, SoilType.CLAY],
+                "water_requirement": 1200,
+                "temperature_range": (20, 30),
+                "rainfall_range": (800, 1500),
+                "resistance": frozenset(["blast_resistant"]),
+                "market_demand": "very_high",
+                "investment_cost": 35000
+            },
+            "PR-126": {
+                "yield_potential": 6000,
+                "duration": 145,
+                "soil_preference": [SoilType.LOAMY, SoilType.LOAMY],
+                "water_requirement": 1350,
+                "temperature_range": (22, 32),
+                "rainfall_range": (900, 1600),
+                "resistance": frozenset(["bacterial_blight", "high_yielding"]),
+                "market_demand": "high",
+                "investment_cost": 40000
+            },
+            "Pusa-44": {
+                "yield_potential": 5500,
+                "duration": 160,
+                "soil_preference": [SoilType.CLAY, SoilType.LOAMY],
+                "water_requirement": 1400,
+                "temperature_range": (25, 35),
+                "rainfall_range": (1000, 1800),
+                "resistance": frozenset(["stem_borer", "leaf_folder"]),
+                "market_demand": "medium",
+                "investment_cost": 38000
+            }
+        },
+        "seasons": [SeasonType.KHARIF, SeasonType.RABI],
+        "planting_months": [5, 6, 7, 11, 12],
+        "harvest_months": [9, 10, 11, 3, 4]
+    },
+    
+    CropType.COTTON: {
+        "varieties": {
+            "Bt-Cotton-RCH-659": {
+                "yield_potential": 2800,
+                "duration": 180,
+                "soil_preference": [SoilType.SANDY, SoilType.LOAMY],
+                "water_requirement": 700,
+                "temperature_range": (25, 35),
+                "rainfall_range": (500, 1000),
+                "resistance": frozenset(["bollworm_resistant", "drought_tolerant"]),
+                "market_demand": "high",
+                "investment_cost": 45000
+            },
+            "Hybrid-6": {
+                "yield_potential": 3200,
+                "duration": 190,
+                "soil_preference": [SoilType.LOAMY, SoilType.LOAMY],
+                "water_requirement": 750,
+                "temperature_range": (22, 32),
+                "rainfall_range": (600, 1200),
+                "resistance": frozenset(["pink_bollworm", "high_fiber_quality"]),
+                "market_demand": "very_high",
+                "investment_cost": 50000
+            }
+        },
+        "seasons": [SeasonType.KHARIF],
+        "planting_months": [4, 5, 6],
+        "harvest_months": [10, 11, 12]
+    },
+    
+    CropType.SUGARCANE: {
+        "varieties": {
+            "Co-86032": {
+                "yield_potential": 85000,  # kg/hectare
+                "duration": 365,  # days
+                "soil_preference": [SoilType.LOAMY, SoilType.LOAMY],
+                "water_requirement": 1500,
+                "temperature_range": (20, 30),
+                "rainfall_range": (1000, 1500),
+                "resistance": frozenset(["red_rot", "smut"]),
+                "market_demand": "medium",
+                "investment_cost": 60000
+            },
+            "CoS-767": {
+                "yield_potential": 90000,
+                "duration": 360,
+                "soil_preference": [SoilType.LOAMY, SoilType.CLAY],
+                "water_requirement": 1600,
+                "temperature_range": (22, 32),
+                "rainfall_range": (1200, 1800),
+                "resistance": frozenset(["early_maturity", "high_sugar_content"]),
+                "market_demand": "high",
+                "investment_cost": 65000
+            }
+        },
+        "seasons": [SeasonType.KHARIF, SeasonType.RABI, SeasonType.ZAID],  # Year-round
+        "planting_months": [2, 3, 9, 10],
+        "harvest_months": [12, 1, 2, 3]
+    },
+    
+    CropType.MAIZE: {
+        "varieties": {
+            "PMH-1": {
+                "yield_potential": 8000,
+                "duration": 90,
+                "soil_preference": [SoilType.LOAMY, SoilType.SANDY],
+                "water_requirement": 400,
+                "temperature_range": (18, 28),
+                "rainfall_range": (300, 700),
+                "resistance": frozenset(["early_maturity", "drought_tolerant"]),
+                "market_demand": "high",
+                "investment_cost": 20000
+            },
+            "HQPM-1": {
+                "yield_potential": 7500,
+                "duration": 95,
+                "soil_preference": [SoilType.LOAMY, SoilType.LOAMY],
+                "water_requirement": 450,
+                "temperature_range": (20, 30),
+                "rainfall_range": (400, 800),
+                "resistance": frozenset(["quality_protein", "stem_borer_tolerant"]),
+                "market_demand": "medium",
+                "investment_cost": 22000
+            }
+        },
+        "seasons": [SeasonType.KHARIF, SeasonType.RABI],
+        "planting_months": [6, 7, 11, 12],
+        "harvest_months": [9, 10, 2, 3]
+    }
+})
+
+_REGIONAL_DATA = MappingProxyType({
+    "Punjab": {
+        "major_crops": [CropType.WHEAT, CropType.RICE, CropType.MAIZE],
+        "soil_types": [SoilType.LOAMY, SoilType.LOAMY],
+        "climate": "subtropical",
+        "rainfall_average": 650,  # mm
+        "temperature_range": (5, 45),
+        "irrigation_availability": "high",
+        "market_access": "excellent"
+    },
+    "Rajasthan": {
+        "major_crops": [CropType.WHEAT, CropType.MUSTARD, CropType.COTTON],
+        "soil_types": [SoilType.SANDY, SoilType.SANDY],
+        "climate": "arid",
+        "rainfall_average": 300,
+        "temperature_range": (0, 50),
+        "irrigation_availability": "limited",
+        "market_access": "good"
+    },
+    "Maharashtra": {
+        "major_crops": [CropType.COTTON, CropType.SUGARCANE, CropType.RICE],
+        "soil_types": [SoilType.CLAY, SoilType.LOAMY, SoilType.SANDY],
+        "climate": "tropical",
+        "rainfall_average": 1200,
+        "temperature_range": (10, 42),
+        "irrigation_availability": "medium",
+        "market_access": "excellent"
+    },
+    "Uttar Pradesh": {
+        "major_crops": [CropType.WHEAT, CropType.RICE, CropType.SUGARCANE],
+        "soil_types": [SoilType.LOAMY, SoilType.LOAMY],
+        "climate": "subtropical",
+        "rainfall_average": 800,
+        "temperature_range": (2, 46),
+        "irrigation_availability": "good",
+        "market_access": "good"
+    }
+})
+
+
+def _compile_context_regex(regional_data) -> Tuple["re.Pattern[str]", Dict[str, Tuple[str, int, Any]]]:
+    """Build the word-boundary keyword alternation used by _extract_context_from_query"""
+    tables = [
+        ("season", [(SeasonType.RABI, _SEASON_KEYWORDS[SeasonType.RABI]),
+                    (SeasonType.KHARIF, _SEASON_KEYWORDS[SeasonType.KHARIF]),
+                    (SeasonType.ZAID, _SEASON_KEYWORDS[SeasonType.ZAID])]),
+        ("location", [(state, (state.lower(),)) for state in regional_data]),
+        ("specific_crop", [
+            (crop_type, (crop_type.value, crop_type.name.lower()) + _HINDI_CROP_NAMES.get(crop_type, ()))
+            for crop_type in CropType
+        ]),
+        ("soil_type", [(soil_type, (keyword,)) for keyword, soil_type in _SOIL_KEYWORDS.items()]),
+    ]
+    
+    # Lowercase keyword -> (context field, rank within the field, value)
+    keywords: Dict[str, Tuple[str, int, Any]] = {}
+    for field, entries in tables:
+        for rank, (value, words) in enumerate(entries):
+            for word in words:
+                keywords.setdefault(word, (field, rank, value))
+    
+    # A plain alternation of literals, longest first, runs far faster than one named group per value
+    alternation = "|".join(map(re.escape, sorted(keywords, key=len, reverse=True)))
+    return re.compile(rf"\b(?:{alternation})\b"), keywords
+
+
+_CONTEXT_REGEX, _CONTEXT_KEYWORDS = _compile_context_regex(_REGIONAL_DATA)
+
+
 class CropSelectionAgent(BaseWorkerAgent):
     """
     Agent specialized in crop selection and yield prediction.
@@ -78,8 +626,18 @@ class CropSelectionAgent(BaseWorkerAgent):
         # Load crop knowledge base
         self._load_crop_database()
         self._load_regional_data()
+        self._recommendation_cache: OrderedDict = OrderedDict()
+        self._recommendation_cache_lock = threading.Lock()
+        if njit is not None:
+            # Loading the compiled kernel takes a few hundred ms; pay it here rather than on the first query
+            self._score_varieties(_NO_ROWS, {"soil_type": None, "location": None, "irrigation_available": None})
         logger.info(f"Initialized {self.name} with {len(self.crop_database)} crop varieties")
     
+    @staticmethod
+    def response_bytes(response: AgentResponse) -> bytes:
+        # Serialize a crop response, including its satellite metadata, for callers that forward it as JSON
+        return _dumps(response.model_dump())
+    
     def execute(self, task, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a task - required by BaseWorkerAgent"""
         try:
@@ -87,229 +645,90 @@ class CropSelectionAgent(BaseWorkerAgent):
             if hasattr(task, 'query') and task.query:
                 query = task.query
                 if isinstance(query, AgricultureQuery):
-                    result = asyncio.run(self.process_query(query))
-                    return {"status": "success", "result": result}
+                    future = asyncio.run_coroutine_threadsafe(self.process_query(query), _get_background_loop())
+                    return {"status": "success", "result": future.result()}
             
             return {"status": "error", "message": "Invalid task format"}
         except Exception as e:
             return {"status": "error", "message": str(e)}
     
+    async def execute_async(self, task, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of execute: awaits the query on the caller's loop instead of blocking it"""
+        query = getattr(task, "query", None)
+        if not isinstance(query, AgricultureQuery):
+            return {"status": "error", "message": "Invalid task format"}
+        
+        try:
+            return {"status": "success", "result": await self.process_query(query)}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+    
     def _load_crop_database(self):
         """Load comprehensive crop database with varieties and requirements"""
-        self.crop_database = {
-            CropType.WHEAT: {
-                "varieties": {
-                    "HD-2967": {
-                        "yield_potential": 4500,  # kg/hectare
-                        "duration": 145,  # days
-                        "soil_preference": [SoilType.LOAMY, SoilType.LOAMY],
-                        "water_requirement": 450,  # mm
-                        "temperature_range": (15, 25),  # celsius
-                        "rainfall_range": (300, 600),  # mm
-                        "resistance": ["rust", "drought_tolerant"],
-                        "market_demand": "high",
-                        "investment_cost": 25000
-                    },
-                    "PBW-343": {
-                        "yield_potential": 4200,
-                        "duration": 140,
-                        "soil_preference": [SoilType.LOAMY, SoilType.SANDY],
-                        "water_requirement": 420,
-                        "temperature_range": (12, 22),
-                        "rainfall_range": (250, 500),
-                        "resistance": ["yellow_rust"],
-                        "market_demand": "high",
-                        "investment_cost": 23000
-                    },
-                    "DBW-88": {
-                        "yield_potential": 4800,
-                        "duration": 150,
-                        "soil_preference": [SoilType.LOAMY, SoilType.CLAY],
-                        "water_requirement": 480,
-                        "temperature_range": (14, 24),
-                        "rainfall_range": (350, 650),
-                        "resistance": ["brown_rust", "high_fertility_responsive"],
-                        "market_demand": "high",
-                        "investment_cost": 27000
-                    }
-                },
-                "seasons": [SeasonType.RABI],
-                "planting_months": [10, 11, 12],
-                "harvest_months": [3, 4, 5]
-            },
-            
-            CropType.RICE: {
-                "varieties": {
-                    "Basmati-370": {
-                        "yield_potential": 3500,
-                        "duration": 140,
-                        "soil_preference": [SoilType.LOAMY, SoilType.CLAY],
-                        "water_requirement": 1200,
-                        "temperature_range": (20, 30),
-                        "rainfall_range": (800, 1500),
-                        "resistance": ["blast_resistant"],
-                        "market_demand": "very_high",
-                        "investment_cost": 35000
-                    },
-                    "PR-126": {
-                        "yield_potential": 6000,
-                        "duration": 145,
-                        "soil_preference": [SoilType.LOAMY, SoilType.LOAMY],
-                        "water_requirement": 1350,
-                        "temperature_range": (22, 32),
-                        "rainfall_range": (900, 1600),
-                        "resistance": ["bacterial_blight", "high_yielding"],
-                        "market_demand": "high",
-                        "investment_cost": 40000
-                    },
-                    "Pusa-44": {
-                        "yield_potential": 5500,
-                        "duration": 160,
-                        "soil_preference": [SoilType.CLAY, SoilType.LOAMY],
-                        "water_requirement": 1400,
-                        "temperature_range": (25, 35),
-                        "rainfall_range": (1000, 1800),
-                        "resistance": ["stem_borer", "leaf_folder"],
-                        "market_demand": "medium",
-                        "investment_cost": 38000
-                    }
-                },
-                "seasons": [SeasonType.KHARIF, SeasonType.RABI],
-                "planting_months": [5, 6, 7, 11, 12],
-                "harvest_months": [9, 10, 11, 3, 4]
-            },
-            
-            CropType.COTTON: {
-                "varieties": {
-                    "Bt-Cotton-RCH-659": {
-                        "yield_potential": 2800,
-                        "duration": 180,
-                        "soil_preference": [SoilType.SANDY, SoilType.LOAMY],
-                        "water_requirement": 700,
-                        "temperature_range": (25, 35),
-                        "rainfall_range": (500, 1000),
-                        "resistance": ["bollworm_resistant", "drought_tolerant"],
-                        "market_demand": "high",
-                        "investment_cost": 45000
-                    },
-                    "Hybrid-6": {
-                        "yield_potential": 3200,
-                        "duration": 190,
-                        "soil_preference": [SoilType.LOAMY, SoilType.LOAMY],
-                        "water_requirement": 750,
-                        "temperature_range": (22, 32),
-                        "rainfall_range": (600, 1200),
-                        "resistance": ["pink_bollworm", "high_fiber_quality"],
-                        "market_demand": "very_high",
-                        "investment_cost": 50000
-                    }
-                },
-                "seasons": [SeasonType.KHARIF],
-                "planting_months": [4, 5, 6],
-                "harvest_months": [10, 11, 12]
-            },
-            
-            CropType.SUGARCANE: {
-                "varieties": {
-                    "Co-86032": {
-                        "yield_potential": 85000,  # kg/hectare
-                        "duration": 365,  # days
-                        "soil_preference": [SoilType.LOAMY, SoilType.LOAMY],
-                        "water_requirement": 1500,
-                        "temperature_range": (20, 30),
-                        "rainfall_range": (1000, 1500),
-                        "resistance": ["red_rot", "smut"],
-                        "market_demand": "medium",
-                        "investment_cost": 60000
-                    },
-                    "CoS-767": {
-                        "yield_potential": 90000,
-                        "duration": 360,
-                        "soil_preference": [SoilType.LOAMY, SoilType.CLAY],
-                        "water_requirement": 1600,
-                        "temperature_range": (22, 32),
-                        "rainfall_range": (1200, 1800),
-                        "resistance": ["early_maturity", "high_sugar_content"],
-                        "market_demand": "high",
-                        "investment_cost": 65000
-                    }
-                },
-                "seasons": [SeasonType.KHARIF, SeasonType.RABI, SeasonType.ZAID],  # Year-round
-                "planting_months": [2, 3, 9, 10],
-                "harvest_months": [12, 1, 2, 3]
-            },
-            
-            CropType.MAIZE: {
-                "varieties": {
-                    "PMH-1": {
-                        "yield_potential": 8000,
-                        "duration": 90,
-                        "soil_preference": [SoilType.LOAMY, SoilType.SANDY],
-                        "water_requirement": 400,
-                        "temperature_range": (18, 28),
-                        "rainfall_range": (300, 700),
-                        "resistance": ["early_maturity", "drought_tolerant"],
-                        "market_demand": "high",
-                        "investment_cost": 20000
-                    },
-                    "HQPM-1": {
-                        "yield_potential": 7500,
-                        "duration": 95,
-                        "soil_preference": [SoilType.LOAMY, SoilType.LOAMY],
-                        "water_requirement": 450,
-                        "temperature_range": (20, 30),
-                        "rainfall_range": (400, 800),
-                        "resistance": ["quality_protein", "stem_borer_tolerant"],
-                        "market_demand": "medium",
-                        "investment_cost": 22000
-                    }
-                },
-                "seasons": [SeasonType.KHARIF, SeasonType.RABI],
-                "planting_months": [6, 7, 11, 12],
-                "harvest_months": [9, 10, 2, 3]
-            }
+        self.crop_database = _CROP_DATABASE
+        self._build_variety_arrays()
+    
+    def _build_variety_arrays(self):
+        """Flatten the crop database into per-variety columns for vectorized scoring"""
+        self._var_index: List[Tuple[CropType, str]] = []
+        crop_rows: Dict[CropType, List[int]] = {}
+        varieties = []
+        for crop_type, crop_data in self.crop_database.items():
+            for variety_name, variety_data in crop_data["varieties"].items():
+                crop_rows.setdefault(crop_type, []).append(len(self._var_index))
+                self._var_index.append((crop_type, variety_name))
+                varieties.append(variety_data)
+        
+        self._var_rows_by_crop = {crop: np.array(rows, dtype=np.intp) for crop, rows in crop_rows.items()}
+        
+        # Rows of every crop grown in each season, in database order
+        self._crops_by_season: Dict[SeasonType, List[CropType]] = {}
+        for crop_type, crop_data in self.crop_database.items():
+            for season in crop_data["seasons"]:
+                self._crops_by_season.setdefault(season, []).append(crop_type)
+        self._var_rows_by_season = {
+            season: np.concatenate([self._var_rows_by_crop[crop_type] for crop_type in crop_types])
+            for season, crop_types in self._crops_by_season.items()
         }
+        self._soil_columns = {soil: i for i, soil in enumerate(SoilType)}
+        
+        # Scores are accumulated in float64 so they match the scalar arithmetic bit for bit
+        self._var_water = np.array([v["water_requirement"] for v in varieties], dtype=np.float64)
+        self._var_tmin = np.array([v["temperature_range"][0] for v in varieties], dtype=np.float64)
+        self._var_tmax = np.array([v["temperature_range"][1] for v in varieties], dtype=np.float64)
+        self._var_market_score = np.array([_MARKET_SCORES.get(v["market_demand"], 0.02) for v in varieties])
+        self._var_market_high = np.array([v.get("market_demand") == "high" for v in varieties])
+        self._var_resist_drought = np.array(["drought_tolerant" in v["resistance"] for v in varieties])
+        self._var_resist_disease = np.array(["disease_resistant" in v["resistance"] for v in varieties])
+        self._var_soil_mask = np.zeros((len(varieties), len(self._soil_columns)), dtype=bool)
+        for row, variety_data in enumerate(varieties):
+            for soil in variety_data["soil_preference"]:
+                self._var_soil_mask[row, self._soil_columns[soil]] = True
+        
+        # Static risk and tip bits per variety, indexing _RISK_TABLE / _TIP_TABLE
+        self._var_risk_flags = [
+            (v["water_requirement"] > 1000) | (v["market_demand"] == "low") << 1
+            | (v["investment_cost"] > 40000) << 2 | (v["duration"] > 150) << 3
+            for v in varieties
+        ]
+        self._var_tip_flags = [
+            (v["water_requirement"] > 800) | (not self._var_resist_disease[row]) << 1
+            for row, v in enumerate(varieties)
+        ]
+        self._temperature_bounds = np.unique(np.concatenate([self._var_tmin, self._var_tmax])).tolist()
     
     def _load_regional_data(self):
         """Load regional crop suitability and climate data"""
-        self.regional_data = {
-            "Punjab": {
-                "major_crops": [CropType.WHEAT, CropType.RICE, CropType.MAIZE],
-                "soil_types": [SoilType.LOAMY, SoilType.LOAMY],
-                "climate": "subtropical",
-                "rainfall_average": 650,  # mm
-                "temperature_range": (5, 45),
-                "irrigation_availability": "high",
-                "market_access": "excellent"
-            },
-            "Rajasthan": {
-                "major_crops": [CropType.WHEAT, CropType.MUSTARD, CropType.COTTON],
-                "soil_types": [SoilType.SANDY, SoilType.SANDY],
-                "climate": "arid",
-                "rainfall_average": 300,
-                "temperature_range": (0, 50),
-                "irrigation_availability": "limited",
-                "market_access": "good"
-            },
-            "Maharashtra": {
-                "major_crops": [CropType.COTTON, CropType.SUGARCANE, CropType.RICE],
-                "soil_types": [SoilType.CLAY, SoilType.LOAMY, SoilType.SANDY],
-                "climate": "tropical",
-                "rainfall_average": 1200,
-                "temperature_range": (10, 42),
-                "irrigation_availability": "medium",
-                "market_access": "excellent"
-            },
-            "Uttar Pradesh": {
-                "major_crops": [CropType.WHEAT, CropType.RICE, CropType.SUGARCANE],
-                "soil_types": [SoilType.LOAMY, SoilType.LOAMY],
-                "climate": "subtropical",
-                "rainfall_average": 800,
-                "temperature_range": (2, 46),
-                "irrigation_availability": "good",
-                "market_access": "good"
-            }
-        }
+        self.regional_data = _REGIONAL_DATA
+        
+        # Per-region market code and per-variety climate match, so scoring a region is one lookup;
+        # runs after _load_crop_database, which builds the variety columns
+        self._no_region = (0, np.zeros(len(self._var_index), dtype=bool))
+        self._region_scoring = {}
+        for state, region_data in self.regional_data.items():
+            region_tmin, region_tmax = region_data["temperature_range"]
+            climate_match = (self._var_tmin <= region_tmax) & (self._var_tmax >= region_tmin)
+            self._region_scoring[state] = (2 if state in _HIGH_DEMAND_REGIONS else 1, climate_match)
     
     async def process_query(self, query: AgricultureQuery) -> AgentResponse:
         """
@@ -328,68 +747,126 @@ class CropSelectionAgent(BaseWorkerAgent):
             context = self._extract_context_from_query(query)
             
             # Get satellite data if location is available
-            satellite_data = None
-            if context.get("location") and hasattr(context["location"], "latitude") and hasattr(context["location"], "longitude"):
-                try:
-                    logger.info(f"[SATELLITE] Fetching satellite data for location: {context['location'].latitude}, {context['location'].longitude}")
-                    satellite_data = await get_satellite_data_for_location(
-                        context["location"].latitude,
-                        context["location"].longitude,
-                        getattr(context["location"], "name", None)
-                    )
-                    logger.info(f"[SATELLITE] Satellite data retrieved successfully")
-                except Exception as e:
-                    logger.warning(f"[SATELLITE] Could not fetch satellite data: {e}")
-                    satellite_data = None
-            
-            # Enhance context with satellite data
-            if satellite_data:
-                context = self._enhance_context_with_satellite_data(context, satellite_data)
+            satellite_data = await self._fetch_satellite_data(context)
             
-            # Generate crop recommendations with satellite insights
-            recommendations = await self._generate_crop_recommendations(context, satellite_data)
+            return await self._build_response(query, context, satellite_data)
             
-            # Calculate confidence based on available data (including satellite)
-            confidence = self._calculate_confidence(context, recommendations, satellite_data)
-            
-            # Format response with satellite insights
-            response_data = {
-                "recommendations": [rec.__dict__ for rec in recommendations],
-                "context_analysis": context,
-                "satellite_insights": satellite_data,
-                "confidence_score": confidence,
-                "additional_advice": self._generate_additional_advice(context, recommendations, satellite_data)
-            }
+        except Exception as e:
+            return self._error_response(query, e)
+    
+    async def process_queries(self, queries: List[AgricultureQuery]) -> List[AgentResponse]:
+        """
+        Process several crop selection queries, fetching their satellite data concurrently.
+        
+        Args:
+            queries: Agriculture query objects
             
-            # Include satellite summary in sources
-            sources = ["crop_database", "regional_data", "agricultural_research"]
-            if satellite_data:
-                sources.append("satellite_data")
+        Returns:
+            One AgentResponse per query, in the same order
+        """
+        contexts = []
+        for query in queries:
+            try:
+                contexts.append(self._extract_context_from_query(query))
+            except Exception as e:
+                contexts.append(e)
+        
+        # All network round-trips overlap; the recommendation logic below is local
+        satellite_results = await asyncio.gather(
+            *(self._fetch_satellite_data(context) for context in contexts if not isinstance(context, Exception)),
+            return_exceptions=True
+        )
+        satellite_iter = iter(satellite_results)
+        current_month = datetime.now().month
+        
+        responses = []
+        for query, context in zip(queries, contexts):
+            if isinstance(context, Exception):
+                responses.append(self._error_response(query, context))
+                continue
             
-            return AgentResponse(
-                agent_id=self.agent_id,
-                agent_name=self.name,
-                query_id=query.query_id,
-                response_text=f"Crop recommendations for {context.get('location', 'your area')}",
-                confidence_score=confidence,
-                reasoning=f"Analysis based on {len(sources)} data sources including satellite data",
-                sources=sources,
-                recommendations=[rec.__dict__ for rec in recommendations],
-                metadata=response_data,
-                processing_time_ms=int(0.0 * 1000)  # Will be calculated by caller
+            satellite_data = next(satellite_iter)
+            try:
+                if isinstance(satellite_data, Exception):
+                    raise satellite_data
+                responses.append(await self._build_response(query, context, satellite_data, current_month))
+            except Exception as e:
+                responses.append(self._error_response(query, e))
+        
+        return responses
+    
+    async def _fetch_satellite_data(self, context: Dict[str, Any]) -> Optional[Dict]:
+        """Fetch satellite data for the context's location, or None when unavailable"""
+        location = context.get("location")
+        if not (location and hasattr(location, "latitude") and hasattr(location, "longitude")):
+            return None
+        
+        try:
+            logger.info(f"[SATELLITE] Fetching satellite data for location: {location.latitude}, {location.longitude}")
+            satellite_data = await _cached_satellite_data(
+                location.latitude,
+                location.longitude,
+                getattr(location, "name", None)
             )
-            
+            logger.info(f"[SATELLITE] Satellite data retrieved successfully")
+            return satellite_data
         except Exception as e:
-            logger.error(f"Error processing crop selection query: {e}")
-            return AgentResponse(
-                agent_id=self.agent_id,
-                agent_name=self.name,
-                query_id=query.query_id,
-                response_text=f"Error processing query: {str(e)}",
-                confidence_score=0.0,
-                sources=[],
-                recommendations=[]
-            )
+            logger.warning(f"[SATELLITE] Could not fetch satellite data: {e}")
+            return None
+    
+    async def _build_response(self, query: AgricultureQuery, context: Dict[str, Any],
+                              satellite_data: Optional[Dict], current_month: Optional[int] = None) -> AgentResponse:
+        """Turn an extracted context and its satellite data into crop recommendations"""
+        # Enhance context with satellite data; the helpers below all read from one view of it
+        sat = _satellite_view(satellite_data)
+        if sat:
+            context = self._enhance_context_with_satellite_data(context, sat)
+        
+        # Generate crop recommendations with satellite insights
+        recommendations = await self._generate_crop_recommendations(context, sat, current_month)
+        
+        # Calculate confidence based on available data (including satellite)
+        confidence = self._calculate_confidence(context, recommendations, sat)
+        
+        # Format response with satellite insights; the metadata and the response share one serialization
+        rec_dicts = [rec.to_dict() for rec in recommendations]
+        response_data = {
+            "recommendations": rec_dicts,
+            "context_analysis": context,
+            "satellite_insights": satellite_data,
+            "confidence_score": confidence,
+            "additional_advice": self._generate_additional_advice(context, recommendations, sat)
+        }
+        
+        # Include satellite summary in sources
+        sources = ["crop_database", "regional_data", "agricultural_research"]
+        if satellite_data:
+            sources.append("satellite_data")
+        
+        return AgentResponse(
+            agent_id=self.agent_id,
+            agent_name=self.name,
+            query_id=query.query_id,
+            response_text=f"Crop recommendations for {context.get('location', 'your area')}",
+            confidence_score=confidence,
+            reasoning=f"Analysis based on {len(sources)} data sources including satellite data",
+            sources=sources,
+            recommendations=rec_dicts,
+            metadata=response_data,
+            processing_time_ms=int(0.0 * 1000)  # Will be calculated by caller
+        )
+    
+    def _error_response(self, query: AgricultureQuery, error: Exception) -> AgentResponse:
+        logger.error(f"Error processing crop selection query: {error}")
+        return AgentResponse(
+            agent_id=self.agent_id,
+            agent_name=self.name,
+            query_id=query.query_id,
+            response_text=f"Error processing query: {str(error)}",
+            confidence_score=0.0,
+            sources=[],
+            recommendations=[]
+        )
     
     def _extract_context_from_query(self, query: AgricultureQuery) -> Dict[str, Any]:
         """Extract relevant context from the query"""
@@ -412,252 +889,129 @@ class CropSelectionAgent(BaseWorkerAgent):
             context["farm_size"] = query.farm_profile.farm_size
             context["irrigation_available"] = query.farm_profile.irrigation_available
         
-        # Extract from query text using keyword matching
-        query_text = query.query_text.lower()
-        
-        # Season detection
-        if any(word in query_text for word in ["rabi", "winter", "december", "january", "february"]):
-            context["season"] = SeasonType.RABI
-        elif any(word in query_text for word in ["kharif", "monsoon", "june", "july", "august"]):
-            context["season"] = SeasonType.KHARIF
-        elif any(word in query_text for word in ["zaid", "summer", "march", "april", "may"]):
-            context["season"] = SeasonType.ZAID
-        
-        # Location detection
-        for state in self.regional_data.keys():
-            if state.lower() in query_text:
-                context["location"] = state
-                break
-        
-        # Crop type detection
-        for crop_type in CropType:
-            crop_names = [crop_type.value, crop_type.name.lower()]
-            # Add common Hindi names
-            hindi_names = {
-                CropType.WHEAT: ["gehu", "gehun"],
-                CropType.RICE: ["chawal", "dhan"],
-                CropType.COTTON: ["kapas"],
-                CropType.SUGARCANE: ["ganna"],
-                CropType.MAIZE: ["makka"]
-            }
-            if crop_type in hindi_names:
-                crop_names.extend(hindi_names[crop_type])
-            
-            if any(name in query_text for name in crop_names):
-                context["specific_crop"] = crop_type
-                break
-        
-        # Soil type detection
-        soil_keywords = {
-            "sandy": SoilType.SANDY,
-            "clay": SoilType.CLAY, 
-            "loamy": SoilType.LOAMY,
-            "black": SoilType.CLAY,
-            "red": SoilType.SANDY
-        }
-        for keyword, soil_type in soil_keywords.items():
-            if keyword in query_text:
-                context["soil_type"] = soil_type
-                break
+        # Extract from query text with one pass of the keyword regex; within a
+        # category the earliest keyword group wins, as the old if/elif chain did
+        best: Dict[str, Tuple[int, Any]] = {}
+        for keyword in _CONTEXT_REGEX.findall(query.query_text.lower()):
+            field, rank, value = _CONTEXT_KEYWORDS[keyword]
+            if field not in best or rank < best[field][0]:
+                best[field] = (rank, value)
+        for field, (_, value) in best.items():
+            context[field] = value
         
         return context
     
-    async def _generate_crop_recommendations(self, context: Dict[str, Any], satellite_data: Optional[Dict] = None) -> List[CropRecommendation]:
+    async def _generate_crop_recommendations(self, context: Dict[str, Any], sat: Optional[SatelliteView] = None,
+                                             current_month: Optional[int] = None) -> List[CropRecommendation]:
         """Generate crop recommendations based on context and satellite data"""
-        recommendations = []
-        
-        # Determine current season if not specified
-        current_month = datetime.now().month
+        # Determine current season if not specified; batch callers pass the month in
         if not context["season"]:
+            if current_month is None:
+                current_month = datetime.now().month
             if current_month in [10, 11, 12, 1, 2, 3]:
                 context["season"] = SeasonType.RABI
             elif current_month in [4, 5, 6, 7, 8, 9]:
                 context["season"] = SeasonType.KHARIF
         
-        # If specific crop requested, focus on that
-        if context["specific_crop"]:
-            crop_recommendations = self._analyze_specific_crop(
-                context["specific_crop"], context, satellite_data
-            )
-            recommendations.extend(crop_recommendations)
-        else:
-            # General recommendations based on season and location
-            for crop_type, crop_data in self.crop_database.items():
-                if context["season"] in crop_data["seasons"]:
-                    crop_recommendations = self._analyze_specific_crop(crop_type, context, satellite_data)
-                    recommendations.extend(crop_recommendations)
-        
-        # Sort by suitability score (enhanced with satellite data)
-        recommendations.sort(key=lambda x: x.suitability_score, reverse=True)
-        
-        # Return top 5 recommendations
-        return recommendations[:5]
+        # Contexts with the same key score identically, so repeat queries skip the scoring
+        key = self._recommendation_key(context, sat)
+        with self._recommendation_cache_lock:
+            recommendations = self._recommendation_cache.get(key)
+            if recommendations is not None:
+                self._recommendation_cache.move_to_end(key)
+                return list(recommendations)
+        
+        recommendations = self._rank_varieties(context, sat)
+        with self._recommendation_cache_lock:
+            self._recommendation_cache[key] = recommendations
+            self._recommendation_cache.move_to_end(key)
+            if len(self._recommendation_cache) > RECOMMENDATION_CACHE_SIZE:
+                self._recommendation_cache.popitem(last=False)
+        return list(recommendations)
     
-    def _analyze_specific_crop(self, crop_type: CropType, context: Dict[str, Any], satellite_data: Optional[Dict] = None) -> List[CropRecommendation]:
-        """Analyze suitability of a specific crop type with satellite data"""
-        recommendations = []
-        
-        if crop_type not in self.crop_database:
-            return recommendations
-        
-        crop_data = self.crop_database[crop_type]
-        
-        for variety_name, variety_data in crop_data["varieties"].items():
-            suitability_score = self._calculate_suitability_score(
-                variety_data, context, satellite_data
-            )
-            
-            if suitability_score > 0.3:  # Only include reasonably suitable crops
-                recommendation = CropRecommendation(
-                    crop_type=crop_type,
-                    variety=variety_name,
-                    suitability_score=suitability_score,
-                    expected_yield=variety_data["yield_potential"] * suitability_score,
-                    cultivation_period=variety_data["duration"],
-                    water_requirement=variety_data["water_requirement"],
-                    investment_cost=variety_data["investment_cost"],
-                    market_demand=variety_data["market_demand"],
-                    risk_factors=self._identify_risk_factors(variety_data, context, satellite_data),
-                    cultivation_tips=self._generate_cultivation_tips(variety_data, context, satellite_data),
-                    reason=self._generate_recommendation_reason(variety_data, context, suitability_score, satellite_data)
-                )
-                recommendations.append(recommendation)
-        
-        return recommendations
-    
-    def _calculate_suitability_score(self, variety_data: Dict[str, Any], context: Dict[str, Any], satellite_data: Optional[Dict] = None) -> float:
-        """Calculate suitability score for a crop variety with satellite data enhancement"""
-        score = 0.5  # Base score
-        factors = []
-        
-        # Soil suitability (20% weight - reduced to make room for satellite data)
-        if context["soil_type"] and context["soil_type"] in variety_data["soil_preference"]:
-            score += 0.20
-            factors.append("soil_match")
-        elif context["soil_type"]:
-            score += 0.08  # Partial match
-        
-        # Satellite data enhancement (20% weight)
-        if satellite_data:
-            satellite_score = self._calculate_satellite_score(variety_data, satellite_data)
-            score += satellite_score
-            if satellite_score > 0.1:
-                factors.append("satellite_favorable")
-        
-        # Regional suitability (15% weight)
-        if context["location"] and context["location"] in self.regional_data:
-            regional_info = self.regional_data[context["location"]]
-            if variety_data.get("market_demand") == "high" and context["location"] in ["Punjab", "Maharashtra"]:
-                score += 0.12
-            score += 0.03  # Base regional bonus
-            factors.append("regional_suitable")
-        
-        # Climate suitability (15% weight)
-        if context["location"] and context["location"] in self.regional_data:
-            regional_info = self.regional_data[context["location"]]
-            temp_range = variety_data["temperature_range"]
-            regional_temp = regional_info["temperature_range"]
-            
-            # Check temperature compatibility
-            if (temp_range[0] <= regional_temp[1] and temp_range[1] >= regional_temp[0]):
-                score += 0.12
-                factors.append("climate_suitable")
-        
-        # Water availability (15% weight)
-        if context["irrigation_available"]:
-            if variety_data["water_requirement"] > 800 and context["irrigation_available"]:
-                score += 0.12
-            elif variety_data["water_requirement"] <= 500:  # Drought tolerant
-                score += 0.08
-            factors.append("water_suitable")
-        
-        # Market demand (8% weight)
-        market_scores = {"very_high": 0.08, "high": 0.06, "medium": 0.04, "low": 0.02}
-        score += market_scores.get(variety_data["market_demand"], 0.02)
-        
-        # Resistance/tolerance (7% weight)
-        if "drought_tolerant" in variety_data.get("resistance", []):
-            score += 0.035
-        if "disease_resistant" in str(variety_data.get("resistance", [])).lower():
-            score += 0.035
-        
-        return min(score, 1.0)  # Cap at 1.0
+    def _recommendation_key(self, context: Dict[str, Any], sat: Optional[SatelliteView]) -> tuple:
+        """Hashable key covering every context and satellite input the ranking depends on"""
+        location = context["location"]
+        if not (isinstance(location, str) and location in self.regional_data):
+            location = None
+        return (
+            context["season"],
+            context["specific_crop"],
+            context["soil_type"],
+            location,
+            bool(context["irrigation_available"]),
+            self._sat_bucket(sat),
+        )
     
-    def _identify_risk_factors(self, variety_data: Dict[str, Any], context: Dict[str, Any]) -> List[str]:
-        """Identify potential risk factors for the crop"""
-        risks = []
-        
-        # Weather risks
-        if variety_data["water_requirement"] > 1000:
-            risks.append("High water requirement - drought risk")
-        
-        # Market risks
-        if variety_data["market_demand"] == "low":
-            risks.append("Limited market demand")
-        
-        # Investment risks
-        if variety_data["investment_cost"] > 40000:
-            risks.append("High initial investment required")
-        
-        # Duration risks
-        if variety_data["duration"] > 150:
-            risks.append("Long cultivation period - weather risk")
-        
-        # Regional risks
-        if context["location"] == "Rajasthan" and variety_data["water_requirement"] > 600:
-            risks.append("Water scarcity in region")
-        
-        return risks
+    def _sat_bucket(self, sat: Optional[SatelliteView]) -> Optional[tuple]:
+        """Reduce satellite readings to the threshold bands the scoring compares them against"""
+        if not sat:
+            return None
+        
+        weather_bucket = None
+        if sat.weather:
+            weather_bucket = (_band(sat.temperature, self._temperature_bounds), 40 <= sat.humidity <= 80)
+        return _band(sat.ndvi, _NDVI_THRESHOLDS), _band(sat.soil_moisture, _MOISTURE_THRESHOLDS), weather_bucket
     
-    def _generate_cultivation_tips(self, variety_data: Dict[str, Any], context: Dict[str, Any]) -> List[str]:
-        """Generate cultivation tips based on variety and context"""
-        tips = []
-        
-        # Soil preparation
-        if context["soil_type"] == SoilType.SANDY:
-            tips.append("Add organic matter to improve soil water retention")
-        elif context["soil_type"] == SoilType.CLAY:
-            tips.append("Ensure proper drainage to prevent waterlogging")
+    def _rank_varieties(self, context: Dict[str, Any], sat: Optional[SatelliteView]) -> List[CropRecommendation]:
+        """Score the candidate varieties and build recommendations for the top 5"""
+        recommendations = []
         
-        # Irrigation
-        if variety_data["water_requirement"] > 800:
-            tips.append("Install drip irrigation system for water efficiency")
+        # Candidate rows: the requested crop, or every crop grown in this season
+        if context["specific_crop"]:
+            rows = self._var_rows_by_crop.get(context["specific_crop"], _NO_ROWS)
         else:
-            tips.append("Monitor soil moisture regularly")
-        
-        # Fertilization
-        tips.append(f"Apply balanced NPK fertilizer as per soil test recommendations")
-        
-        # Pest management
-        if "resistant" in str(variety_data.get("resistance", [])).lower():
-            tips.append("Use integrated pest management practices")
-        
-        # Timing
-        tips.append("Plant during optimal weather window for best results")
+            rows = self._var_rows_by_season.get(context["season"], _NO_ROWS)
+        
+        # Score every candidate in one pass and keep only reasonably suitable crops
+        scores = self._score_varieties(rows, context, sat).tolist()
+        suitable = [index for index, score in enumerate(scores) if score > 0.3]
+        
+        # Top 5 by suitability score (enhanced with satellite data); nlargest is stable, so ties keep database order
+        satellite_risks, satellite_tips = self._satellite_flags(sat)
+        soil_type = context["soil_type"]
+        soil_reason, satellite_reason = self._reason_clauses(soil_type, sat)
+        for index in heapq.nlargest(5, suitable, key=scores.__getitem__):
+            row = rows[index]
+            crop_type, variety_name = self._var_index[row]
+            variety_data = self.crop_database[crop_type]["varieties"][variety_name]
+            suitability_score = scores[index]
+            recommendations.append(CropRecommendation(
+                crop_type=crop_type,
+                variety=variety_name,
+                suitability_score=suitability_score,
+                expected_yield=variety_data["yield_potential"] * suitability_score,
+                cultivation_period=variety_data["duration"],
+                water_requirement=variety_data["water_requirement"],
+                investment_cost=variety_data["investment_cost"],
+                market_demand=variety_data["market_demand"],
+                risk_factors=self._identify_risk_factors(row, satellite_risks),
+                cultivation_tips=self._generate_cultivation_tips(row, satellite_tips),
+                reason=self._generate_recommendation_reason(
+                    suitability_score, soil_reason if soil_type in variety_data["soil_preference"] else "", satellite_reason
+                )
+            ))
         
-        return tips
+        return recommendations
     
-    def _generate_recommendation_reason(self, variety_data: Dict[str, Any], context: Dict[str, Any], score: float) -> str:
-        """Generate explanation for why this crop is recommended"""
-        reasons = []
-        
-        if score > 0.8:
-            reasons.append("Excellent match for your conditions")
-        elif score > 0.6:
-            reasons.append("Good suitability for your farm")
-        else:
-            reasons.append("Moderate suitability with proper management")
-        
-        if context["soil_type"] and context["soil_type"] in variety_data["soil_preference"]:
-            reasons.append(f"well-suited for {context['soil_type'].value} soil")
-        
-        if variety_data["market_demand"] in ["high", "very_high"]:
-            reasons.append("strong market demand")
-        
-        if "drought_tolerant" in variety_data.get("resistance", []):
-            reasons.append("drought tolerance")
-        
-        return ", ".join(reasons)
+    def _score_varieties(self, rows: np.ndarray, context: Dict[str, Any], sat: Optional[SatelliteView] = None) -> np.ndarray:
+        """Calculate suitability scores for the given variety rows with satellite data enhancement"""
+        # Soil: -1 when unknown, otherwise the soil mask column (len(columns) for soils it lacks)
+        soil_type = context["soil_type"]
+        soil_column = self._soil_columns.get(soil_type, len(self._soil_columns)) if soil_type else -1
+        
+        # Region: 0 unknown, 1 known, 2 known and a high-demand market
+        location = context["location"]
+        region, climate_match = self._no_region
+        if isinstance(location, str):
+            region, climate_match = self._region_scoring.get(location, self._no_region)
+        
+        return _score_kernel(
+            rows, self._var_water, self._var_tmin, self._var_tmax, self._var_market_score,
+            self._var_market_high, self._var_resist_drought, self._var_resist_disease, self._var_soil_mask,
+            soil_column, region, climate_match, bool(context["irrigation_available"]),
+            *self._satellite_params(sat)
+        )
     
     def get_capabilities(self) -> List[str]:
         """Return list of agent capabilities"""
@@ -681,67 +1035,51 @@ class CropSelectionAgent(BaseWorkerAgent):
             "Crop recommendations for organic farming"
         ]
 
-    def _enhance_context_with_satellite_data(self, context: Dict, satellite_data: Dict) -> Dict:
-        """Enhance context with satellite data insights"""
-        enhanced_context = context.copy()
-        
-        if satellite_data:
-            enhanced_context["satellite_insights"] = {
-                "vegetation_health": satellite_data.get("ndvi", 0.0),
-                "soil_moisture": satellite_data.get("soil_moisture", 0.0),
-                "weather_conditions": satellite_data.get("weather", {}),
-                "land_suitability": self._assess_land_suitability(satellite_data)
+    def _enhance_context_with_satellite_data(self, context: Dict, sat: Optional[SatelliteView]) -> Dict:
+        """Enhance context with satellite data insights; updates it in place, as each query builds its own"""
+        if sat:
+            context["satellite_insights"] = {
+                "vegetation_health": sat.ndvi,
+                "soil_moisture": sat.soil_moisture,
+                "weather_conditions": sat.weather,
+                "land_suitability": self._assess_land_suitability(sat)
             }
             
-        return enhanced_context
+        return context
     
-    def _calculate_satellite_score(self, variety_data: Dict, satellite_data: Dict) -> float:
-        """Calculate suitability score based on satellite data"""
-        score = 0.0
+    def _satellite_params(self, sat: Optional[SatelliteView]) -> Tuple[bool, float, float, float, float, float]:
+        """Reduce satellite data to the scalar inputs of _score_kernel"""
+        if not sat:
+            return False, 0.0, 0.0, 0.0, np.nan, 0.0
         
         # NDVI-based vegetation health assessment (0.10 max)
-        ndvi = satellite_data.get("ndvi", 0.0)
+        ndvi = sat.ndvi
         if ndvi > 0.7:  # Excellent vegetation health
-            score += 0.10
+            ndvi_score = 0.10
         elif ndvi > 0.5:  # Good vegetation health
-            score += 0.07
+            ndvi_score = 0.07
         elif ndvi > 0.3:  # Moderate vegetation health
-            score += 0.05
-        
-        # Soil moisture assessment (0.06 max)
-        soil_moisture = satellite_data.get("soil_moisture", 0.0)
-        water_req = variety_data.get("water_requirement", 500)
-        
-        if water_req > 800:  # High water requirement crops
-            if soil_moisture > 0.7:
-                score += 0.06
-            elif soil_moisture > 0.5:
-                score += 0.04
-        else:  # Low water requirement crops
-            if soil_moisture > 0.3:
-                score += 0.06
-            elif soil_moisture > 0.2:
-                score += 0.04
-        
-        # Weather pattern assessment (0.04 max)
-        weather = satellite_data.get("weather", {})
-        if weather:
-            temp = weather.get("temperature", 25)
-            humidity = weather.get("humidity", 50)
-            
-            temp_range = variety_data.get("temperature_range", [15, 35])
-            if temp_range[0] <= temp <= temp_range[1]:
-                score += 0.02
-            
-            if 40 <= humidity <= 80:  # Optimal humidity range
-                score += 0.02
+            ndvi_score = 0.05
+        else:
+            ndvi_score = 0.0
         
-        return min(score, 0.20)  # Cap at 20% of total score
+        # Soil moisture assessment (0.06 max), judged against each variety's water requirement
+        soil_moisture = sat.soil_moisture
+        high_water_score = 0.06 if soil_moisture > 0.7 else 0.04 if soil_moisture > 0.5 else 0.0
+        low_water_score = 0.06 if soil_moisture > 0.3 else 0.04 if soil_moisture > 0.2 else 0.0
+        
+        # Weather pattern assessment (0.04 max); NaN temperature means no weather reading
+        temperature, humidity_score = np.nan, 0.0
+        if sat.weather:
+            temperature = float(sat.temperature)
+            if 40 <= sat.humidity <= 80:  # Optimal humidity range
+                humidity_score = 0.02
+        
+        return True, ndvi_score, high_water_score, low_water_score, temperature, humidity_score
     
-    def _assess_land_suitability(self, satellite_data: Dict) -> str:
+    def _assess_land_suitability(self, sat: SatelliteView) -> str:
         """Assess overall land suitability based on satellite data"""
-        ndvi = satellite_data.get("ndvi", 0.0)
-        soil_moisture = satellite_data.get("soil_moisture", 0.0)
+        ndvi, soil_moisture = sat.ndvi, sat.soil_moisture
         
         if ndvi > 0.7 and soil_moisture > 0.6:
             return "Excellent"
@@ -752,7 +1090,7 @@ class CropSelectionAgent(BaseWorkerAgent):
         else:
             return "Poor"
     
-    def _calculate_confidence(self, context: Dict, recommendations: List, satellite_data: Optional[Dict] = None) -> float:
+    def _calculate_confidence(self, context: Dict, recommendations: List, sat: Optional[SatelliteView] = None) -> float:
         """Calculate confidence score including satellite data availability"""
         base_confidence = 0.6
         
@@ -765,17 +1103,17 @@ class CropSelectionAgent(BaseWorkerAgent):
             base_confidence += 0.1
         
         # Satellite data availability bonus
-        if satellite_data:
+        if sat:
             base_confidence += 0.1
         
         # Recommendation quality
-        if recommendations and len(recommendations) > 0:
-            avg_suitability = sum(rec.suitability_score for rec in recommendations) / len(recommendations)
+        if recommendations:
+            avg_suitability = sum(map(_suitability_score, recommendations)) / len(recommendations)
             base_confidence += avg_suitability * 0.1
         
         return min(base_confidence, 1.0)
     
-    def _generate_additional_advice(self, context: Dict, recommendations: List, satellite_data: Optional[Dict] = None) -> List[str]:
+    def _generate_additional_advice(self, context: Dict, recommendations: List, sat: Optional[SatelliteView] = None) -> List[str]:
         """Generate additional advice including satellite insights"""
         advice = []
         
@@ -786,103 +1124,58 @@ class CropSelectionAgent(BaseWorkerAgent):
             advice.append("Ensure proper drainage for clay soil")
         
         # Satellite-based advice
-        if satellite_data:
-            ndvi = satellite_data.get("ndvi", 0.0)
-            soil_moisture = satellite_data.get("soil_moisture", 0.0)
-            
-            if ndvi < 0.3:
-                advice.append("[SATELLITE] Satellite data shows low vegetation health - consider soil improvement")
-            if soil_moisture < 0.3:
-                advice.append("[SATELLITE] Low soil moisture detected - irrigation planning recommended")
-            if ndvi > 0.7:
-                advice.append("[SATELLITE] Excellent vegetation conditions detected - optimal for planting")
+        if sat:
+            ndvi = sat.ndvi
+            advice.extend(_SATELLITE_ADVICE_TABLE[(ndvi < 0.3) | (sat.soil_moisture < 0.3) << 1 | (ndvi > 0.7) << 2])
         
         return advice
     
-    def _format_recommendations_summary(self, recommendations: List, satellite_data: Optional[Dict] = None) -> List[str]:
+    def _format_recommendations_summary(self, recommendations: List, sat: Optional[SatelliteView] = None) -> List[str]:
         """Format recommendations summary including satellite insights"""
-        summary = []
-        
-        for rec in recommendations[:3]:  # Top 3 recommendations
-            rec_text = f"{rec.crop_type.value} ({rec.variety}) - Score: {rec.suitability_score:.2f}"
-            if satellite_data:
-                rec_text += " [SAT]"
-            summary.append(rec_text)
-        
-        return summary
+        suffix = " [SAT]" if sat else ""
+        return [  # Top 3 recommendations
+            f"{rec.crop_type.value} ({rec.variety}) - Score: {rec.suitability_score:.2f}{suffix}"
+            for rec in recommendations[:3]
+        ]
     
-    def _identify_risk_factors(self, variety_data: Dict[str, Any], context: Dict[str, Any], satellite_data: Optional[Dict] = None) -> List[str]:
+    def _identify_risk_factors(self, row: int, satellite_flags: int) -> List[str]:
         """Identify potential risk factors including satellite-based risks"""
-        risks = []
-        
-        # Traditional risks
-        if variety_data["water_requirement"] > 1000:
-            risks.append("High water requirement - drought risk")
-        if variety_data["market_demand"] == "low":
-            risks.append("Limited market demand")
-        if variety_data["investment_cost"] > 40000:
-            risks.append("High initial investment required")
-        if variety_data["duration"] > 150:
-            risks.append("Long cultivation period - weather risk")
-        
-        # Satellite-based risks
-        if satellite_data:
-            ndvi = satellite_data.get("ndvi", 0.0)
-            soil_moisture = satellite_data.get("soil_moisture", 0.0)
-            
-            if ndvi < 0.3:
-                risks.append("[SATELLITE] Poor vegetation health detected")
-            if soil_moisture < 0.2:
-                risks.append("[SATELLITE] Very low soil moisture - drought risk")
-        
-        return risks
+        return list(_RISK_TABLE[self._var_risk_flags[row] | satellite_flags])
     
-    def _generate_cultivation_tips(self, variety_data: Dict[str, Any], context: Dict[str, Any], satellite_data: Optional[Dict] = None) -> List[str]:
+    def _generate_cultivation_tips(self, row: int, satellite_flags: int) -> List[str]:
         """Generate cultivation tips including satellite-based insights"""
-        tips = []
-        
-        # Base tips
-        if variety_data["water_requirement"] > 800:
-            tips.append("Implement drip irrigation for water efficiency")
-        if "disease_resistant" not in str(variety_data.get("resistance", [])).lower():
-            tips.append("Regular monitoring for disease prevention")
-        
-        # Satellite-based tips
-        if satellite_data:
-            soil_moisture = satellite_data.get("soil_moisture", 0.0)
-            ndvi = satellite_data.get("ndvi", 0.0)
-            
-            if soil_moisture > 0.8:
-                tips.append("[SATELLITE] High soil moisture - ensure good drainage")
-            elif soil_moisture < 0.3:
-                tips.append("[SATELLITE] Low soil moisture - increase irrigation frequency")
-            
-            if ndvi > 0.6:
-                tips.append("[SATELLITE] Good field conditions for optimal planting")
+        return list(_TIP_TABLE[self._var_tip_flags[row] | satellite_flags])
+    
+    def _satellite_flags(self, sat: Optional[SatelliteView]) -> Tuple[int, int]:
+        """Risk and tip bits that depend on the satellite readings rather than the variety"""
+        if not sat:
+            return 0, 0
+        
+        ndvi, soil_moisture = sat.ndvi, sat.soil_moisture
+        risks = (ndvi < 0.3) << 4 | (soil_moisture < 0.2) << 5
+        tips = (soil_moisture > 0.8) << 2 | (not soil_moisture > 0.8 and soil_moisture < 0.3) << 3 | (ndvi > 0.6) << 4
+        return risks, tips
+    
+    def _reason_clauses(self, soil_type: Optional[SoilType], sat: Optional[SatelliteView]) -> Tuple[str, str]:
+        """Soil and satellite clauses of the recommendation reason, which are the same for every variety"""
+        soil_reason = f". Well-suited for {soil_type} soil" if soil_type is not None else ""
         
-        return tips
+        # Satellite reasoning
+        satellite_reason = ""
+        if sat:
+            if sat.ndvi > 0.6:
+                satellite_reason = ". [SATELLITE] satellite data confirms favorable field conditions"
+            elif sat.ndvi < 0.3:
+                satellite_reason = ". [SATELLITE] satellite data suggests field preparation needed"
+        return soil_reason, satellite_reason
     
-    def _generate_recommendation_reason(self, variety_data: Dict[str, Any], context: Dict[str, Any], suitability_score: float, satellite_data: Optional[Dict] = None) -> str:
+    def _generate_recommendation_reason(self, suitability_score: float, soil_reason: str, satellite_reason: str) -> str:
         """Generate recommendation reasoning including satellite insights"""
-        reasons = []
-        
         # Base reasoning
         if suitability_score > 0.8:
-            reasons.append("Excellent match for your conditions")
+            base = "Excellent match for your conditions"
         elif suitability_score > 0.6:
-            reasons.append("Good suitability for your farm")
+            base = "Good suitability for your farm"
         else:
-            reasons.append("Moderate suitability")
-        
-        if context.get("soil_type") in variety_data.get("soil_preference", []):
-            reasons.append(f"Well-suited for {context['soil_type']} soil")
-        
-        # Satellite reasoning
-        if satellite_data:
-            ndvi = satellite_data.get("ndvi", 0.0)
-            if ndvi > 0.6:
-                reasons.append("[SATELLITE] satellite data confirms favorable field conditions")
-            elif ndvi < 0.3:
-                reasons.append("[SATELLITE] satellite data suggests field preparation needed")
-        
-        return ". ".join(reasons) + "."
+            base = "Moderate suitability"
+        return f"{base}{soil_reason}{satellite_reason}."
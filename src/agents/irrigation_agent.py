@@ -885,11 +885,9 @@ class IrrigationAgent(BaseWorkerAgent):
         ]
 
     def _enhance_context_with_satellite_data(self, context: Dict, satellite_data: Dict) -> Dict:
-        """Enhance irrigation context with satellite data insights"""
-        enhanced_context = context.copy()
-        
+        """Add satellite insights and urgency to the irrigation context extracted for this query"""
         if satellite_data:
-            enhanced_context["satellite_insights"] = {
+            context["satellite_insights"] = {
                 "soil_moisture": satellite_data.get("soil_moisture", 0.0),
                 "vegetation_health": satellite_data.get("ndvi", 0.0),
                 "weather_conditions": satellite_data.get("weather", {}),
@@ -899,13 +897,13 @@ class IrrigationAgent(BaseWorkerAgent):
             # Adjust irrigation need based on satellite soil moisture
             soil_moisture = satellite_data.get("soil_moisture", 0.0)
             if soil_moisture < 0.3:
-                enhanced_context["irrigation_urgency"] = "high"
+                context["irrigation_urgency"] = "high"
             elif soil_moisture < 0.5:
-                enhanced_context["irrigation_urgency"] = "medium"
+                context["irrigation_urgency"] = "medium"
             else:
-                enhanced_context["irrigation_urgency"] = "low"
+                context["irrigation_urgency"] = "low"
             
-        return enhanced_context
+        return context
     
     def _assess_irrigation_urgency(self, satellite_data: Dict) -> str:
         """Assess irrigation urgency based on satellite data"""
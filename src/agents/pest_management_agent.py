@@ -917,18 +917,16 @@ class PestManagementAgent(BaseWorkerAgent):
         ]
 
     def _enhance_context_with_satellite_data(self, context: Dict, satellite_data: Dict) -> Dict:
-        """Enhance context with satellite data insights for pest management"""
-        enhanced_context = context.copy()
-        
+        """Add satellite insights for pest management to this query's freshly extracted context"""
         if satellite_data:
-            enhanced_context["satellite_insights"] = {
+            context["satellite_insights"] = {
                 "vegetation_health": satellite_data.get("ndvi", 0.0),
                 "soil_moisture": satellite_data.get("soil_moisture", 0.0),
                 "weather_conditions": satellite_data.get("weather", {}),
                 "outbreak_risk": self._assess_outbreak_risk(satellite_data)
             }
             
-        return enhanced_context
+        return context
     
     def _assess_outbreak_risk(self, satellite_data: Dict) -> str:
         """Assess pest outbreak risk based on satellite weather data"""
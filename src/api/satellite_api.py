@@ -247,11 +247,7 @@ async def get_location_trends(
     """
     try:
         # Find location by name
-        target_location = None
-        for loc in satellite_pipeline.monitoring_locations:
-            if loc.location_name.lower() == location_name.lower():
-                target_location = loc
-                break
+        target_location = satellite_pipeline.find_monitoring_location_by_name(location_name)
         
         if not target_location:
             raise HTTPException(status_code=404, detail=f"Location '{location_name}' not found in monitoring locations")
@@ -194,10 +194,10 @@ class ParallelWorkerNode:
                     state.get("context", {})
                 )
                 
-                # The concurrent adapter already formats the result properly
+                # The concurrent adapter already formats the result properly; keep plain dicts in graph state
                 if result.get("status") in ["completed", "failed"]:
                     logger.info(f"Sub-task {task_id} executed via concurrent adapter: {result.get('status')}")
-                    return result
+                    return dict(result)
                 
             except Exception as e:
                 logger.warning(f"Concurrent adapter failed for {task_id}, falling back to legacy execution: {e}")
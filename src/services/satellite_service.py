@@ -22,6 +22,7 @@ import json
 import logging
 import random
 import sqlite3
+import threading
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
@@ -62,6 +63,44 @@ class SatelliteDataPoint:
     source: str = "SIMULATION"
     resolution: str = "10m"  # Pixel resolution
 
+@dataclass
+class SatelliteSeries:
+    """Column-oriented satellite data series for vectorized trend analysis"""
+    timestamps: List[datetime]
+    ndvi: np.ndarray
+    soil_moisture: np.ndarray
+    temperature: np.ndarray
+    precipitation: np.ndarray
+    cloud_cover: np.ndarray
+    confidence_score: np.ndarray
+    
+    @classmethod
+    def from_data_points(cls, data_points: List[SatelliteDataPoint]) -> "SatelliteSeries":
+        """Build the series from data points, keeping their order"""
+        metrics = [d.metrics for d in data_points]
+        
+        def column(field: str) -> np.ndarray:
+            return np.fromiter((getattr(m, field) for m in metrics), dtype=np.float64, count=len(metrics))
+        
+        return cls(
+            timestamps=[d.timestamp for d in data_points],
+            ndvi=column("ndvi"),
+            soil_moisture=column("soil_moisture"),
+            temperature=column("temperature"),
+            precipitation=column("precipitation"),
+            cloud_cover=column("cloud_cover"),
+            confidence_score=column("confidence_score")
+        )
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    def ndvi_slope(self) -> float:
+        """Least-squares NDVI change per step of the series"""
+        if len(self.ndvi) < 2:
+            return 0.0
+        return float(np.polyfit(np.arange(len(self.ndvi)), self.ndvi, 1)[0])
+
 class SatelliteDataSimulator:
     """
     🛰️ Realistic Satellite Data Simulator
@@ -346,8 +385,23 @@ class SatelliteDataStorage:
     def __init__(self, db_path: str = "data/satellite_data.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection per thread, reused across calls instead of reconnecting per query
+        self._local = threading.local()
         self._init_database()
     
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.db_path)
+        return conn
+    
+    def close(self):
+        """Close this thread's database connection; the next call reopens it"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            conn.close()
+    
     def _init_database(self):
         """Initialize the satellite data database"""
         conn = sqlite3.connect(self.db_path)
@@ -386,49 +440,62 @@ class SatelliteDataStorage:
         
         logger.info(f"💾 Satellite database initialized at {self.db_path}")
     
+    _INSERT_SQL = """
+        INSERT INTO satellite_data (
+            timestamp, latitude, longitude, location_name, region, elevation,
+            ndvi, soil_moisture, temperature, precipitation, cloud_cover,
+            vegetation_health, confidence_score, source, resolution
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    @staticmethod
+    def _to_row(data_point: SatelliteDataPoint) -> Tuple:
+        """Flatten a data point into the column order used by the insert statement"""
+        return (
+            data_point.timestamp.isoformat(),
+            data_point.location.latitude,
+            data_point.location.longitude,
+            data_point.location.location_name,
+            data_point.location.region,
+            data_point.location.elevation,
+            data_point.metrics.ndvi,
+            data_point.metrics.soil_moisture,
+            data_point.metrics.temperature,
+            data_point.metrics.precipitation,
+            data_point.metrics.cloud_cover,
+            data_point.metrics.vegetation_health,
+            data_point.metrics.confidence_score,
+            data_point.source,
+            data_point.resolution
+        )
+    
     def store_data_point(self, data_point: SatelliteDataPoint) -> bool:
         """Store a satellite data point in the database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO satellite_data (
-                    timestamp, latitude, longitude, location_name, region, elevation,
-                    ndvi, soil_moisture, temperature, precipitation, cloud_cover,
-                    vegetation_health, confidence_score, source, resolution
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                data_point.timestamp.isoformat(),
-                data_point.location.latitude,
-                data_point.location.longitude,
-                data_point.location.location_name,
-                data_point.location.region,
-                data_point.location.elevation,
-                data_point.metrics.ndvi,
-                data_point.metrics.soil_moisture,
-                data_point.metrics.temperature,
-                data_point.metrics.precipitation,
-                data_point.metrics.cloud_cover,
-                data_point.metrics.vegetation_health,
-                data_point.metrics.confidence_score,
-                data_point.source,
-                data_point.resolution
-            ))
-            
-            conn.commit()
-            conn.close()
+            # Commits on success and rolls back on error, leaving the shared connection clean
+            with self._connection() as conn:
+                conn.execute(self._INSERT_SQL, self._to_row(data_point))
             return True
             
         except Exception as e:
             logger.error(f"❌ Error storing satellite data: {e}")
             return False
     
+    def store_data_points(self, data_points: List[SatelliteDataPoint]) -> bool:
+        """Store many satellite data points in a single transaction"""
+        try:
+            with self._connection() as conn:
+                conn.executemany(self._INSERT_SQL, [self._to_row(d) for d in data_points])
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Error storing satellite data batch: {e}")
+            return False
+    
     def get_latest_data(self, latitude: float, longitude: float, days_back: int = 7) -> List[SatelliteDataPoint]:
         """Get latest satellite data for a location"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self._connection().cursor()
             
             # Query within a small radius (approximately 1km)
             lat_margin = 0.01
@@ -449,7 +516,6 @@ class SatelliteDataStorage:
             ))
             
             rows = cursor.fetchall()
-            conn.close()
             
             # Convert to data points
             data_points = []
@@ -491,8 +557,7 @@ class SatelliteDataStorage:
     def get_historical_trends(self, latitude: float, longitude: float, months_back: int = 12) -> Dict:
         """Get historical trends for NDVI and soil moisture"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self._connection().cursor()
             
             lat_margin = 0.01
             lon_margin = 0.01
@@ -512,7 +577,6 @@ class SatelliteDataStorage:
             ))
             
             rows = cursor.fetchall()
-            conn.close()
             
             if not rows:
                 return {"trends": [], "summary": "No historical data available"}
@@ -596,6 +660,30 @@ class SatelliteDataPipeline:
             LocationData(11.0168, 76.9558, "Coimbatore", "Tamil Nadu", 411)
         ]
     
+    @staticmethod
+    def _coord_key(latitude: float, longitude: float) -> Tuple[float, float]:
+        """Hashable key for a coordinate, rounded to ~10m precision"""
+        return (round(latitude, 4), round(longitude, 4))
+    
+    @property
+    def monitoring_locations(self) -> List[LocationData]:
+        return self._monitoring_locations
+    
+    @monitoring_locations.setter
+    def monitoring_locations(self, locations: List[LocationData]):
+        # Rebuild the lookup indexes whenever the location list is replaced
+        self._monitoring_locations = locations
+        self._by_coord = {self._coord_key(l.latitude, l.longitude): l for l in locations}
+        self._by_name = {l.location_name.lower(): l for l in locations}
+    
+    def find_monitoring_location(self, latitude: float, longitude: float) -> Optional[LocationData]:
+        """Find the monitoring location at the given coordinates"""
+        return self._by_coord.get(self._coord_key(latitude, longitude))
+    
+    def find_monitoring_location_by_name(self, location_name: str) -> Optional[LocationData]:
+        """Find a monitoring location by name, ignoring case"""
+        return self._by_name.get(location_name.lower())
+    
     async def acquire_data_for_location(self, location: LocationData, date: datetime = None, crop_type: str = "mixed") -> SatelliteDataPoint:
         """Acquire satellite data for a specific location"""
         if date is None:
@@ -612,6 +700,26 @@ class SatelliteDataPipeline:
         
         return data_point
     
+    async def bulk_acquire_for_location(self, location: LocationData, dates: List[datetime], crop_types: Optional[List[str]] = None) -> List[SatelliteDataPoint]:
+        """Acquire a whole series of satellite data for one location in a single call"""
+        if crop_types is None:
+            crop_types = ["mixed"] * len(dates)
+        elif len(crop_types) != len(dates):
+            raise ValueError("crop_types must have the same length as dates")
+        
+        data_points = [
+            self.simulator.simulate_satellite_data(location, date, crop_type)
+            for date, crop_type in zip(dates, crop_types)
+        ]
+        
+        # Store the series with one transaction instead of one per data point
+        if self.storage.store_data_points(data_points):
+            logger.info(f"✅ {len(data_points)} satellite data points acquired and stored for {location.location_name}")
+        else:
+            logger.error(f"❌ Failed to store satellite data series for {location.location_name}")
+        
+        return data_points
+    
     async def bulk_acquire_data(self, days_back: int = 30) -> Dict:
         """Acquire bulk satellite data for all monitoring locations"""
         logger.info(f"🚀 Starting bulk satellite data acquisition for {len(self.monitoring_locations)} locations")
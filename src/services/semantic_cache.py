@@ -0,0 +1,120 @@
+"""
+Semantic Response Cache
+Returns stored LLM answers for questions that are near-duplicates of earlier ones,
+so repeated farmer questions skip the Gemini round-trip entirely.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Embedding-based cache of (question, answer) pairs.
+    
+    Questions are grouped by normalized location and compared with cosine
+    similarity; a lookup hits when the closest stored question for the same
+    location is at least `threshold` similar.
+    """
+    
+    def __init__(
+        self,
+        embed: Callable[[str], Sequence[float]],
+        threshold: float = 0.92,
+        cache_file: Optional[str] = "data/local_cache/semantic_cache.json"
+    ):
+        self.embed = embed
+        self.threshold = threshold
+        self.cache_file = Path(cache_file) if cache_file else None
+        
+        # Per-location normalized embedding matrices and their answers
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._entries: Dict[str, List[Dict[str, str]]] = {}
+        
+        self._load()
+    
+    @staticmethod
+    def _normalize_location(location: Optional[str]) -> str:
+        return " ".join((location or "").lower().split())
+    
+    @staticmethod
+    def _unit(vector: Sequence[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+    
+    def get(self, query_text: str, location: Optional[str] = None) -> Optional[str]:
+        """Return a cached answer for a similar question, or None on a miss"""
+        return self.lookup(query_text, location)[0]
+    
+    def lookup(self, query_text: str, location: Optional[str] = None) -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """
+        Like get, but also return the query's embedding (None if it was not needed),
+        so a miss can be stored with put(..., vector=...) without embedding the query again
+        """
+        key = self._normalize_location(location)
+        vectors = self._vectors.get(key)
+        if vectors is None:
+            return None, None
+        
+        query_vector = self._unit(self.embed(query_text))
+        similarities = vectors @ query_vector
+        best = int(np.argmax(similarities))
+        
+        if similarities[best] >= self.threshold:
+            logger.debug(f"Semantic cache hit ({similarities[best]:.3f}) for: {query_text[:50]}")
+            return self._entries[key][best]["response"], query_vector
+        return None, query_vector
+    
+    def put(self, query_text: str, response: str, location: Optional[str] = None,
+            vector: Optional[np.ndarray] = None):
+        """Store an answer for later similar questions, reusing the embedding from lookup if given"""
+        key = self._normalize_location(location)
+        if vector is None:
+            vector = self._unit(self.embed(query_text))
+        self._add(key, query_text, response, vector)
+        self._save()
+    
+    def _add(self, key: str, query_text: str, response: str, vector: np.ndarray):
+        if key in self._vectors:
+            self._vectors[key] = np.vstack([self._vectors[key], vector])
+        else:
+            self._vectors[key] = vector.reshape(1, -1)
+        self._entries.setdefault(key, []).append({"query": query_text, "response": response})
+    
+    def _load(self):
+        if not self.cache_file or not self.cache_file.exists():
+            return
+        
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            for key, entries in stored.items():
+                for entry in entries:
+                    self._add(key, entry["query"], entry["response"], self._unit(entry["embedding"]))
+        except Exception as e:
+            logger.warning(f"Could not load semantic cache from {self.cache_file}: {e}")
+    
+    def _save(self):
+        if not self.cache_file:
+            return
+        
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            stored = {
+                key: [
+                    {**entry, "embedding": vector.tolist()}
+                    for entry, vector in zip(entries, self._vectors[key])
+                ]
+                for key, entries in self._entries.items()
+            }
+            with open(self.cache_file, "w", encoding="utf-8") as f:
+                json.dump(stored, f)
+        except Exception as e:
+            logger.warning(f"Could not save semantic cache to {self.cache_file}: {e}")
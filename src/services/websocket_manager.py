@@ -1,10 +1,10 @@
 
 import asyncio
-import json
 import logging
 from typing import List, Dict, Any
 from datetime import datetime
 
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect
 
 logger = logging.getLogger(__name__)
@@ -76,6 +76,26 @@ class WebSocketManager:
             await asyncio.gather(*tasks, return_exceptions=True)
             logger.debug(f"Broadcast message sent to {len(tasks)} connections")
     
+    async def broadcast_many(self, messages: List[Dict[str, Any]]):
+        if not self.active_connections or not messages:
+            logger.debug("No active WebSocket connections or messages to broadcast")
+            return
+        
+        # Stamp and serialize each message once, then fan the batch out per connection
+        timestamp = datetime.now().isoformat()
+        payloads = []
+        for message in messages:
+            if "timestamp" not in message:
+                message["timestamp"] = timestamp
+            payloads.append(orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode())
+        
+        tasks = [
+            self._send_batch_to_connection(websocket, payloads)
+            for websocket in self.active_connections.copy()
+        ]
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.debug(f"Broadcast {len(payloads)} messages to {len(tasks)} connections")
+    
     async def send_to_client(self, websocket: WebSocket, message: Dict[str, Any]):
         if websocket in self.active_connections:
             await self._send_to_connection(websocket, message)
@@ -86,7 +106,7 @@ class WebSocketManager:
             if websocket not in self.active_connections:
                 return
                 
-            await websocket.send_text(json.dumps(message))
+            await websocket.send_text(orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode())
             
             # Update connection stats
             if websocket in self.connection_info:
@@ -99,6 +119,24 @@ class WebSocketManager:
             logger.warning(f"Error sending WebSocket message, disconnecting client: {e}")
             await self.disconnect(websocket)
     
+    async def _send_batch_to_connection(self, websocket: WebSocket, payloads: List[str]):
+        try:
+            for payload in payloads:
+                if websocket not in self.active_connections:
+                    return
+                
+                await websocket.send_text(payload)
+                
+                if websocket in self.connection_info:
+                    self.connection_info[websocket]["messages_sent"] += 1
+                    
+        except WebSocketDisconnect:
+            logger.debug("WebSocket disconnected during batch send")
+            await self.disconnect(websocket)
+        except Exception as e:
+            logger.warning(f"Error sending WebSocket batch, disconnecting client: {e}")
+            await self.disconnect(websocket)
+    
     def get_connection_stats(self) -> Dict[str, Any]:
         total_messages = sum(
             info.get("messages_sent", 0) 
@@ -0,0 +1,321 @@
+"""
+🧪 API Interaction Agent Tests
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import orjson
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.agents.api_interaction_agent import APIInteractionAgent, close_aio_session
+from src.agents import base_agent
+from src.agents.base_agent import BaseWorkerAgent
+from src.core.models import AgentStatus, Task
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves JSON under /json, a 503-then-200 endpoint at /flaky and plain text everywhere else"""
+    
+    flaky_calls = 0
+    
+    def do_GET(self):
+        if self.path == "/flaky":
+            _Handler.flaky_calls += 1
+            if _Handler.flaky_calls == 1:
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+        
+        if self.path in ("/broken-json", "/empty-json"):
+            # No Content-Length, so the agent sees a body of unknown size
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            if self.path == "/broken-json":
+                self.wfile.write(b'{"truncated": ')
+            return
+        
+        if self.path == "/problem":
+            body = b'{"title": "Not Found", "status": 404}'
+            content_type = "application/problem+json; charset=utf-8"
+        elif self.path == "/looks-like-json":
+            body = b'{"not": "parsed"}'
+            content_type = "text/plain; charset=utf-8"
+        elif self.path.startswith("/json"):
+            body = json.dumps({
+                "path": self.path,
+                "agent": self.headers.get("User-Agent"),
+                "accept": self.headers.get_all("Accept")
+            }).encode()
+            content_type = "application/json"
+        else:
+            body = b"plain response"
+            content_type = "text/plain"
+        
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+class TestAPIInteractionAgent:
+    """Test requests against a local HTTP server"""
+    
+    def setup_method(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.agent = APIInteractionAgent("TestAPIClient")
+    
+    def teardown_method(self):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def test_execute_parses_json_and_text(self):
+        task = Task(title="fetch", task_type="api_request", parameters={"url": f"{self.base_url}/json"})
+        result = self.agent.execute(task, {})
+        
+        assert result["success"] is True
+        assert result["response"]["format"] == "json"
+        assert result["response"]["data"]["path"] == "/json"
+        assert result["response"]["data"]["agent"] == f"AgentWeaver-APIAgent/{self.agent.agent_id}"
+        assert result["response"]["headers"]["Content-Type"] == "application/json"
+        assert json.loads(json.dumps(result))["response"]["headers"]["Content-Type"] == "application/json"
+        
+        task = Task(title="fetch", task_type="api_request", parameters={"url": f"{self.base_url}/text"})
+        result = self.agent.execute(task, {})
+        
+        assert result["response"]["format"] == "text"
+        assert result["response"]["data"] == "plain response"
+        decoded = orjson.loads(APIInteractionAgent.result_bytes(result))
+        assert decoded["response"]["data"] == "plain response"
+        assert decoded["response"]["headers"]["Content-Type"] == "text/plain"
+    
+    def test_json_is_only_parsed_for_json_content_types(self):
+        task = Task(title="fetch", task_type="api_request", parameters={"url": f"{self.base_url}/looks-like-json"})
+        result = self.agent.execute(task, {})
+        
+        assert result["response"]["format"] == "text"
+        assert result["response"]["data"] == '{"not": "parsed"}'
+        
+        problem = Task(title="fetch", task_type="api_request", parameters={"url": f"{self.base_url}/problem"})
+        result = self.agent.execute(problem, {})
+        
+        assert result["response"]["format"] == "json"
+        assert result["response"]["data"]["status"] == 404
+        
+        async def run():
+            try:
+                return await asyncio.gather(self.agent.execute_async(task, {}), self.agent.execute_async(problem, {}))
+            finally:
+                await close_aio_session()
+        
+        text_result, problem_result = asyncio.run(run())
+        
+        assert text_result["response"]["format"] == "text"
+        assert text_result["response"]["data"] == '{"not": "parsed"}'
+        assert problem_result["response"]["format"] == "json"
+        assert problem_result["response"]["data"]["status"] == 404
+    
+    def test_unparseable_json_bodies_fall_back_to_text(self):
+        task = Task(title="fetch", task_type="api_request", parameters={"url": f"{self.base_url}/broken-json"})
+        result = self.agent.execute(task, {})
+        
+        assert result["response"]["format"] == "text"
+        assert result["response"]["data"] == '{"truncated": '
+        assert "parse_error" in result["response"]
+        
+        task = Task(title="fetch", task_type="api_request", parameters={"url": f"{self.base_url}/empty-json"})
+        result = self.agent.execute(task, {})
+        
+        assert result["response"]["format"] == "text"
+        assert result["response"]["data"] == ""
+    
+    def test_task_headers_override_defaults_case_insensitively(self):
+        url = f"{self.base_url}/json"
+        overriding = Task(title="fetch", task_type="api_request", parameters={"url": url, "headers": {"accept": "application/json"}})
+        no_headers = Task(title="fetch", task_type="api_request", parameters={"url": url, "headers": None})
+        
+        assert self.agent.execute(overriding, {})["response"]["data"]["accept"] == ["application/json"]
+        assert self.agent.execute(no_headers, {})["success"] is True
+        
+        async def run():
+            try:
+                return await asyncio.gather(self.agent.execute_async(overriding, {}), self.agent.execute_async(no_headers, {}))
+            finally:
+                await close_aio_session()
+        
+        overridden, plain = asyncio.run(run())
+        
+        assert overridden["response"]["data"]["accept"] == ["application/json"]
+        assert plain["success"] is True
+    
+    def test_execute_rejects_invalid_url(self):
+        task = Task(title="fetch", task_type="api_request", parameters={"url": "not a url"})
+        result = self.agent.execute(task, {})
+        
+        assert result["success"] is False
+        assert "Invalid URL" in result["error"]
+    
+    def test_execute_async_fans_out_urls(self):
+        urls = [f"{self.base_url}/json/{i}" for i in range(5)]
+        task = Task(title="fetch many", task_type="api_request", parameters={"urls": urls})
+        
+        async def run():
+            try:
+                return await self.agent.execute_async(task, {})
+            finally:
+                await close_aio_session()
+        
+        result = asyncio.run(run())
+        
+        assert result["success"] is True
+        assert [r["response"]["data"]["path"] for r in result["results"]] == [f"/json/{i}" for i in range(5)]
+        assert result["results"][0]["response"]["data"]["agent"] == f"AgentWeaver-APIAgent/{self.agent.agent_id}"
+    
+    def test_process_tasks_runs_concurrently_in_order(self):
+        tasks = [
+            Task(title=f"fetch {i}", task_type="api_request", parameters={"url": f"{self.base_url}/json/{i}"})
+            for i in range(4)
+        ]
+        
+        async def run():
+            try:
+                return await self.agent.process_tasks(tasks, max_concurrent=2)
+            finally:
+                await close_aio_session()
+        
+        results = asyncio.run(run())
+        
+        assert [r["response"]["data"]["path"] for r in results] == [f"/json/{i}" for i in range(4)]
+    
+    def test_auth_config_is_compiled_once(self):
+        bearer = {"type": "bearer", "token": "abc"}
+        
+        assert self.agent._resolve_auth(bearer) == ({"Authorization": "Bearer abc"}, None)
+        cached = self.agent._auth_cache
+        assert self.agent._resolve_auth(dict(bearer)) == ({"Authorization": "Bearer abc"}, None)
+        assert self.agent._auth_cache is cached
+        
+        assert self.agent._resolve_auth({"type": "api_key", "api_key": "k"}) == ({"X-API-Key": "k"}, None)
+        assert self.agent._resolve_auth({"type": "basic", "username": "u", "password": "p"}) == ({}, ("u", "p"))
+    
+    def test_agents_share_the_pool_but_not_cookies(self):
+        other = APIInteractionAgent("OtherClient")
+        self.agent.session.cookies.set("token", "abc")
+        
+        assert other.session is not self.agent.session
+        assert other.session.get_adapter(self.base_url) is self.agent.session.get_adapter(self.base_url)
+        assert "token" not in other.session.cookies
+        
+        self.agent.close()
+        task = Task(title="fetch", task_type="api_request", parameters={"url": f"{self.base_url}/json"})
+        assert other.execute(task, {})["success"] is True
+        assert "token" not in self.agent.session.cookies
+    
+    def test_agent_uses_slots(self):
+        assert not hasattr(self.agent, "__dict__")
+        assert self.agent.agent_id == self.agent.agent_state.agent_id
+    
+    def test_server_errors_are_retried(self):
+        _Handler.flaky_calls = 0
+        task = Task(title="fetch", task_type="api_request", parameters={"url": f"{self.base_url}/flaky"})
+        result = self.agent.execute(task, {})
+        
+        assert result["status_code"] == 200
+        assert _Handler.flaky_calls == 2
+    
+    def test_max_retries_sets_the_sync_retry_budget(self):
+        _Handler.flaky_calls = 0
+        self.agent.max_retries = 1
+        task = Task(title="fetch", task_type="api_request", parameters={"url": f"{self.base_url}/flaky"})
+        result = self.agent.execute(task, {})
+        
+        assert result["status_code"] == 503
+        assert _Handler.flaky_calls == 1
+    
+    def test_process_tasks_threaded(self):
+        tasks = [
+            Task(title=f"fetch {i}", task_type="api_request", parameters={"url": f"{self.base_url}/json/{i}"})
+            for i in range(4)
+        ]
+        
+        results = self.agent.process_tasks_threaded(tasks)
+        
+        assert [r["response"]["data"]["path"] for r in results] == [f"/json/{i}" for i in range(4)]
+    
+    def test_get_state_is_a_snapshot(self):
+        self.agent.update_context({"region": "Punjab"})
+        
+        state = self.agent.get_state()
+        state.context["region"] = "Bihar"
+        state.capabilities.clear()
+        
+        assert state.agent_id == self.agent.agent_id
+        assert self.agent.agent_state.context["region"] == "Punjab"
+        assert self.agent.capabilities
+    
+    def test_state_timestamps_are_naive_utc(self):
+        state = self.agent.agent_state
+        created = state.last_activity
+        self.agent.start_task(Task(title="fetch"))
+        
+        assert state.last_updated.tzinfo is None
+        assert state.last_activity == state.last_updated
+        assert state.last_updated >= created
+
+class _EchoAgent(BaseWorkerAgent):
+    """Minimal sync-only worker; fails tasks titled 'boom' and fans 'nested' tasks out again"""
+    
+    def execute(self, task, context):
+        if task.title == "boom":
+            raise RuntimeError("boom")
+        if task.title == "nested":
+            return {"inner": self.process_tasks_threaded([Task(title="inner 0"), Task(title="inner 1")])}
+        return {"title": task.title, "thread": threading.current_thread().name}
+
+class TestBaseWorkerAgentAsync:
+    """Test the async bridge for sync-only agents"""
+    
+    def test_default_execute_async_runs_off_the_event_loop(self):
+        agent = _EchoAgent("Echo", [])
+        tasks = [Task(title=f"task {i}") for i in range(3)]
+        
+        results = asyncio.run(agent.process_tasks(tasks))
+        
+        assert [r["title"] for r in results] == ["task 0", "task 1", "task 2"]
+        assert all(r["thread"].startswith("agent-worker") for r in results)
+    
+    def test_process_tasks_threaded_returns_failures_in_place(self):
+        agent = _EchoAgent("Echo", [])
+        tasks = [Task(title=f"task {i}") for i in range(5)] + [Task(title="boom")]
+        
+        results = agent.process_tasks_threaded(tasks)
+        
+        assert [r["title"] for r in results[:5]] == [f"task {i}" for i in range(5)]
+        assert isinstance(results[5], RuntimeError)
+        assert agent.status == AgentStatus.AVAILABLE
+        assert agent.agent_state.current_task_id is None
+    
+    def test_nested_process_tasks_threaded_does_not_deadlock(self, monkeypatch):
+        # With a single worker, a nested fan-out would wait forever for the worker it is running on
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=base_agent._FANOUT_THREAD_PREFIX)
+        monkeypatch.setattr(base_agent, "_FANOUT_EXECUTOR", executor)
+        agent = _EchoAgent("Echo", [])
+        
+        try:
+            results = agent.process_tasks_threaded([Task(title="nested"), Task(title="nested")])
+        finally:
+            executor.shutdown(wait=False)
+        
+        assert all([r["title"] for r in result["inner"]] == ["inner 0", "inner 1"] for result in results)
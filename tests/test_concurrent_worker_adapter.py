@@ -0,0 +1,330 @@
+"""
+🧪 Concurrent Worker Adapter Tests
+"""
+
+import gc
+import os
+import sys
+import threading
+import time
+import weakref
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.agents.base_agent import BaseWorkerAgent
+from src.agents.concurrent_worker_adapter import (
+    ConcurrentExecutionPool,
+    ConcurrentWorkerAdapter,
+    ConcurrentWorkerRegistry,
+    FastConcurrentPool,
+    SubtaskBatch,
+    SubtaskResult
+)
+from src.core.models import AgentCapability
+
+class EchoAgent(BaseWorkerAgent):
+    """Returns its input and the thread it ran on; fails when asked to"""
+    
+    def __init__(self, name: str = "EchoAgent"):
+        super().__init__(name, [AgentCapability.EXECUTION], "echo")
+    
+    def execute(self, task, context):
+        if task.parameters.get("fail"):
+            raise RuntimeError("asked to fail")
+        return {"echo": task.parameters.get("value"), "thread": threading.get_ident()}
+
+class ExclusiveAgent(BaseWorkerAgent):
+    """Fails if two threads ever run on the same instance at once"""
+    
+    def __init__(self, name: str = "ExclusiveAgent"):
+        super().__init__(name, [AgentCapability.EXECUTION], "exclusive")
+        self.in_use = threading.Lock()
+    
+    def execute(self, task, context):
+        if not self.in_use.acquire(blocking=False):
+            raise RuntimeError("agent shared between threads")
+        try:
+            time.sleep(0.001)
+            return {"thread": threading.get_ident()}
+        finally:
+            self.in_use.release()
+
+class RendezvousAgent(BaseWorkerAgent):
+    """Blocks until every subtask sharing its barrier has started, so it only finishes if they overlap"""
+    
+    barrier = None
+    
+    def __init__(self, name: str = "RendezvousAgent"):
+        super().__init__(name, [AgentCapability.EXECUTION], "rendezvous")
+    
+    def execute(self, task, context):
+        RendezvousAgent.barrier.wait()
+        return {"thread": threading.get_ident()}
+
+def make_subtasks(count, cacheable=False, **parameters):
+    return [
+        {
+            "task_id": f"echo_{i}",
+            "parameters": {"value": i, **parameters},
+            "required_capabilities": ["execution"],
+            "cacheable": cacheable
+        }
+        for i in range(count)
+    ]
+
+class TestConcurrentWorkerAdapter:
+    """Test subtask execution through a single adapter"""
+    
+    def setup_method(self):
+        self.adapter = ConcurrentWorkerAdapter(EchoAgent, {"name": "Echo"})
+    
+    def test_execute_subtask(self):
+        result = self.adapter.execute_subtask(make_subtasks(1)[0])
+        
+        assert result["status"] == "completed"
+        assert result["subtask_id"] == "echo_0"
+        assert result["result"]["echo"] == 0
+        assert result["agent_class"] == "EchoAgent"
+        assert result["capabilities_used"] == ("execution",)
+        assert result["execution_time"] >= 0
+        assert datetime.fromisoformat(result["completed_at"]).tzinfo is None
+        assert result["completed_at"] == datetime.utcfromtimestamp(result["completed_ts"]).isoformat()
+        
+        assert isinstance(result, SubtaskResult)
+        assert not hasattr(result, "__dict__")
+        assert result.get("missing", "default") == "default"
+        assert dict(result) == result.to_dict()
+        assert dict(result)["subtask_id"] == "echo_0"
+    
+    def test_failed_subtask_is_reported(self):
+        result = self.adapter.execute_subtask(make_subtasks(1, fail=True)[0])
+        
+        assert result["status"] == "failed"
+        assert "asked to fail" in result["result"]["error"]
+    
+    def test_execute_subtask_batch(self):
+        subtasks = make_subtasks(3)
+        subtasks[1]["parameters"]["fail"] = True
+        
+        results = self.adapter.execute_subtask_batch(subtasks)
+        
+        assert [r["subtask_id"] for r in results] == ["echo_0", "echo_1", "echo_2"]
+        assert [r["status"] for r in results] == ["completed", "failed", "completed"]
+        assert len({r["agent_id"] for r in results}) == 1
+    
+    def test_agent_info_is_computed_once(self):
+        info = self.adapter.get_agent_info()
+        
+        assert info["capabilities"] == ["execution"]
+        assert info["agent_type"] == "echo"
+        assert self.adapter.get_agent_info() is info
+    
+    def test_prototype_is_shared_between_identical_adapters(self):
+        assert ConcurrentWorkerAdapter(EchoAgent, {"name": "Echo"}).prototype_agent is self.adapter.prototype_agent
+        assert ConcurrentWorkerAdapter(EchoAgent, {"name": "Other"}).prototype_agent is not self.adapter.prototype_agent
+    
+    def test_agent_is_reused_per_thread(self):
+        first = self.adapter._get_thread_local_agent()
+        assert self.adapter._get_thread_local_agent() is first
+        assert first.name.startswith("Echo_thread_")
+    
+    def test_thread_agents_are_released_with_their_thread(self):
+        agents = []
+        thread = threading.Thread(target=lambda: agents.append(weakref.ref(self.adapter._get_thread_local_agent())))
+        thread.start()
+        thread.join()
+        del thread
+        gc.collect()
+        
+        assert agents[0]() is None
+    
+    def test_pool_size_caps_agent_creation(self):
+        adapter = ConcurrentWorkerAdapter(ExclusiveAgent, {"name": "Exclusive"})
+        adapter.set_pool_size(2)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.extend(adapter.execute_subtask_batch(make_subtasks(5))))
+            for _ in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # Threads beyond the cap wait for a pooled agent instead of sharing one that is busy
+        assert len(adapter._pool) == 2
+        assert len(results) == 30
+        assert all(r["status"] == "completed" for r in results)
+        assert {r["agent_id"] for r in results} <= {agent.agent_id for agent in adapter._pool}
+
+class TestConcurrentExecutionPool:
+    """Test fan-out across the execution pool"""
+    
+    def setup_method(self):
+        self.registry = ConcurrentWorkerRegistry()
+        self.registry.register_adapter("echo", EchoAgent, {"name": "Echo"})
+        self.pool = ConcurrentExecutionPool(max_workers=4, worker_registry=self.registry)
+    
+    def teardown_method(self):
+        self.pool.shutdown()
+    
+    def test_execute_subtasks_concurrently(self):
+        results = self.pool.execute_subtasks_concurrently(make_subtasks(20))
+        
+        assert len(results) == 20
+        assert all(r["status"] == "completed" for r in results)
+        assert [r["result"]["echo"] for r in results] == list(range(20))
+    
+    def test_subtasks_run_on_their_adapter_shard(self):
+        assert self.registry.find_suitable_adapter_id(["execution"]) == "echo"
+        assert self.registry.find_suitable_adapter_id(["no_such_capability"]) is None
+        assert self.pool.executors == {}
+        
+        results = self.pool.execute_subtasks_concurrently(make_subtasks(4))
+        assert list(self.pool.executors) == ["echo"]
+        shard_threads = {t.ident for t in self.pool.executors["echo"]._threads}
+        
+        assert {r["thread_id"] for r in results} <= shard_threads
+        assert all(r["agent_name"] == f"Echo_thread_{r['thread_id']}" for r in results)
+    
+    def test_same_adapter_subtasks_overlap(self):
+        registry = ConcurrentWorkerRegistry()
+        registry.register_adapter("rendezvous", RendezvousAgent, {"name": "Rendezvous"})
+        pool = ConcurrentExecutionPool(max_workers=4, worker_registry=registry)
+        RendezvousAgent.barrier = threading.Barrier(4, timeout=5)
+        
+        try:
+            results = pool.execute_subtasks_concurrently([
+                {"task_id": f"meet_{i}", "required_capabilities": ["execution"]} for i in range(4)
+            ])
+        finally:
+            pool.shutdown()
+        
+        assert [r["status"] for r in results] == ["completed"] * 4
+        assert len({r["thread_id"] for r in results}) == 4
+    
+    def test_execute_batch(self):
+        batch = SubtaskBatch.from_subtasks(make_subtasks(6))
+        batch.append("orphan", required_capabilities=["no_such_capability"])
+        
+        results = self.pool.execute_batch(batch)
+        
+        assert [r["subtask_id"] for r in results] == [f"echo_{i}" for i in range(6)] + ["orphan"]
+        assert [r["result"]["echo"] for r in results[:6]] == list(range(6))
+        assert results[6]["status"] == "failed"
+        assert self.pool.execute_batch(SubtaskBatch()) == []
+    
+    def test_get_shared_reuses_pools_by_size(self):
+        shared = ConcurrentExecutionPool.get_shared(3)
+        
+        assert ConcurrentExecutionPool.get_shared(3) is shared
+        assert ConcurrentExecutionPool.get_shared(5) is not shared
+        
+        shared.shutdown()
+        ConcurrentExecutionPool.get_shared(5).shutdown()
+        assert ConcurrentExecutionPool.get_shared(3) is not shared
+        ConcurrentExecutionPool.get_shared(3).shutdown()
+    
+    def test_unmatched_capability_fails_without_running(self):
+        results = self.pool.execute_subtasks_concurrently([
+            {"task_id": "orphan", "required_capabilities": ["no_such_capability"]}
+        ])
+        
+        assert results[0]["status"] == "failed"
+        assert "No suitable adapter" in results[0]["error"]
+
+class TestFastConcurrentPool:
+    """Test the deque-backed pool for short subtasks"""
+    
+    def setup_method(self):
+        self.registry = ConcurrentWorkerRegistry()
+        self.registry.register_adapter("echo", EchoAgent, {"name": "Echo"})
+        self.pool = FastConcurrentPool(max_workers=4, worker_registry=self.registry)
+    
+    def teardown_method(self):
+        self.pool.shutdown()
+    
+    def test_execute_subtasks_concurrently(self):
+        subtasks = make_subtasks(50)
+        subtasks[7]["parameters"]["fail"] = True
+        
+        results = self.pool.execute_subtasks_concurrently(subtasks)
+        
+        assert [r["subtask_id"] for r in results] == [f"echo_{i}" for i in range(50)]
+        assert [r["status"] for r in results].count("failed") == 1
+    
+    def test_submit_and_shutdown(self):
+        assert self.pool.submit(sum, [1, 2, 3]).result() == 6
+        
+        self.pool.shutdown()
+        
+        assert not any(worker.is_alive() for worker in self.pool._workers)
+        with pytest.raises(RuntimeError):
+            self.pool.submit(sum, [1])
+
+class TestConcurrentWorkerRegistry:
+    """Test adapter lookup and result reuse"""
+    
+    def setup_method(self):
+        self.registry = ConcurrentWorkerRegistry(result_cache_size=2)
+        self.registry.register_adapter("echo", EchoAgent, {"name": "Echo"})
+    
+    def test_cacheable_subtasks_reuse_results(self):
+        first, second = make_subtasks(2, cacheable=True)
+        second["parameters"]["value"] = 0
+        
+        result = self.registry.execute_subtask_with_best_adapter(first)
+        cached = self.registry.execute_subtask_with_best_adapter(second)
+        
+        assert "cached" not in result
+        assert cached["cached"] is True
+        assert cached["subtask_id"] == "echo_1"
+        assert cached["execution_time"] == 0.0
+        assert cached["result"] == result["result"]
+    
+    def test_cache_key_includes_context(self):
+        subtask = make_subtasks(1, cacheable=True)[0]
+        
+        self.registry.execute_subtask_with_best_adapter(subtask, {"region": "Punjab"})
+        assert "cached" not in self.registry.execute_subtask_with_best_adapter(subtask, {"region": "Bihar"})
+        assert self.registry.execute_subtask_with_best_adapter(subtask, {"region": "Punjab"})["cached"] is True
+        assert "cached" not in self.registry.execute_subtask_with_best_adapter({**subtask, "context": {"season": "rabi"}})
+    
+    def test_cached_results_are_copies(self):
+        subtask = make_subtasks(1, cacheable=True)[0]
+        
+        first = self.registry.execute_subtask_with_best_adapter(subtask)
+        first["result"]["echo"] = "changed by caller"
+        hit = self.registry.execute_subtask_with_best_adapter(subtask)
+        hit["result"]["echo"] = "changed again"
+        
+        assert self.registry.execute_subtask_with_best_adapter(subtask)["result"]["echo"] == 0
+    
+    def test_execution_pool_uses_the_cache(self):
+        pool = ConcurrentExecutionPool(max_workers=2, worker_registry=self.registry)
+        try:
+            first = pool.execute_subtasks_concurrently(make_subtasks(2, cacheable=True))
+            second = pool.execute_batch(SubtaskBatch.from_subtasks(make_subtasks(2, cacheable=True)))
+        finally:
+            pool.shutdown()
+        
+        assert not any("cached" in r for r in first)
+        assert [r["cached"] for r in second] == [True, True]
+        assert [r["result"]["echo"] for r in second] == [0, 1]
+    
+    def test_result_cache_is_opt_in_and_bounded(self):
+        plain = make_subtasks(1)[0]
+        self.registry.execute_subtask_with_best_adapter(plain)
+        assert "cached" not in self.registry.execute_subtask_with_best_adapter(plain)
+        
+        for subtask in make_subtasks(3, cacheable=True):
+            self.registry.execute_subtask_with_best_adapter(subtask)
+        
+        assert len(self.registry._result_cache) == 2
+        
+        failing = make_subtasks(1, cacheable=True, fail=True)[0]
+        self.registry.execute_subtask_with_best_adapter(failing)
+        assert "cached" not in self.registry.execute_subtask_with_best_adapter(failing)
@@ -0,0 +1,348 @@
+"""
+🧪 Crop Selection Agent Tests
+"""
+
+import asyncio
+import copy
+import dataclasses
+import os
+import sys
+import time
+
+import numpy as np
+import orjson
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.agents import crop_selection_agent
+from src.agents.crop_selection_agent import CropSelectionAgent
+from src.core.agriculture_models import AgricultureQuery, CropType, SeasonType, SoilType
+from src.core.models import Task
+
+# Built at import: some test modules rewrite sys.modules while they are collected,
+# which breaks the agent's function-level imports for anything constructed later
+AGENT = CropSelectionAgent()
+
+def make_context(**overrides):
+    context = {
+        "location": None,
+        "season": SeasonType.RABI,
+        "soil_type": None,
+        "farm_size": None,
+        "budget": None,
+        "specific_crop": None,
+        "weather_conditions": None,
+        "irrigation_available": None,
+        "experience_level": "intermediate"
+    }
+    context.update(overrides)
+    return context
+
+class TestCropRecommendations:
+    """Test variety scoring and ranking"""
+    
+    def setup_method(self):
+        self.agent = AGENT
+    
+    def recommend(self, satellite_data=None, **overrides):
+        sat = crop_selection_agent._satellite_view(satellite_data)
+        return asyncio.run(self.agent._generate_crop_recommendations(make_context(**overrides), sat))
+    
+    def test_top_recommendations_are_ranked(self):
+        recommendations = self.recommend(location="Punjab", soil_type=SoilType.LOAMY, irrigation_available=True)
+        scores = [rec.suitability_score for rec in recommendations]
+        
+        assert len(recommendations) == 5
+        assert scores == sorted(scores, reverse=True)
+        assert all(0.3 < score <= 1.0 for score in scores)
+        assert {rec.crop_type for rec in recommendations} <= {CropType.WHEAT, CropType.RICE, CropType.SUGARCANE, CropType.MAIZE}
+    
+    def test_specific_crop_limits_varieties(self):
+        recommendations = self.recommend(specific_crop=CropType.WHEAT, soil_type=SoilType.CLAY)
+        
+        assert [rec.variety for rec in recommendations] == ["DBW-88", "HD-2967", "PBW-343"]
+        assert recommendations[0].suitability_score == 0.5 + 0.20 + 0.06
+        assert recommendations[0].expected_yield == 4800 * recommendations[0].suitability_score
+        assert self.recommend(specific_crop=CropType.MUSTARD) == []
+    
+    def test_satellite_data_raises_scores(self):
+        satellite_data = {"ndvi": 0.75, "soil_moisture": 0.8, "weather": {"temperature": 20, "humidity": 60}}
+        
+        plain = {rec.variety: rec.suitability_score for rec in self.recommend(specific_crop=CropType.WHEAT)}
+        enhanced = {rec.variety: rec.suitability_score for rec in self.recommend(satellite_data, specific_crop=CropType.WHEAT)}
+        
+        assert all(enhanced[variety] > plain[variety] for variety in plain)
+        assert enhanced["HD-2967"] - plain["HD-2967"] <= 0.20 + 1e-9
+
+    def test_vectorized_scores_match_the_row_loop(self, monkeypatch):
+        rows = np.arange(len(self.agent._var_water))
+        cases = [
+            (make_context(), None),
+            (make_context(location="Punjab", soil_type=SoilType.LOAMY, irrigation_available=True), {"ndvi": 0.6, "soil_moisture": 0.25}),
+            (make_context(location="Kerala", soil_type=SoilType.SALINE), {"ndvi": 0.9, "soil_moisture": 0.9, "weather": {"temperature": 28, "humidity": 70}}),
+            (make_context(location="Rajasthan", soil_type=SoilType.SANDY, irrigation_available=True), {"ndvi": 0.1, "soil_moisture": 0.5, "weather": {"humidity": 90}}),
+        ]
+        
+        def score_all(kernel):
+            monkeypatch.setattr(crop_selection_agent, "_score_kernel", kernel)
+            return [self.agent._score_varieties(rows, context, crop_selection_agent._satellite_view(satellite_data))
+                    for context, satellite_data in cases]
+        
+        for looped, vectorized in zip(score_all(crop_selection_agent._score_rows), score_all(crop_selection_agent._score_kernel_numpy)):
+            assert np.array_equal(looped, vectorized)
+    
+    def test_equivalent_contexts_share_cached_recommendations(self):
+        first = self.recommend({"ndvi": 0.72, "soil_moisture": 0.4}, location="Kerala", soil_type=SoilType.CLAY)
+        again = self.recommend({"ndvi": 0.78, "soil_moisture": 0.45}, location="Kerala", soil_type=SoilType.CLAY)
+        
+        assert first == again and first[0] is again[0]
+        
+        # Crossing a threshold the scoring compares against needs a fresh ranking
+        lower = self.recommend({"ndvi": 0.7, "soil_moisture": 0.4}, location="Kerala", soil_type=SoilType.CLAY)
+        
+        assert lower[0] is not first[0]
+        assert lower[0].suitability_score < first[0].suitability_score
+    
+    def test_recommendations_are_frozen(self):
+        recommendation = self.recommend(specific_crop=CropType.WHEAT)[0]
+        
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            recommendation.suitability_score = 1.0
+        assert recommendation.to_dict()["variety"] == recommendation.variety
+        assert set(recommendation.to_dict()) == {field.name for field in dataclasses.fields(recommendation)}
+        assert not hasattr(recommendation, "__dict__")
+        assert copy.deepcopy(recommendation) == recommendation
+    
+    def test_risks_and_tips_combine_variety_and_satellite_flags(self):
+        recommendations = self.recommend({"ndvi": 0.2, "soil_moisture": 0.1}, season=SeasonType.KHARIF, specific_crop=CropType.RICE)
+        pusa = next(rec for rec in recommendations if rec.variety == "Pusa-44")
+        
+        assert pusa.risk_factors == [
+            "High water requirement - drought risk",
+            "Long cultivation period - weather risk",
+            "[SATELLITE] Poor vegetation health detected",
+            "[SATELLITE] Very low soil moisture - drought risk",
+        ]
+        assert pusa.cultivation_tips == [
+            "Implement drip irrigation for water efficiency",
+            "Regular monitoring for disease prevention",
+            "[SATELLITE] Low soil moisture - increase irrigation frequency",
+        ]
+    
+    def test_summary_lists_the_top_three(self):
+        recommendations = self.recommend(specific_crop=CropType.WHEAT, soil_type=SoilType.CLAY)
+        sat = crop_selection_agent._satellite_view({"ndvi": 0.5})
+        
+        assert self.agent._format_recommendations_summary(recommendations) == [
+            "wheat (DBW-88) - Score: 0.76", "wheat (HD-2967) - Score: 0.67", "wheat (PBW-343) - Score: 0.64"
+        ]
+        assert self.agent._format_recommendations_summary(recommendations[:1], sat) == ["wheat (DBW-88) - Score: 0.76 [SAT]"]
+    
+    def test_knowledge_base_is_shared_and_read_only(self):
+        assert self.agent.crop_database is crop_selection_agent._CROP_DATABASE
+        assert self.agent.regional_data is crop_selection_agent._REGIONAL_DATA
+        with pytest.raises(TypeError):
+            self.agent.crop_database[CropType.OTHER] = {}
+    
+    def test_current_month_picks_the_default_season(self):
+        for month, season in ((1, SeasonType.RABI), (7, SeasonType.KHARIF)):
+            context = make_context(season=None)
+            recommendations = asyncio.run(self.agent._generate_crop_recommendations(context, None, current_month=month))
+            
+            assert context["season"] == season
+            assert all(season in self.agent.crop_database[rec.crop_type]["seasons"] for rec in recommendations)
+
+class TestContextExtraction:
+    """Test keyword detection in query text"""
+    
+    def extract(self, text):
+        return AGENT._extract_context_from_query(AgricultureQuery(query_text=text))
+    
+    def test_keywords_map_to_categories(self):
+        context = self.extract("Which gehun variety for black soil in Punjab this winter?")
+        
+        assert context["season"] == SeasonType.RABI
+        assert context["location"] == "Punjab"
+        assert context["specific_crop"] == CropType.WHEAT
+        assert context["soil_type"] == SoilType.CLAY
+    
+    def test_earlier_keywords_win_within_a_category(self):
+        context = self.extract("summer or winter sowing of cotton after rice")
+        
+        assert context["season"] == SeasonType.RABI
+        assert context["specific_crop"] == CropType.RICE
+    
+    def test_keywords_match_whole_words_only(self):
+        context = self.extract("mayonnaise prices reduced")
+        
+        assert context["season"] is None
+        assert context["specific_crop"] is None
+        assert context["soil_type"] is None
+
+class _QueryTask(Task):
+    query: AgricultureQuery = None
+
+class TestSatelliteCache:
+    """Test reuse of satellite readings for nearby coordinates"""
+    
+    def setup_method(self):
+        crop_selection_agent._satellite_cache.clear()
+    
+    def teardown_method(self):
+        crop_selection_agent._satellite_cache.clear()
+    
+    def test_nearby_coordinates_share_one_fetch(self, monkeypatch):
+        calls = []
+        
+        async def fake_fetch(latitude, longitude, location_name=None):
+            calls.append((latitude, longitude))
+            await asyncio.sleep(0.05)
+            return {"ndvi": 0.6}
+        
+        monkeypatch.setattr(crop_selection_agent, "get_satellite_data_for_location", fake_fetch)
+        
+        async def run():
+            concurrent = await asyncio.gather(*(
+                crop_selection_agent._cached_satellite_data(30.73331, 76.77941) for _ in range(3)
+            ))
+            later = await crop_selection_agent._cached_satellite_data(30.7334, 76.7794)
+            return concurrent, later
+        
+        concurrent, later = asyncio.run(run())
+        
+        assert len(calls) == 1
+        assert all(data == {"ndvi": 0.6} for data in concurrent) and later == {"ndvi": 0.6}
+    
+    def test_expired_and_empty_readings_are_refetched(self, monkeypatch):
+        calls = []
+        
+        async def fake_fetch(latitude, longitude, location_name=None):
+            calls.append(latitude)
+            return {} if latitude < 0 else {"ndvi": 0.6}
+        
+        monkeypatch.setattr(crop_selection_agent, "get_satellite_data_for_location", fake_fetch)
+        monkeypatch.setattr(crop_selection_agent, "SATELLITE_CACHE_TTL", -1.0)
+        
+        for latitude in (10.0, 10.0, -10.0, -10.0):
+            asyncio.run(crop_selection_agent._cached_satellite_data(latitude, 76.0))
+        
+        assert len(calls) == 4
+
+class TestCropSelectionExecute:
+    """Test the sync entry point"""
+    
+    def test_execute_reuses_one_background_loop(self):
+        results = [
+            AGENT.execute(_QueryTask(title="crops", query=AgricultureQuery(query_id=f"q{i}", query_text="wheat in Punjab")), {})
+            for i in range(2)
+        ]
+        
+        assert [r["status"] for r in results] == ["success", "success"]
+        assert results[1]["result"].query_id == "q1"
+        assert results[0]["result"].recommendations
+        
+        # Runs from inside an event loop too, where asyncio.run would refuse
+        async def from_loop():
+            return AGENT.execute(_QueryTask(title="crops", query=AgricultureQuery(query_id="q", query_text="rice")), {})
+        
+        assert asyncio.run(from_loop())["status"] == "success"
+
+    def test_execute_async_stays_on_the_callers_loop(self, monkeypatch):
+        loops = []
+        process_query = AGENT.process_query
+        
+        async def recording_process_query(query):
+            loops.append(asyncio.get_running_loop())
+            return await process_query(query)
+        
+        monkeypatch.setattr(AGENT, "process_query", recording_process_query)
+        tasks = [_QueryTask(title="crops", query=AgricultureQuery(query_id=f"q{i}", query_text="rice")) for i in range(3)]
+        
+        async def run():
+            return asyncio.get_running_loop(), await AGENT.process_tasks(tasks + [Task(title="no query")])
+        
+        loop, results = asyncio.run(run())
+        
+        assert loops == [loop] * 3
+        assert [r["status"] for r in results] == ["success"] * 3 + ["error"]
+        assert [r["result"].query_id for r in results[:3]] == ["q0", "q1", "q2"]
+    
+    def test_response_bytes_serializes_satellite_metadata(self, monkeypatch):
+        async def fetch(context):
+            return {"ndvi": np.float64(0.72), "soil_moisture": 0.5}
+        
+        monkeypatch.setattr(AGENT, "_fetch_satellite_data", fetch)
+        response = asyncio.run(AGENT.process_query(AgricultureQuery(query_id="q", query_text="wheat in Punjab")))
+        decoded = orjson.loads(CropSelectionAgent.response_bytes(response))
+        
+        assert decoded["query_id"] == "q"
+        assert decoded["metadata"]["satellite_insights"]["ndvi"] == 0.72
+        assert decoded["recommendations"][0]["crop_type"] == "wheat"
+
+    def test_satellite_readings_reach_context_and_advice(self, monkeypatch):
+        async def fetch(context):
+            return {"ndvi": 0.75, "soil_moisture": 0.2, "weather": {"temperature": 18}}
+        
+        monkeypatch.setattr(AGENT, "_fetch_satellite_data", fetch)
+        response = asyncio.run(AGENT.process_query(AgricultureQuery(query_id="q", query_text="wheat in Punjab")))
+        
+        assert response.metadata["context_analysis"]["satellite_insights"] == {
+            "vegetation_health": 0.75,
+            "soil_moisture": 0.2,
+            "weather_conditions": {"temperature": 18},
+            "land_suitability": "Poor",
+        }
+        assert response.metadata["additional_advice"] == [
+            "[SATELLITE] Low soil moisture detected - irrigation planning recommended",
+            "[SATELLITE] Excellent vegetation conditions detected - optimal for planting",
+        ]
+        assert "[SATELLITE] satellite data confirms favorable field conditions" in response.recommendations[0]["reason"]
+    
+    def test_responses_do_not_share_cached_lists(self):
+        query = AgricultureQuery(query_id="q", query_text="rice in Punjab")
+        first = asyncio.run(AGENT.process_query(query))
+        first.recommendations[0]["risk_factors"].append("edited")
+        first.metadata["recommendations"][0]["cultivation_tips"].append("edited")
+        
+        second = asyncio.run(AGENT.process_query(query))
+        
+        assert "edited" not in second.recommendations[0]["risk_factors"]
+        assert "edited" not in second.recommendations[0]["cultivation_tips"]
+
+class TestProcessQueries:
+    """Test batched query processing"""
+    
+    def test_satellite_fetches_overlap(self, monkeypatch):
+        async def slow_fetch(context):
+            await asyncio.sleep(0.2)
+            return {"ndvi": 0.75, "soil_moisture": 0.5}
+        
+        monkeypatch.setattr(AGENT, "_fetch_satellite_data", slow_fetch)
+        queries = [AgricultureQuery(query_id=f"q{i}", query_text="rabi crops for loamy soil") for i in range(5)]
+        
+        started = time.perf_counter()
+        responses = asyncio.run(AGENT.process_queries(queries))
+        elapsed = time.perf_counter() - started
+        
+        assert elapsed < 0.6
+        assert [r.query_id for r in responses] == [f"q{i}" for i in range(5)]
+        assert all("satellite_data" in r.sources and r.recommendations for r in responses)
+    
+    def test_failures_stay_per_query(self, monkeypatch):
+        async def flaky_fetch(context):
+            if context["soil_type"] == SoilType.CLAY:
+                raise RuntimeError("satellite down")
+            return None
+        
+        monkeypatch.setattr(AGENT, "_fetch_satellite_data", flaky_fetch)
+        queries = [
+            AgricultureQuery(query_id="ok", query_text="wheat for sandy soil"),
+            AgricultureQuery(query_id="bad", query_text="wheat for clay soil")
+        ]
+        
+        ok, bad = asyncio.run(AGENT.process_queries(queries))
+        
+        assert ok.confidence_score > 0 and ok.recommendations
+        assert bad.confidence_score == 0.0
+        assert "satellite down" in bad.response_text
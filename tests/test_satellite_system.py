@@ -13,9 +13,11 @@ Created: 2025-01-XX
 """
 
 import asyncio
+import numpy as np
 import pytest
 import sqlite3
 import tempfile
+import threading
 import shutil
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -30,6 +32,7 @@ from src.services.satellite_service import (
     SatelliteDataStorage,
     SatelliteDataPipeline,
     LocationData,
+    SatelliteSeries,
     create_satellite_pipeline
 )
 
@@ -163,6 +166,26 @@ class TestSatelliteDataSimulator:
         assert 0 <= metrics.cloud_cover <= 100
         assert 0.5 <= metrics.confidence_score <= 1.0
         assert metrics.vegetation_health in ["Excellent", "Good", "Fair", "Poor", "Critical"]
+    
+    def test_series_from_data_points(self):
+        """Test building a column-oriented series and its NDVI slope"""
+        start = datetime(2025, 3, 1)
+        data_points = [
+            self.simulator.simulate_satellite_data(self.test_location, start + timedelta(days=i), "wheat")
+            for i in range(5)
+        ]
+        
+        series = SatelliteSeries.from_data_points(data_points)
+        
+        assert len(series) == 5
+        assert series.timestamps == [d.timestamp for d in data_points]
+        assert series.ndvi.tolist() == [d.metrics.ndvi for d in data_points]
+        assert series.soil_moisture.tolist() == [d.metrics.soil_moisture for d in data_points]
+        
+        # A linear ramp has exactly that slope
+        series.ndvi = np.array([0.1, 0.2, 0.3, 0.4, 0.5])
+        assert series.ndvi_slope() == pytest.approx(0.1)
+        assert SatelliteSeries.from_data_points(data_points[:1]).ndvi_slope() == 0.0
 
 class TestSatelliteDataStorage:
     """Test satellite data storage functionality"""
@@ -255,6 +278,26 @@ class TestSatelliteDataStorage:
         if len(retrieved_data) >= 2:
             assert retrieved_data[0].timestamp >= retrieved_data[1].timestamp
     
+    def test_connection_is_reused_per_thread(self):
+        """Test that each thread keeps one connection across calls"""
+        data_point = self.simulator.simulate_satellite_data(self.test_location, datetime.now(), "wheat")
+        
+        assert self.storage.store_data_point(data_point)
+        conn = self.storage._connection()
+        self.storage.get_latest_data(self.test_location.latitude, self.test_location.longitude)
+        assert self.storage._connection() is conn
+        
+        other = []
+        thread = threading.Thread(target=lambda: other.append(
+            (self.storage._connection(), len(self.storage.get_latest_data(28.7041, 77.1025)))
+        ))
+        thread.start()
+        thread.join()
+        assert other[0][0] is not conn and other[0][1] == 1
+        
+        self.storage.close()
+        assert self.storage._connection() is not conn
+    
     def test_historical_trends(self):
         """Test historical trends calculation"""
         # Generate historical data
@@ -341,6 +384,50 @@ class TestSatelliteDataPipeline:
         finally:
             self.pipeline.monitoring_locations = original_locations
     
+    @pytest.mark.asyncio
+    async def test_bulk_acquire_for_location(self):
+        """Test acquiring a data series for one location in a single call"""
+        current_time = datetime.now()
+        dates = [current_time - timedelta(days=i) for i in range(4)]
+        
+        data_points = await self.pipeline.bulk_acquire_for_location(
+            self.test_location,
+            dates=dates,
+            crop_types=["wheat", "wheat", "rice", "mixed"]
+        )
+        
+        assert len(data_points) == 4
+        assert [d.timestamp for d in data_points] == dates
+        
+        stored = self.pipeline.storage.get_latest_data(
+            self.test_location.latitude,
+            self.test_location.longitude,
+            days_back=7
+        )
+        assert len(stored) == 4
+        
+        with pytest.raises(ValueError):
+            await self.pipeline.bulk_acquire_for_location(
+                self.test_location, dates=dates, crop_types=["wheat"]
+            )
+    
+    def test_find_monitoring_location(self):
+        """Test coordinate and name lookups of monitoring locations"""
+        delhi = self.pipeline.find_monitoring_location(28.70412, 77.10248)
+        assert delhi is not None
+        assert delhi.location_name == "Delhi"
+        assert self.pipeline.find_monitoring_location_by_name("LUDHIANA").region == "Punjab"
+        assert self.pipeline.find_monitoring_location(0.0, 0.0) is None
+        
+        # Replacing the list rebuilds the lookup indexes
+        original_locations = self.pipeline.monitoring_locations
+        self.pipeline.monitoring_locations = [self.test_location]
+        try:
+            assert self.pipeline.find_monitoring_location_by_name("Delhi") is None
+            assert self.pipeline.find_monitoring_location(28.7041, 77.1025) is self.test_location
+        finally:
+            self.pipeline.monitoring_locations = original_locations
+    
     def test_get_location_data(self):
         """Test comprehensive location data retrieval"""
         # First, add some test data using recent dates
@@ -367,6 +454,19 @@ class TestSatelliteDataPipeline:
         assert "summary" in location_data
         # Should have at least the 5 data points we added
         assert len(location_data["latest_data"]) >= 5
+    
+    def test_get_location_data_location_shape(self):
+        """Test that location data only reports the queried coordinates"""
+        location_data = self.pipeline.get_location_data(
+            self.test_location.latitude,
+            self.test_location.longitude,
+            days_back=7
+        )
+        
+        assert location_data["location"] == {
+            "latitude": self.test_location.latitude,
+            "longitude": self.test_location.longitude
+        }
 
 class TestSatelliteAPIIntegration:
     """Integration tests for satellite API"""
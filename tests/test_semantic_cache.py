@@ -0,0 +1,62 @@
+"""
+🧪 Semantic Response Cache Tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.services.semantic_cache import SemanticCache
+
+VOCABULARY = ["wheat", "rice", "variety", "punjab", "pest", "irrigation"]
+
+def bag_of_words(text):
+    """Tiny deterministic embedding for tests"""
+    words = text.lower().replace("?", "").split()
+    return [float(words.count(term)) for term in VOCABULARY]
+
+class TestSemanticCache:
+    """Test similarity lookups and persistence"""
+    
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.temp_dir, "semantic_cache.json")
+    
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_similar_question_hits(self):
+        cache = SemanticCache(bag_of_words, threshold=0.9, cache_file=self.cache_file)
+        cache.put("Best wheat variety for Punjab?", "Try HD-2967", "Punjab, Ludhiana")
+        
+        assert cache.get("best WHEAT variety punjab", "punjab,  ludhiana") == "Try HD-2967"
+        assert cache.get("rice pest irrigation", "Punjab, Ludhiana") is None
+        assert cache.get("Best wheat variety for Punjab?", "Bihar, Patna") is None
+    
+    def test_entries_persist_across_instances(self):
+        cache = SemanticCache(bag_of_words, cache_file=self.cache_file)
+        cache.put("rice irrigation", "Keep fields flooded", "Tamil Nadu")
+        
+        reloaded = SemanticCache(bag_of_words, cache_file=self.cache_file)
+        assert reloaded.get("rice irrigation", "Tamil Nadu") == "Keep fields flooded"
+    
+    def test_miss_is_stored_with_one_embedding(self):
+        calls = []
+        
+        def counting_embed(text):
+            calls.append(text)
+            return bag_of_words(text)
+        
+        cache = SemanticCache(counting_embed, cache_file=self.cache_file)
+        cache.put("wheat variety", "Try HD-2967", "Punjab")
+        calls.clear()
+        
+        answer, vector = cache.lookup("rice pest", "Punjab")
+        assert answer is None
+        cache.put("rice pest", "Use neem oil", "Punjab", vector=vector)
+        
+        assert calls == ["rice pest"]
+        assert cache.get("rice pest", "Punjab") == "Use neem oil"